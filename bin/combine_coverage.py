@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Simple script to combine model state/transition coverage files into a single
+file, and report states and transitions which were never visited.
+
+Coverage files are written by setting COCOTBEXT_COVERAGE_FILE for each test run.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from cocotbext.interfaces.coverage import merge, report
+
+
+def find_all(name, path):
+    for root, dirs, files in os.walk(path):
+        if name in files:
+            yield os.path.join(root, name)
+
+def get_parser():
+    """Return the cmdline parser"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("--directory", dest="directory", type=str, required=False,
+                        default=".",
+                        help="Name of base directory to search from")
+    parser.add_argument("--name", dest="name", type=str, required=False,
+                        default="coverage.json",
+                        help="Name of coverage files to search for")
+    parser.add_argument("--output_file", dest="output_file", type=str, required=False,
+                        default="combined_coverage.json",
+                        help="Name of output file")
+    parser.add_argument("--verbose", dest="debug", action='store_const', required=False,
+                        const=True, default=False,
+                        help="Verbose/debug output")
+    parser.add_argument("--fail_unvisited", dest="set_rc", action='store_const', required=False,
+                        const=True, default=False,
+                        help="Set return code if any state was never visited")
+
+    return parser
+
+
+def main():
+
+    parser = get_parser()
+    args = parser.parse_args()
+    rc = 0
+
+    results = []
+    for fname in find_all(args.name, args.directory):
+        if args.debug : print("Reading file %s" % fname)
+        with open(fname) as f:
+            results.append(json.load(f))
+
+    merged = merge(results)
+    with open(args.output_file, "w") as f:
+        json.dump(merged, f, indent=1)
+
+    for name, unvisited in sorted(report(merged).items()):
+        cov = merged[name]
+        print("%s: visited %d/%d states, %d/%d transitions" % (
+            name, len(cov['visited_states']), len(cov['states']),
+            len(cov['visited_transitions']), len(cov['transitions'])))
+        for state in unvisited['states']:
+            if args.set_rc:
+                rc = 1
+            print("  Unvisited state: '%s'" % state)
+        for transition in unvisited['transitions']:
+            print("  Unvisited transition: '%s'" % transition)
+
+    print("Combined coverage from %d files" % len(results))
+    return rc
+
+
+if __name__ == "__main__":
+    rc = main()
+    sys.exit(rc)
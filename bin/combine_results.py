@@ -7,8 +7,14 @@ Useful for Jenkins.
 
 import os
 import sys
+import shutil
 import argparse
-from xml.etree import cElementTree as ET
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+import results_db
 
 
 def find_all(name, path):
@@ -16,6 +22,155 @@ def find_all(name, path):
         if name in files:
             yield os.path.join(root, name)
 
+def _find_list(name, path):
+    return list(find_all(name, path))
+
+def find_all_parallel(name, path, pool):
+    """As find_all, but walks each top-level subdirectory of path in the pool"""
+    entries = os.listdir(path)
+    if name in entries:
+        yield os.path.join(path, name)
+    subdirs = [os.path.join(path, e) for e in entries if os.path.isdir(os.path.join(path, e))]
+    for found in pool.map(_find_list, [name] * len(subdirs), subdirs):
+        yield from found
+
+def merge(result, tree, debug=False):
+    """Fold the testsuites of a parsed results file into the combined tree"""
+    for ts in tree.iter("testsuite"):
+        if debug:
+            print("Ts name : %s, package : %s" % ( ts.get('name'), ts.get('package')))
+        use_element = None
+        for existing in result:
+            if existing.get('name') == ts.get('name') and existing.get('package') == ts.get('package'):
+                if debug:
+                    print("Already found")
+                use_element = existing
+                break
+        if use_element is None:
+            result.append(ts)
+        else:
+            #for tc in ts.getiterator("testcase"):
+            use_element.extend(list(ts));
+
+def spool(fname, spool_dir, collect=False):
+    """
+    Incrementally parse a results file, writing the children of each testsuite to
+    a fragment file in spool_dir as they complete. Only the element being parsed is
+    held in memory.
+
+    Returns a list of (testsuite attributes, fragment path, testcase count,
+    [(classname, name) for each failure], [results_db.row for each testcase if
+    collect]), one per testsuite.
+    """
+    suites = []
+    stack = []
+    depth = None  # Depth of the testsuite currently being spooled
+    frag = None
+    for event, elem in ET.iterparse(fname, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "testsuite" and depth is None:
+                depth = len(stack)
+                fd, path = tempfile.mkstemp(suffix=".xml", dir=spool_dir)
+                frag = os.fdopen(fd, "wb")
+                suites.append([dict(elem.attrib), path, 0, [], []])
+                seed = None
+            continue
+
+        stack.pop()
+        if depth is not None and len(stack) == depth:
+            # Completed child of a testsuite; write it out and drop it
+            if elem.tag == "testcase":
+                suites[-1][2] += 1
+                for failure in elem.iter('failure'):
+                    suites[-1][3].append((elem.get('classname'), elem.get('name')))
+                if collect:
+                    suites[-1][4].append(results_db.row(elem, seed))
+            elif elem.tag == "property" and elem.get('name') == 'random_seed':
+                seed = results_db._seed(elem.get('value'))
+            elem.tail = None
+            frag.write(ET.tostring(elem))
+            stack[-1].remove(elem)
+        elif depth is not None and len(stack) == depth - 1:
+            frag.close()
+            frag = None
+            depth = None
+            if stack:
+                stack[-1].remove(elem)
+
+    return [tuple(s) for s in suites]
+
+def stream(args):
+    """
+    Combine results with bounded memory: files are parsed incrementally (in parallel)
+    into per-testsuite fragments, which are then concatenated into the output file.
+    Testsuites are merged by name and package exactly as in `merge`. If recording to a
+    database, each file's testcases are inserted as it is parsed.
+
+    Returns the return code.
+    """
+    rc = 0
+    testcase_count = 0
+    suites = {}  # (name, package) -> [attributes, [(fragment, failures), ...]]
+    db = run = None
+
+    spool_dir = tempfile.mkdtemp(prefix="combine_results")
+    try:
+        if args.database is not None:
+            db = results_db.connect(args.database)
+            run = results_db.record(db, [], name=args.run_name, source=os.path.abspath(args.directory))
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            fnames = list(find_all_parallel("results.xml", args.directory, pool))
+            collect = [args.database is not None] * len(fnames)
+            for fname, parsed in zip(fnames, pool.map(spool, fnames, [spool_dir] * len(fnames), collect)):
+                if args.debug : print("Reading file %s" % fname)
+                rows = []
+                for attrib, path, count, failures, tests in parsed:
+                    key = (attrib.get('name'), attrib.get('package'))
+                    if args.debug:
+                        print("Ts name : %s, package : %s" % key)
+                        if key in suites:
+                            print("Already found")
+                    suites.setdefault(key, [attrib, []])[1].append((path, failures))
+                    testcase_count += count
+                    rows.extend(key + t for t in tests)
+                if db is not None:
+                    results_db.record(db, rows, run=run)
+
+        with open(args.output_file, "wb") as out:
+            out.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+            out.write(("<testsuites name=%s>" % quoteattr(args.testsuites_name)).encode())
+            for attrib, frags in suites.values():
+                attrs = "".join(" %s=%s" % (k, quoteattr(v)) for k, v in attrib.items())
+                out.write(("<testsuite%s>" % attrs).encode())
+                for path, failures in frags:
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, out)
+                    for classname, name in failures:
+                        if args.set_rc:
+                            rc = 1
+                        print("Failure in testsuite: '%s' classname: '%s' testcase: '%s' with parameters '%s'" % (attrib.get('name'), classname, name, attrib.get('package')))
+                out.write(b"</testsuite>")
+            out.write(b"</testsuites>")
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        if db is not None:
+            db.close()
+
+    print("Ran a total of %d TestSuites and %d TestCases" % (len(suites), testcase_count))
+    if run is not None:
+        print("Recorded run %d in %s" % (run, args.database))
+    return rc
+
+def store(args, rows):
+    """Record merged results as a new run in the results database"""
+    db = results_db.connect(args.database)
+    try:
+        run = results_db.record(db, rows, name=args.run_name, source=os.path.abspath(args.directory))
+    finally:
+        db.close()
+    print("Recorded run %d in %s" % (run, args.database))
+
 def get_parser():
     """Return the cmdline parser"""
     parser = argparse.ArgumentParser(description=__doc__,
@@ -31,6 +186,18 @@ def get_parser():
     parser.add_argument("--testsuites_name", dest="testsuites_name", type=str, required=False,
                         default="results",
                         help="Name value for testsuites tag")
+    parser.add_argument("--streaming", dest="streaming", action='store_const', required=False,
+                        const=True, default=False,
+                        help="Merge incrementally with bounded memory, for very large regressions")
+    parser.add_argument("--processes", dest="processes", type=int, required=False,
+                        default=None,
+                        help="Worker processes used to find and parse files when streaming")
+    parser.add_argument("--database", dest="database", type=str, required=False,
+                        default=None,
+                        help="SQLite results database to record this run in (see results_db.py)")
+    parser.add_argument("--run_name", dest="run_name", type=str, required=False,
+                        default=None,
+                        help="Name of the run recorded in the results database")
     parser.add_argument("--verbose", dest="debug", action='store_const', required=False,
                         const=True, default=False,
                         help="Verbose/debug output")
@@ -47,26 +214,14 @@ def main():
     args = parser.parse_args()
     rc = 0
 
+    if args.streaming:
+        return stream(args)
+
     result = ET.Element("testsuites", name=args.testsuites_name);
 
     for fname in find_all("results.xml", args.directory):
         if args.debug : print("Reading file %s" % fname)
-        tree = ET.parse(fname)
-        for ts in tree.iter("testsuite"):
-            if args.debug:
-                print("Ts name : %s, package : %s" % ( ts.get('name'), ts.get('package')))
-            use_element = None
-            for existing in result:
-                if existing.get('name') == ts.get('name') and existing.get('package') == ts.get('package'):
-                    if args.debug:
-                        print("Already found")
-                    use_element = existing
-                    break
-            if use_element is None:
-                result.append(ts)
-            else:
-                #for tc in ts.getiterator("testcase"):
-                use_element.extend(list(ts));
+        merge(result, ET.parse(fname), debug=args.debug)
 
     if args.debug:
         ET.dump(result)
@@ -86,6 +241,8 @@ def main():
 
 
     ET.ElementTree(result).write(args.output_file, encoding="UTF-8")
+    if args.database is not None:
+        store(args, results_db.rows(result))
     return rc
 
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+"""
+Query the regression results history: a SQLite database of testcase outcomes and
+timings, one run per merge (see the --database option of combine_results.py and
+run_regression.py).
+
+Reports the slowest tests, the worst simulated/wall time ratios, and tests which
+slowed down relative to a baseline run.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    created REAL NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    testsuite TEXT,
+    package TEXT,
+    classname TEXT,
+    name TEXT NOT NULL,
+    seed INTEGER,
+    outcome TEXT NOT NULL,
+    wall_s REAL,
+    sim_ns REAL,
+    ratio REAL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (classname, name, run);
+CREATE INDEX IF NOT EXISTS results_wall ON results (run, wall_s);
+CREATE INDEX IF NOT EXISTS results_ratio ON results (run, ratio);
+CREATE INDEX IF NOT EXISTS runs_name ON runs (name);
+"""
+
+REPORTS = ("runs", "slowest", "ratio", "regressions", "history")
+
+
+def connect(fname):
+    """Open (creating if needed) a results database"""
+    db = sqlite3.connect(fname)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+    return db
+
+
+def _float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def _seed(val):
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def outcome(testcase):
+    """Return 'fail', 'skip' or 'pass' for a testcase element"""
+    if testcase.find('failure') is not None or testcase.find('error') is not None:
+        return 'fail'
+    if testcase.find('skipped') is not None:
+        return 'skip'
+    return 'pass'
+
+
+def row(testcase, seed):
+    """Return the (classname, name, seed, outcome, wall_s, sim_ns, ratio) of a testcase element"""
+    return (testcase.get('classname'), testcase.get('name'), seed, outcome(testcase),
+            _float(testcase.get('time')), _float(testcase.get('sim_time_ns')),
+            _float(testcase.get('ratio_time')))
+
+
+def rows(tree):
+    """
+    Yield (testsuite, package, classname, name, seed, outcome, wall_s, sim_ns, ratio)
+    for each testcase of a parsed (or merged) results tree. The seed is that of the
+    last random_seed property preceding the testcase in its testsuite.
+    """
+    for ts in tree.iter("testsuite"):
+        seed = None
+        for elem in ts:
+            if elem.tag == 'property' and elem.get('name') == 'random_seed':
+                seed = _seed(elem.get('value'))
+            elif elem.tag == 'testcase':
+                yield (ts.get('name'), ts.get('package')) + row(elem, seed)
+
+
+def record(db, results, name=None, source=None, run=None):
+    """
+    Store one run's results, as yielded by `rows`; return the run id. If a run id is
+    given, the results are added to that run, e.g. one batch at a time.
+    """
+    with db:
+        if run is None:
+            run = db.execute("INSERT INTO runs (name, created, source) VALUES (?, ?, ?)",
+                             (name, time.time(), source)).lastrowid
+        db.executemany("INSERT INTO results (run, testsuite, package, classname, name, seed, "
+                       "outcome, wall_s, sim_ns, ratio) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       ((run,) + tuple(r) for r in results))
+    return run
+
+
+def find_run(db, ref=None, before=None):
+    """
+    Return the id of a run given its id or name (the latest of that name), or the
+    latest run (before run id `before`, if given); None if there is no such run
+    """
+    if ref is None:
+        query, params = "SELECT max(id) FROM runs", ()
+        if before is not None:
+            query, params = query + " WHERE id < ?", (before,)
+    elif str(ref).isdigit():
+        query, params = "SELECT id FROM runs WHERE id = ?", (int(ref),)
+    else:
+        query, params = "SELECT max(id) FROM runs WHERE name = ?", (ref,)
+    found = db.execute(query, params).fetchone()
+    return found[0] if found else None
+
+
+def runs(db, limit=20):
+    """Return (id, name, created, tests, failures, total wall_s) of the latest runs"""
+    return db.execute(
+        "SELECT r.id, r.name, r.created, count(t.name), "
+        "coalesce(sum(t.outcome = 'fail'), 0), coalesce(sum(t.wall_s), 0) "
+        "FROM runs r LEFT JOIN results t ON t.run = r.id "
+        "GROUP BY r.id ORDER BY r.id DESC LIMIT ?", (limit,)).fetchall()
+
+
+def slowest(db, run, limit=20):
+    """Return (classname, name, seed, outcome, wall_s, sim_ns, ratio) of a run's slowest tests"""
+    return db.execute(
+        "SELECT classname, name, seed, outcome, wall_s, sim_ns, ratio FROM results "
+        "WHERE run = ? AND wall_s IS NOT NULL ORDER BY wall_s DESC LIMIT ?", (run, limit)).fetchall()
+
+
+def worst_ratio(db, run, limit=20):
+    """As `slowest`, for the tests simulating the fewest ns per wall second"""
+    return db.execute(
+        "SELECT classname, name, seed, outcome, wall_s, sim_ns, ratio FROM results "
+        "WHERE run = ? AND ratio IS NOT NULL ORDER BY ratio ASC LIMIT ?", (run, limit)).fetchall()
+
+
+def regressions(db, run, baseline, threshold=0.2, min_wall_s=0.0):
+    """
+    Return (classname, name, baseline wall_s, wall_s, change) of tests whose mean wall
+    time (over seeds) grew by more than `threshold` (a fraction) from the baseline run,
+    slowest change first. Tests faster than `min_wall_s` in both runs are ignored.
+    """
+    return db.execute(
+        "WITH cur AS (SELECT classname, name, avg(wall_s) AS wall FROM results "
+        "             WHERE run = ? AND wall_s IS NOT NULL GROUP BY classname, name), "
+        "     base AS (SELECT classname, name, avg(wall_s) AS wall FROM results "
+        "              WHERE run = ? AND wall_s IS NOT NULL GROUP BY classname, name) "
+        "SELECT cur.classname, cur.name, base.wall, cur.wall, cur.wall / base.wall - 1 AS change "
+        "FROM cur JOIN base ON cur.classname IS base.classname AND cur.name = base.name "
+        "WHERE base.wall > 0 AND cur.wall > base.wall * (1 + ?) AND max(cur.wall, base.wall) >= ? "
+        "ORDER BY change DESC", (run, baseline, threshold, min_wall_s)).fetchall()
+
+
+def history(db, name, classname=None, limit=20):
+    """Return (run, run name, seed, outcome, wall_s, sim_ns, ratio) of a test over the latest runs"""
+    query = ("SELECT t.run, r.name, t.seed, t.outcome, t.wall_s, t.sim_ns, t.ratio "
+             "FROM results t JOIN runs r ON t.run = r.id WHERE t.name = ?")
+    params = (name,)
+    if classname is not None:
+        query, params = query + " AND t.classname = ?", params + (classname,)
+    return db.execute(query + " ORDER BY t.run DESC LIMIT ?", params + (limit,)).fetchall()
+
+
+def _fmt(val, spec):
+    return "-" if val is None else format(val, spec)
+
+
+def print_tests(rows):
+    print("%-40s %-30s %12s %6s %10s %14s %14s" % ("classname", "name", "seed", "result", "wall_s", "sim_ns", "ns/s"))
+    for classname, name, seed, result, wall, sim, ratio in rows:
+        print("%-40s %-30s %12s %6s %10s %14s %14s" % (classname, name, _fmt(seed, "d"), result,
+                                                     _fmt(wall, ".2f"), _fmt(sim, ".0f"), _fmt(ratio, ".1f")))
+
+
+def get_parser():
+    """Return the cmdline parser"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("report", type=str, choices=REPORTS,
+                        help="Report to print")
+    parser.add_argument("--database", dest="database", type=str, required=False,
+                        default="results.db",
+                        help="Name of results database")
+    parser.add_argument("--run", dest="run", type=str, required=False,
+                        default=None,
+                        help="Run id or name to report on; the latest run if omitted")
+    parser.add_argument("--baseline", dest="baseline", type=str, required=False,
+                        default=None,
+                        help="Run id or name to compare against; the run preceding --run if omitted")
+    parser.add_argument("--threshold", dest="threshold", type=float, required=False,
+                        default=0.2,
+                        help="Fractional wall time increase reported as a regression")
+    parser.add_argument("--min_wall", dest="min_wall", type=float, required=False,
+                        default=1.0,
+                        help="Ignore regressions of tests faster than this, in seconds")
+    parser.add_argument("--testcase", dest="testcase", type=str, required=False,
+                        default=None,
+                        help="Test name for the history report")
+    parser.add_argument("--classname", dest="classname", type=str, required=False,
+                        default=None,
+                        help="Restrict the history report to a test module")
+    parser.add_argument("--limit", dest="limit", type=int, required=False,
+                        default=20,
+                        help="Maximum number of rows to print")
+    parser.add_argument("--fail_regressions", dest="set_rc", action='store_const', required=False,
+                        const=True, default=False,
+                        help="Set return code if any regressions are found")
+
+    return parser
+
+
+def main():
+
+    parser = get_parser()
+    args = parser.parse_args()
+    rc = 0
+
+    if not os.path.exists(args.database):
+        print("No results database: %s" % args.database)
+        return 1
+    db = connect(args.database)
+
+    if args.report == "runs":
+        print("%6s %-24s %-20s %8s %8s %10s" % ("id", "name", "created", "tests", "failed", "wall_s"))
+        for run, name, created, tests, failed, wall in runs(db, args.limit):
+            print("%6d %-24s %-20s %8d %8d %10.1f" % (run, name or "-",
+                  time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created)), tests, failed, wall))
+        return rc
+
+    if args.report == "history":
+        if args.testcase is None:
+            parser.error("the history report requires --testcase")
+        print("%6s %-24s %12s %6s %10s %14s %14s" % ("run", "name", "seed", "result", "wall_s", "sim_ns", "ns/s"))
+        for run, name, seed, result, wall, sim, ratio in history(db, args.testcase, args.classname, args.limit):
+            print("%6d %-24s %12s %6s %10s %14s %14s" % (run, name or "-", _fmt(seed, "d"), result,
+                                                       _fmt(wall, ".2f"), _fmt(sim, ".0f"), _fmt(ratio, ".1f")))
+        return rc
+
+    run = find_run(db, args.run)
+    if run is None:
+        print("No such run: %s" % (args.run or "latest"))
+        return 1
+
+    if args.report == "slowest":
+        print_tests(slowest(db, run, args.limit))
+    elif args.report == "ratio":
+        print_tests(worst_ratio(db, run, args.limit))
+    elif args.report == "regressions":
+        baseline = find_run(db, args.baseline, before=run if args.baseline is None else None)
+        if baseline is None:
+            print("No baseline run to compare run %d against" % run)
+            return 1
+        found = regressions(db, run, baseline, args.threshold, args.min_wall)
+        print("Run %d against baseline run %d: %d regressions" % (run, baseline, len(found)))
+        for classname, name, before, after, change in found[:args.limit]:
+            if args.set_rc:
+                rc = 1
+            print("Regression in classname: '%s' testcase: '%s' %.2fs -> %.2fs (%+.0f%%)" % (
+                classname, name, before, after, 100 * change))
+
+    return rc
+
+
+if __name__ == "__main__":
+    rc = main()
+    sys.exit(rc)
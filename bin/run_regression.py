@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+"""
+Run the cocotb regression in parallel, sharding tests and random seeds across
+local worker processes, and merge JUnit results into a single XML file as
+shards complete; the file is written every --write_every shards, at the end of
+the run and on interrupt.
+
+Each shard gets a private simulator build/run directory, so shards never share
+a sim_build, results.xml or waveform dump.
+"""
+
+import argparse
+import ast
+import itertools
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.etree import ElementTree as ET
+
+import results_db
+from combine_results import merge, store
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Simulator processes of running shards, killed on interrupt
+RUNNING = set()
+
+
+def find_modules(path):
+    """Yield (test directory, cocotb MODULE) for each test case Makefile under path"""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        if "Makefile" not in files:
+            continue
+        with open(os.path.join(root, "Makefile")) as f:
+            match = re.search(r"^\s*MODULE\s*[:?]?=\s*(\S+)", f.read(), re.MULTILINE)
+        if match:
+            yield root, match.group(1)
+
+
+def find_tests(directory, module):
+    """Return names of coroutines decorated as cocotb tests within a test module"""
+    fname = os.path.join(directory, module + ".py")
+    with open(fname) as f:
+        tree = ast.parse(f.read(), fname)
+
+    def is_test(d):
+        d = d.func if isinstance(d, ast.Call) else d
+        return (isinstance(d, ast.Attribute) and d.attr == "test") or \
+               (isinstance(d, ast.Name) and d.id == "test")
+
+    return [n.name for n in tree.body
+            if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and any(is_test(d) for d in n.decorator_list)]
+
+
+def make_shards(args):
+    """Split (test, seed) pairs into shards of at most args.tests_per_shard tests"""
+    if args.seed:
+        seeds = args.seed
+    else:
+        rng = random.Random(args.base_seed)
+        seeds = [rng.randrange(2 ** 31) for _ in range(args.seeds)]
+
+    shards = []
+    for directory, module in find_modules(args.directory):
+        tests = [t for t in find_tests(directory, module)
+                 if not args.testcase or t in args.testcase]
+        for seed in seeds:
+            for i in range(0, len(tests), args.tests_per_shard):
+                shards.append({
+                    'id': "%s.s%d.%d" % (module, seed, i // args.tests_per_shard),
+                    'directory': directory,
+                    'module': module,
+                    'tests': tests[i:i + args.tests_per_shard],
+                    'seed': seed,
+                })
+    return shards
+
+
+def failed_suite(shard, message):
+    """Return a testsuite recording each test of a shard which produced no results"""
+    ts = ET.Element("testsuite", name=shard['id'], package=shard['module'])
+    for test in shard['tests']:
+        tc = ET.SubElement(ts, "testcase", classname=shard['module'], name=test)
+        ET.SubElement(tc, "failure", message=message)
+    return ts
+
+
+def run_shard(shard, args):
+    """Run a single shard to completion or timeout; return (shard, parsed results)"""
+    rundir = os.path.abspath(os.path.join(args.build_dir, shard['id']))
+    os.makedirs(rundir, exist_ok=True)
+    results = os.path.join(rundir, "results.xml")
+    if os.path.exists(results):
+        os.remove(results)
+
+    env = dict(os.environ)
+    env.update({
+        'COCOTB': ROOT,
+        'SIM_BUILD': os.path.join(rundir, "sim_build"),
+        'COCOTB_RESULTS_FILE': results,
+        'TESTCASE': ",".join(shard['tests']),
+        'RANDOM_SEED': str(shard['seed']),
+        'PYTHONPATH': os.pathsep.join(filter(None, [shard['directory'], env.get('PYTHONPATH')])),
+    })
+    env.setdefault('PYTHONWARNINGS', "error,ignore::DeprecationWarning:distutils")
+
+    # Test Makefiles include relative paths, so search their directory for includes
+    cmd = [args.make, "-f", os.path.join(shard['directory'], "Makefile"), "-I", shard['directory']]
+
+    start = time.time()
+    with open(os.path.join(rundir, "sim.log"), "w") as log:
+        proc = subprocess.Popen(cmd, cwd=rundir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                start_new_session=True)
+        RUNNING.add(proc)
+        try:
+            proc.wait(timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            kill(proc)
+            return shard, failed_suite(shard, "Shard timed out after %ds" % args.timeout), time.time() - start
+        finally:
+            RUNNING.discard(proc)
+
+    if not os.path.exists(results):
+        return shard, failed_suite(shard, "Shard exited (rc=%d) without results" % proc.returncode), \
+               time.time() - start
+
+    return shard, ET.parse(results), time.time() - start
+
+
+def kill(proc):
+    """Terminate a shard's process group, escalating to SIGKILL"""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+def write(result, fname):
+    """Atomically replace the combined results file"""
+    tmp = fname + ".tmp"
+    ET.ElementTree(result).write(tmp, encoding="UTF-8")
+    os.replace(tmp, fname)
+
+
+def get_parser():
+    """Return the cmdline parser"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("--directory", dest="directory", type=str, required=False,
+                        default=os.path.join(ROOT, "tests", "test_cases"),
+                        help="Name of base directory to search for test cases")
+    parser.add_argument("--build_dir", dest="build_dir", type=str, required=False,
+                        default="regression_build",
+                        help="Directory under which each shard gets its own build/run directory")
+    parser.add_argument("--output_file", dest="output_file", type=str, required=False,
+                        default="combined_results.xml",
+                        help="Name of output file")
+    parser.add_argument("--testsuites_name", dest="testsuites_name", type=str, required=False,
+                        default="results",
+                        help="Name value for testsuites tag")
+    parser.add_argument("-j", "--jobs", dest="jobs", type=int, required=False,
+                        default=os.cpu_count(),
+                        help="Number of shards to run concurrently")
+    parser.add_argument("--timeout", dest="timeout", type=int, required=False,
+                        default=3600,
+                        help="Wall-clock timeout per shard, in seconds")
+    parser.add_argument("--tests_per_shard", dest="tests_per_shard", type=int, required=False,
+                        default=1,
+                        help="Number of tests from one module to run per simulator invocation")
+    parser.add_argument("--seeds", dest="seeds", type=int, required=False,
+                        default=1,
+                        help="Number of random seeds to run each test with")
+    parser.add_argument("--base_seed", dest="base_seed", type=int, required=False,
+                        default=None,
+                        help="Seed used to draw per-shard seeds; drawn from time if omitted")
+    parser.add_argument("--seed", dest="seed", type=int, action="append", required=False,
+                        help="Explicit random seed to run with; may be repeated, overrides --seeds")
+    parser.add_argument("--testcase", dest="testcase", type=str, action="append", required=False,
+                        help="Only run the named test; may be repeated")
+    parser.add_argument("--make", dest="make", type=str, required=False,
+                        default=os.environ.get("MAKE", "make"),
+                        help="Make executable")
+    parser.add_argument("--write_every", dest="write_every", type=int, required=False,
+                        default=0,
+                        help="Rewrite the output file after every N completed shards; only at the end if 0")
+    parser.add_argument("--database", dest="database", type=str, required=False,
+                        default=None,
+                        help="SQLite results database to record this run in (see results_db.py)")
+    parser.add_argument("--run_name", dest="run_name", type=str, required=False,
+                        default=None,
+                        help="Name of the run recorded in the results database")
+    parser.add_argument("--verbose", dest="debug", action='store_const', required=False,
+                        const=True, default=False,
+                        help="Verbose/debug output")
+    parser.add_argument("--suppress_rc", dest="set_rc", action='store_const', required=False,
+                        const=False, default=True,
+                        help="Suppress return code if failures found")
+
+    return parser
+
+
+def main():
+
+    parser = get_parser()
+    args = parser.parse_args()
+    rc = 0
+
+    shards = make_shards(args)
+    print("Running %d shards across %d jobs" % (len(shards), args.jobs))
+
+    result = ET.Element("testsuites", name=args.testsuites_name)
+    os.makedirs(args.build_dir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(run_shard, shard, args) for shard in shards]
+        try:
+            for n, future in enumerate(as_completed(futures), 1):
+                shard, tree, elapsed = future.result()
+                merge(result, tree, debug=args.debug)
+                if args.write_every and not n % args.write_every:
+                    write(result, args.output_file)
+                print("[%d/%d] %s finished in %.1fs" % (n, len(shards), shard['id'], elapsed))
+        except KeyboardInterrupt:
+            # Keep results of completed shards; running shards are abandoned
+            for future in futures:
+                future.cancel()
+            for proc in list(RUNNING):
+                kill(proc)
+            write(result, args.output_file)
+            print("Interrupted; wrote results of completed shards to %s" % args.output_file)
+            raise
+
+    write(result, args.output_file)
+
+    testsuite_count = 0
+    testcase_count = 0
+    for testsuite in result.iter('testsuite'):
+        testsuite_count += 1
+        for testcase in testsuite.iter('testcase'):
+            testcase_count += 1
+            for failure in itertools.chain(testcase.iter('failure'), testcase.iter('error')):
+                if args.set_rc:
+                    rc = 1
+                print("Failure in testsuite: '%s' classname: '%s' testcase: '%s' with parameters '%s'" % (testsuite.get('name'), testcase.get('classname'), testcase.get('name'), testsuite.get('package')))
+                break
+
+    print("Ran a total of %d TestSuites and %d TestCases" % (testsuite_count, testcase_count))
+    if args.database is not None:
+        store(args, results_db.rows(result))
+
+    return rc
+
+
+if __name__ == "__main__":
+    rc = main()
+    sys.exit(rc)
@@ -97,10 +97,20 @@ class InterfaceProtocolError(Exception):
 class InterfacePropertyError(ValueError):
     pass
 
+class InterfaceCapacityError(Exception):
+    pass
+
 from . import (
     decorators,
     adapters,
     signal,
     core,
+    accounting,
+    coverage,
+    recorder,
+    trace,
+    latency,
+    profiling,
+    arbiters,
     model,
 )
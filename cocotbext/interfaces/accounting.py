@@ -0,0 +1,205 @@
+import functools
+import itertools
+import logging
+import sys
+import weakref
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Sized, Union
+
+import cocotbext.interfaces as ci
+
+_LOG = ci.log(__name__, logging.INFO)
+_POLICIES = ('raise', 'block')
+_SAMPLES = 8
+_registry = [] # Weak references, oldest first; meters are owned by what they measure
+_reporting = [] # Meters registered during each running `report`
+
+
+def sizeof(obj: Any, depth: int = 2) -> int:
+    """Approximate size of an object in bytes, including packed data and (shallow) contents."""
+    n = sys.getsizeof(obj)
+    if depth:
+        if callable(getattr(obj, 'tobytes', None)): # e.g. Packet
+            n += len(obj.tobytes())
+        elif isinstance(obj, (tuple, list)):
+            n += sum(sizeof(x, depth - 1) for x in obj)
+        elif isinstance(obj, dict):
+            n += sum(sizeof(x, depth - 1) for x in obj.values())
+    return n
+
+
+class Meter(ci.Pretty):
+    """
+    Element count, approximate size and high-water marks of a buffer, queue or list.
+
+    Counts are updated when `sample` is called, e.g. by the owner whenever it grows, or
+    each cycle by `run`. Sizes are estimated from a few elements, so sampling is cheap even
+    for long queues. If a `cap` is set, exceeding it raises `InterfaceCapacityError`; with
+    the 'block' policy, producers which can wait (see `space`) do so instead.
+    """
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def count(self) -> int: return self._count
+
+    @property
+    def peak(self) -> int:
+        """High-water mark of `count`."""
+        return self._peak
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the elements, as of the last `sample`."""
+        return self._count * self._mean
+
+    @property
+    def peak_nbytes(self) -> int:
+        """Approximate size of the elements at the high-water mark."""
+        return self._peak_nbytes
+
+    @property
+    def cap(self) -> Optional[int]: return self._cap
+
+    @cap.setter
+    def cap(self, val: Optional[int]) -> None:
+        if val is not None and val < 1:
+            raise ValueError(f"{str(self)} cap must be positive, was provided {val}")
+        self._cap = val
+
+    @property
+    def policy(self) -> str: return self._policy
+
+    @policy.setter
+    def policy(self, val: str) -> None:
+        if val not in _POLICIES:
+            raise ValueError(f"{str(self)} policy must be one of {_POLICIES}, was provided {val}")
+        self._policy = val
+
+    @property
+    def full(self) -> bool:
+        return self._cap is not None and self._count >= self._cap
+
+    def _container(self) -> Sized:
+        return self._source() if self._getter else self._source
+
+    def sample(self, check: bool = True) -> int:
+        """Updates and returns the element count; raises if over cap (unless `check` is False)."""
+        container = self._container()
+        n = self._count = len(container)
+        if n > self._peak:
+            self._peak = n
+            if n >= self._resize:  # Re-estimate element size as the container grows
+                sizes = [sizeof(x) for x in itertools.islice(container, _SAMPLES)]
+                self._mean = sum(sizes) // len(sizes) if sizes else 0
+                self._resize = n * 2
+            self._peak_nbytes = n * self._mean
+
+        if check and self._cap is not None and n > self._cap:
+            raise ci.InterfaceCapacityError(f"{str(self)} exceeded cap ({n} > {self._cap})")
+        return n
+
+    async def space(self, trig: Awaitable) -> None:
+        """
+        With the 'block' policy, blocking call to wait (re-sampling at each `trig`) until
+        the container is below cap, e.g. before appending to it.
+        """
+        if self._policy != 'block':
+            return
+        while self._cap is not None and self.sample(check=False) >= self._cap:
+            await trig
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}({self._name})>"
+
+    def __init__(self, name: str,
+                 container: Union[Sized, Callable[[], Sized]],
+                 cap: Optional[int] = None,
+                 policy: str = 'raise') -> None:
+        """
+        Args:
+            container: Sized iterable, or a callable returning it (if it may be replaced).
+            cap: Maximum number of elements, if any.
+            policy: 'raise' or 'block' once `cap` is reached.
+        """
+        super().__init__()
+        self._name = name
+        self._getter = callable(container) and not isinstance(container, Sized)
+        self._source = container
+        self._count = 0
+        self._peak = 0
+        self._mean = 0
+        self._resize = 1
+        self._peak_nbytes = 0
+        self.cap = cap
+        self.policy = policy
+
+
+def track(name: str, container: Union[Sized, Callable[[], Sized]], **kwargs) -> Meter:
+    """
+    Returns a new, registered `Meter`; see `Meter.__init__`. The registry does not keep
+    the meter (or its container) alive, so the caller should hold it.
+    """
+    meter = Meter(name, container, **kwargs)
+    _registry.append(weakref.ref(meter))
+    for ms in _reporting:
+        ms.append(meter)
+    return meter
+
+
+def meters() -> List[Meter]:
+    """Returns the registered meters still alive, oldest first."""
+    alive = [r() for r in _registry]
+    _registry[:] = [ref for ref, m in zip(_registry, alive) if m is not None]
+    return [m for m in alive if m is not None]
+
+
+def clear() -> None:
+    """Forgets all registered meters, e.g. between tests."""
+    _registry.clear()
+
+
+def report(level: int = logging.INFO) -> Callable:
+    """
+    Decorator for cocotb test coroutines; logs the `summary` of meters registered during
+    the test once it ends (whether or not it passed), e.g.
+
+        @cocotb.test()
+        @ci.accounting.report()
+        async def test(dut): ...
+    """
+    def decorator(test: Callable) -> Callable:
+        @functools.wraps(test)
+        async def wrapper(*args, **kwargs):
+            ms = []
+            _reporting.append(ms)
+            try:
+                return await test(*args, **kwargs)
+            finally:
+                _reporting.remove(ms)
+                if ms:
+                    _LOG.log(level, f"{test.__name__} memory accounting:\n{summary(ms)}")
+        return wrapper
+    return decorator
+
+
+async def run(trig: Awaitable) -> None:
+    """Samples all registered meters each time `trig` fires; should be forked."""
+    while True:
+        await trig
+        for m in meters():
+            m.sample()
+
+
+def summary(ms: Optional[Iterable[Meter]] = None) -> str:
+    """Returns a table of counts, approximate sizes and high-water marks, e.g. for logging."""
+    ms = meters() if ms is None else list(ms)
+    width = max([len(m.name) for m in ms] + [4])
+    lines = [f"{'name':<{width}} {'count':>10} {'peak':>10} {'~bytes':>12} {'~peak bytes':>12} {'cap':>10}"]
+    for m in ms:
+        m.sample(check=False)
+        cap = f"{m.cap} ({m.policy})" if m.cap is not None else '-'
+        lines.append(
+            f"{m.name:<{width}} {m.count:>10} {m.peak:>10} {m.nbytes:>12} {m.peak_nbytes:>12} {cap:>10}"
+        )
+    return '\n'.join(lines)
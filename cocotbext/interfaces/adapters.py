@@ -1,7 +1,12 @@
 import abc
-from typing import Dict, Optional, Callable
+import collections
+import threading
+from concurrent.futures import Executor, Future
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple
 
 import cocotb as c
+import cocotbext.interfaces as ci
+from cocotb.triggers import Event
 from cocotb.drivers import Driver
 from cocotb.monitors import Monitor
 
@@ -9,52 +14,283 @@ from cocotb.monitors import Monitor
 class BaseDriver(Driver, metaclass=abc.ABCMeta):
     """
     cocotb-style Driver implementation for synchronous Avalon interfaces.
+
+    If `depth` is given, the driver prefetches: queued transactions are encoded (see
+    `BaseModel.encode`) as they are queued, while earlier transactions are still on the bus,
+    and `send` returns once its transaction is queued rather than sent, blocking while
+    `depth` transactions are already waiting.
     """
 
     @property
     def model(self): return self._model
 
+    @property
+    def depth(self) -> Optional[int]: return self._depth
+
+    @property
+    def latency(self): return self._latency
+
+    @property
+    def meter(self): return self._meter
+
+    def append(self, transaction, callback: Optional[Callable] = None,
+               event: Optional[Event] = None, **kwargs) -> None:
+        """Implementation for BaseDriver; pre-encodes transaction if prefetching."""
+        if self.depth is not None and 'encoded' not in kwargs:
+            with ci.profiling.section(self.model.profiler):
+                kwargs['encoded'] = self.model.encode(transaction)
+        super().append(transaction, callback, event, **kwargs)
+        self.meter.sample()
 
-    async def _driver_send(self, txn: Dict, sync: bool = True) -> None:
+    async def send(self, transaction, sync: bool = True, **kwargs) -> None:
+        """Implementation for BaseDriver; only blocks until queued if prefetching."""
+        if self.depth is None:
+            await super().send(transaction, sync, **kwargs)
+            return
+
+        while len(self._sendQ) >= self.depth:
+            self._space.clear()
+            await self._space.wait()
+        await self.meter.space(self.model.re)
+
+        self.append(transaction, **kwargs)
+
+    async def _send(self, transaction, callback: Optional[Callable], event: Optional[Event],
+                    sync: bool = True, **kwargs) -> None:
+        self._space.set() # Transaction was dequeued
+        self.meter.sample(check=False)
+        await super()._send(transaction, callback, event, sync=sync, **kwargs)
+
+    async def _driver_send(self, txn: Dict, sync: bool = True, encoded: Optional[Dict] = None) -> None:
         """Implementation for BaseDriver.
 
         Args:
             transaction: The transaction to send.
+            encoded: Encoding of the transaction, if available.
         """
 
-        await self.model.tx(txn, sync)
+        if encoded is None:
+            await self.model.tx(txn, sync)
+        else:
+            await self.model.tx(encoded, sync, encoded=True)
+
+        if self.latency is not None:
+            self.latency.start(self._correlated(txn), self.model.began)
+
+    def _correlated(self, txn):
+        """Returns `txn` in the form received by the corresponding monitor, for `latency`."""
+        return txn
 
 
     def __str__(self):
         return str(self.model)
 
     @abc.abstractmethod
-    def __init__(self, model) -> None:
+    def __init__(self, model, depth: Optional[int] = None, latency=None) -> None:
+        """
+        Args:
+            depth: Number of queued transactions to prefetch, if any.
+            latency: `LatencyTracker` started with each transaction, at its first cycle.
+        """
+        if depth is not None and depth < 1:
+            raise ValueError(f"Prefetch depth must be positive, was provided {depth}")
+
         self._model = model
+        self._depth = depth
+        self._latency = latency
+        self._meter = ci.accounting.track(f"{model.label}.sendQ", lambda: self._sendQ)
+        self._space = Event(f"{self.__class__.__name__}_space")
 
         # TODO: (redd@) self.log
         super().__init__()
 
+class _Lane:
+    """
+    Runs one callback on an executor, one transaction at a time and in order: the next
+    transaction is submitted as the previous call completes.
+    """
+
+    def submit(self, transaction) -> Future:
+        """Queues a call; returns a future of its result."""
+        out = Future()
+        with self._lock:
+            self._queue.append((transaction, out))
+            if self._running:
+                return out
+            self._running = True
+        self._next()
+        return out
+
+    def _next(self) -> None:
+        """Submits queued calls until one is running, or none remain."""
+        local = self._local
+        local.active = True
+        try:
+            while True:
+                with self._lock:
+                    if not self._queue:
+                        self._running = False
+                        return
+                    transaction, out = self._queue.popleft()
+                try:
+                    fut = self._executor.submit(self._callback, transaction)
+                except Exception as e: # E.g. executor shut down
+                    out.set_exception(e)
+                    continue
+                local.again = False
+                fut.add_done_callback(lambda f, out=out: self._done(f, out))
+                if not local.again: # Otherwise, completed within add_done_callback
+                    return
+        finally:
+            local.active = False
+
+    def _done(self, fut: Future, out: Future) -> None:
+        e = fut.exception()
+        if e is not None:
+            out.set_exception(e)
+        else:
+            out.set_result(fut.result())
+        if getattr(self._local, 'active', False):
+            self._local.again = True # Continue in `_next`, rather than recursing
+        else:
+            self._next()
+
+    def __init__(self, executor: Executor, callback: Callable) -> None:
+        self._executor = executor
+        self._callback = callback
+        self._queue: Deque[Tuple[object, Future]] = collections.deque()
+        self._running = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+
 class BaseMonitor(Monitor, metaclass=abc.ABCMeta):
     """
     cocotb-style Monitor implementation for synchronous Avalon interfaces.
-    """
 
+    If an `executor` is given, callbacks are submitted to it rather than called inline, so
+    that expensive callbacks overlap with simulation; callbacks must be picklable for a
+    process pool. Each callback runs on one transaction at a time, in the order received
+    (see `_Lane`), so stateful callbacks such as `Scoreboard.compare` remain correct with
+    any number of workers; different callbacks may run concurrently. Results are collected
+    in submission order at each clock edge, and the first callback error is raised into
+    the test.
+    """
 
     @property
     def model(self): return self._model
 
+    @property
+    def executor(self) -> Optional[Executor]: return self._executor
+
+    @property
+    def latency(self): return self._latency
+
+    @property
+    def meter(self): return self._meter
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted callbacks not yet collected."""
+        return len(self._futures)
+
     async def _monitor_recv(self) -> None:
         """Implementation for BaseMonitor"""
-        txn = await self.model.rx()
-        self._recv(txn)
+        while True:
+            txn = await self.model.rx()
+            with ci.profiling.section(self.model.profiler): # Incl. inline callbacks
+                self._recv(txn)
+
+    def _submit(self, callbacks: Iterable[Callable], transaction) -> None:
+        """Submits each callback on `transaction` to its lane of `self.executor`."""
+        for cb in callbacks:
+            lane = self._lanes.get(cb)
+            if lane is None:
+                lane = self._lanes[cb] = _Lane(self.executor, cb)
+            self._futures.append(lane.submit(transaction))
+        self._submitted.set()
+
+    def _recv(self, transaction, queue: Optional[Deque] = None, consumed: bool = False) -> None:
+        """
+        Implementation for BaseMonitor; submits callbacks to `self.executor`, if any.
+
+        Args:
+            queue: Where the transaction is stored if there are no callbacks (default `_recvQ`).
+            consumed: The transaction was handled elsewhere, so is not stored.
+        """
+        if self.latency is not None:
+            self.latency.stop(transaction)
+
+        self.stats.received_transactions += 1
+
+        if self._callbacks:
+            if self.executor is None:
+                for cb in self._callbacks:
+                    cb(transaction)
+            else:
+                self._submit(self._callbacks, transaction)
+        elif not consumed:
+            (self._recvQ if queue is None else queue).append(transaction)
+        self.meter.sample()
+        if self._futures_meter is not None:
+            self._futures_meter.sample()
+
+        if self._event is not None:
+            self._event.set(data=transaction)
+
+        if self._wait_event is not None:
+            self._wait_event.set(data=transaction)
+            self._wait_event.clear()
+
+    def _collect(self) -> None:
+        """Collects completed callbacks in order, raising the first error."""
+        while self._futures and self._futures[0].done():
+            self._futures.popleft().result()
+
+    async def _collect_thread(self) -> None:
+        while True:
+            while not self._futures:
+                self._submitted.clear()
+                await self._submitted.wait()
+
+            await self.model.re
+            self._collect()
+
+    async def join(self) -> None:
+        """Blocking call to wait for all submitted callbacks to complete."""
+        while self._futures:
+            await self.model.re
+            self._collect()
+
+    def kill(self) -> None:
+        super().kill()
+        if self._collector:
+            self._collector.kill()
+            self._collector = None
 
     def __str__(self):
         return str(self.model)
 
     @abc.abstractmethod
-    def __init__(self, model, callback: Optional[Callable] = None) -> None:
+    def __init__(self, model, callback: Optional[Callable] = None,
+                 executor: Optional[Executor] = None,
+                 latency=None) -> None:
+        """
+        Args:
+            executor: Optional thread/process pool to which callbacks are submitted.
+            latency: `LatencyTracker` stopped with each received transaction.
+        """
         self._model = model
         self.name = model.itf.bus_name
+        self._executor = executor
+        self._latency = latency
+        self._futures = collections.deque()
+        self._lanes = {} # By callback
+        self._meter = ci.accounting.track(f"{model.label}.recvQ", lambda: self._recvQ)
+        self._futures_meter = ci.accounting.track(
+            f"{model.label}.callbacks", self._futures
+        ) if executor is not None else None
+        self._submitted = Event(f"{self.__class__.__name__}_submitted")
+        self._collector = c.scheduler.add(self._collect_thread()) if executor is not None else None
         # TODO: (redd@) self.log
         super().__init__(callback)
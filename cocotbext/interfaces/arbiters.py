@@ -0,0 +1,124 @@
+import abc
+from typing import List, Optional, Sequence
+
+import cocotbext.interfaces as ci
+
+POLICIES = ('round_robin', 'weighted', 'strict')
+
+
+class Arbiter(ci.Pretty, metaclass=abc.ABCMeta):
+    """
+    Chooses one of several requesting channels, e.g. at each packet boundary of a
+    channelized source; counts the grants made to each.
+    """
+
+    @property
+    def channels(self) -> int: return self._channels
+
+    @property
+    def grants(self) -> List[int]:
+        """Number of grants made to each channel."""
+        return self._grants
+
+    @abc.abstractmethod
+    def _choose(self, requests: Sequence[int]) -> int:
+        """Returns one of `requests`, which is non-empty and ascending. Should be extended by child class."""
+        pass
+
+    def choose(self, requests: Sequence[int]) -> Optional[int]:
+        """Grants one of the requesting channels, if any."""
+        if not requests:
+            return None
+        ch = self._choose(sorted(requests))
+        self._grants[ch] += 1
+        return ch
+
+    def reset(self) -> None:
+        self._grants = [0] * self._channels
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}(channels={self._channels})>"
+
+    def __init__(self, channels: int) -> None:
+        super().__init__()
+
+        if channels < 1:
+            raise ValueError(f"Arbiter requires at least one channel, was provided {channels}")
+        self._channels = channels
+        self.reset()
+
+
+class RoundRobin(Arbiter):
+    """Grants the first requesting channel after the last granted."""
+
+    def _choose(self, requests: Sequence[int]) -> int:
+        ch = next((r for r in requests if r > self._last), requests[0])
+        self._last = ch
+        return ch
+
+    def reset(self) -> None:
+        super().reset()
+        self._last = -1
+
+
+class WeightedRoundRobin(Arbiter):
+    """
+    Grants requesting channels in proportion to their weights, interleaving them smoothly
+    (rather than in bursts) as in nginx's smooth weighted round-robin.
+    """
+
+    @property
+    def weights(self) -> List[int]: return self._weights
+
+    def _choose(self, requests: Sequence[int]) -> int:
+        cur, w = self._current, self._weights
+        for r in requests:
+            cur[r] += w[r]
+        ch = max(requests, key=lambda r: cur[r]) # Ties go to the lowest channel
+        cur[ch] -= sum(w[r] for r in requests)
+        return ch
+
+    def reset(self) -> None:
+        super().reset()
+        self._current = [0] * self._channels
+
+    def __init__(self, channels: int, weights: Sequence[int]) -> None:
+        if len(weights) != channels or any(w < 1 for w in weights):
+            raise ValueError(f"Arbiter requires a positive weight per channel, was provided {weights}")
+        self._weights = list(weights)
+        super().__init__(channels)
+
+
+class StrictPriority(Arbiter):
+    """
+    Grants the requesting channel of highest priority (by default, the lowest channel);
+    lower priorities may starve.
+    """
+
+    @property
+    def priorities(self) -> List[int]: return self._priorities
+
+    def _choose(self, requests: Sequence[int]) -> int:
+        return max(requests, key=lambda r: self._priorities[r])
+
+    def __init__(self, channels: int, priorities: Optional[Sequence[int]] = None) -> None:
+        if priorities is None:
+            priorities = range(channels, 0, -1)
+        if len(priorities) != channels:
+            raise ValueError(f"Arbiter requires a priority per channel, was provided {priorities}")
+        self._priorities = list(priorities)
+        super().__init__(channels)
+
+
+def arbiter(policy: str, channels: int, weights: Optional[Sequence[int]] = None) -> Arbiter:
+    """
+    Returns an arbiter for one of `POLICIES`; `weights` are the weights ('weighted') or
+    priorities ('strict') of each channel.
+    """
+    if policy == 'round_robin':
+        return RoundRobin(channels)
+    if policy == 'weighted':
+        return WeightedRoundRobin(channels, weights if weights is not None else [1] * channels)
+    if policy == 'strict':
+        return StrictPriority(channels, weights)
+    raise ValueError(f"Arbitration policy must be one of {POLICIES}, was provided {policy}")
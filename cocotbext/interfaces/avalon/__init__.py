@@ -110,7 +110,7 @@ class BaseSynchronousModel(ci.model.BaseModel, metaclass=abc.ABCMeta):
     def itf(self) -> BaseSynchronousInterface:
         return self._itf
 
-    async def tx(self, txn: Dict, sync: bool = True) -> None:
+    async def tx(self, txn: Dict, sync: bool = True, encoded: bool = False) -> None:
         """
         Blocking call to transmit a logical input as physical stimulus, driving
         pins of the interface. This (generally) consumes simulation time.
@@ -118,7 +118,7 @@ class BaseSynchronousModel(ci.model.BaseModel, metaclass=abc.ABCMeta):
         if sync:
             await self.re
 
-        await self.input(txn, self.re)
+        await self.input(txn, self.re, encoded)
 
     async def rx(self) -> Dict:
         """
@@ -0,0 +1,478 @@
+import collections
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+import cocotb as c
+from cocotb.monitors import Monitor
+from cocotb.triggers import Event, ReadOnly, RisingEdge
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon.streaming as cias
+
+
+def _lanes(mask: int) -> Iterator[int]:
+    """Iterates over indices of set bits, i.e. active lanes."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ArrayedStreamingInterface(cias.StreamingInterface):
+    """
+    AvalonST interface of `lanes` identical ports, with each signal shared by all ports and
+    lane `i` in bits [i * width, (i + 1) * width), e.g. for switch DUTs exposing arrayed
+    ports. Properties apply to every lane; clock and reset are shared.
+
+    Each shared signal is read once per cycle as a single int, so that per-lane controls
+    are bit masks and are combined with bitwise operations, across all lanes at once.
+    """
+
+    @property
+    def full(self) -> int:
+        """Mask of all lanes."""
+        return self._full
+
+    def read(self, name: str) -> Tuple[int, int]:
+        """
+        Returns the (active-high) value of a shared signal, and a mask of its unresolved
+        bits, which read as zero.
+        """
+        s = self[name]
+        val = s.handle.value
+        if val.is_resolvable:
+            raw, unresolved = val.integer, 0
+        else:
+            bits = val.binstr
+            raw = int(bits.translate(self._ZEROS), 2)
+            unresolved = int(bits.translate(self._UNRESOLVED), 2)
+        if not s.logic_active_high:
+            raw ^= (1 << len(s.handle)) - 1
+        return raw, unresolved
+
+    def lane(self, name: str, val: int, i: int) -> int:
+        """Returns lane `i` of a shared signal's value."""
+        w = self[name].width
+        return (val >> (i * w)) & ((1 << w) - 1)
+
+    _ZEROS = str.maketrans('xXzZuUwWlLhH-', '0000000000110')
+    _UNRESOLVED = str.maketrans('01xXzZuUwWlLhH-', '001111111111111')
+
+    def __init__(self, *args, lanes: int, **kwargs) -> None:
+        if lanes < 1:
+            raise ci.InterfacePropertyError(f"Arrayed interface requires at least one lane, was provided {lanes}")
+        self._full = (1 << lanes) - 1
+        super().__init__(*args, lanes=lanes, **kwargs)
+
+        if not self['valid'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self)} arrayed interface requires valid signal")
+
+
+class _ReadyWindow(object):
+    """
+    As `ci.signal.CreditTracker`, over lane masks: asserted for lanes whose ready was
+    asserted between `hi` and `lo` cycles before.
+    """
+
+    @property
+    def value(self) -> int:
+        out = 0
+        for r in self._hist[self._lo:]:
+            out |= r
+        return out
+
+    @property
+    def upcoming(self) -> int:
+        """As `value`, for the following cycle (all lanes if the window includes it)."""
+        if not self._lo:
+            return self._full
+        out = 0
+        for r in self._hist[self._lo - 1:self._hi]:
+            out |= r
+        return out
+
+    def tick(self, ready: int) -> None:
+        self._hist.insert(0, ready)
+        del self._hist[self._hi + 1:]
+
+    def clear(self) -> None:
+        self._hist = [0] * (self._hi + 1)
+
+    def __init__(self, lo: int, hi: int, full: int) -> None:
+        self._lo = lo
+        self._hi = hi
+        self._full = full
+        self.clear()
+
+
+class ArrayedSinkModel(ci.Pretty):
+    """
+    Passively receives packets on all lanes of an `ArrayedStreamingInterface`.
+
+    Per-lane state (in-packet flags, channels, partial packets) is held in masks and
+    lists indexed by lane. Each cycle, shared signals are read once and transfers are
+    found across all lanes with bitwise operations; only lanes with a transfer are then
+    sliced. Byte-aligned data is sliced directly from the bus's little-endian bytes into
+    each lane's `Packet`.
+    """
+
+    @property
+    def itf(self) -> ArrayedStreamingInterface: return self._itf
+
+    @property
+    def in_pkt(self) -> int:
+        """Mask of lanes within a packet."""
+        return self._in_pkt
+
+    @property
+    def beats(self) -> List[int]: return self._beats
+
+    def reset(self) -> None:
+        self._in_pkt = 0
+        self._pkts = [None] * self.itf.lanes
+        self._channels = [None] * self.itf.lanes
+        if self._ready is not None:
+            self._ready.clear()
+
+    def _packet(self) -> cias.Packet:
+        return cias.Packet(
+            self._width,
+            error=0 if self.itf['error'].instantiated else None
+        )
+
+    def sample(self) -> List[Tuple[int, cias.Packet]]:
+        """Samples the current cycle; returns (lane, packet) of each completed packet."""
+        itf = self.itf
+
+        if itf['reset'].capture():
+            self.reset()
+            return []
+
+        valid, unresolved = itf.read('valid')
+        if unresolved:
+            raise ci.InterfaceProtocolError(f"Valid signal ({str(itf['valid'])}) is unresolvable")
+        if self._ready is not None:
+            ready, _ = itf.read('ready')
+            self._ready.tick(ready)
+            valid &= self._ready.value
+        if not valid:
+            return []
+
+        fields = {}
+        for name in ('startofpacket', 'endofpacket', 'channel', 'error', 'empty', 'data'):
+            if itf[name].instantiated:
+                fields[name], unresolved = itf.read(name)
+                if unresolved and any(itf.lane(name, unresolved, i) for i in _lanes(valid)):
+                    raise ci.InterfaceProtocolError(
+                        f"Signal ({str(itf[name])}) is unresolvable within a transfer"
+                    )
+
+        # Packet checks, across lanes
+        if itf.packets:
+            starts = valid & fields['startofpacket']
+            ends = valid & fields['endofpacket']
+            if starts & self._in_pkt:
+                raise ci.InterfaceProtocolError(
+                    f"Duplicate startofpacket signal on lanes {list(_lanes(starts & self._in_pkt))}"
+                )
+            if valid & ~(self._in_pkt | starts):
+                raise ci.InterfaceProtocolError(
+                    f"Attempted transfer outside of packet on lanes {list(_lanes(valid & ~(self._in_pkt | starts)))}"
+                )
+            self._in_pkt = (self._in_pkt | starts) & ~ends
+        else:
+            ends = valid
+
+        data = fields.get('data')
+        raw = data.to_bytes(itf.lanes * self._stride, 'little') if data is not None and self._aligned else None
+
+        out = []
+        for i in _lanes(valid):
+            pkt = self._pkts[i]
+            if pkt is None:
+                pkt = self._pkts[i] = self._packet()
+            self._beats[i] += 1
+            end = ends >> i & 1
+
+            if 'channel' in fields:
+                channel = itf.lane('channel', fields['channel'], i)
+                if self._channels[i] is not None and channel != self._channels[i]:
+                    raise ci.InterfaceProtocolError(
+                        f"Channel changed within packet on lane {i} ({self._channels[i]}->{channel})"
+                    )
+                self._channels[i] = channel
+
+            if data is not None:
+                empty = itf.lane('empty', fields['empty'], i) if 'empty' in fields else 0
+                if empty and (end or itf.empty_within_packet):
+                    pkt.append(itf.mask_beat(itf.lane('data', data, i), empty))
+                elif raw is not None:
+                    pkt.extend(raw[i * self._stride:(i + 1) * self._stride])
+                else:
+                    pkt.append(itf.lane('data', data, i))
+
+            if 'error' in fields:
+                pkt.error |= itf.lane('error', fields['error'], i)
+
+            if end:
+                pkt.channel = self._channels[i]
+                if 'empty' in fields:
+                    pkt.empty = itf.lane('empty', fields['empty'], i)
+                out.append((i, pkt))
+                self._pkts[i] = None
+                self._channels[i] = None
+
+        return out
+
+    def __init__(self, itf: ArrayedStreamingInterface) -> None:
+        super().__init__()
+
+        self._itf = itf
+        self._width = itf['data'].width if itf['data'].instantiated else None
+        self._stride = (self._width + 7) // 8 if self._width is not None else 0
+        self._aligned = self._width is not None and self._width % 8 == 0
+        self._ready = _ReadyWindow(
+            itf.ready_latency, itf.ready_allowance, itf.full
+        ) if itf['ready'].instantiated else None
+        self._beats = [0] * itf.lanes
+        self.reset()
+
+
+class ArrayedSourceModel(ci.Pretty):
+    """
+    Drives packets queued per lane onto an `ArrayedStreamingInterface`.
+
+    Each cycle, ready is read once and accepted beats are found across all lanes with
+    bitwise operations; lanes which advance update their slice of each shared signal,
+    which is then written once. With non-zero readyLatency, valid is only asserted on
+    lanes where a transfer is permitted.
+    """
+
+    @property
+    def itf(self) -> ArrayedStreamingInterface: return self._itf
+
+    @property
+    def pending(self) -> int:
+        """Number of packets queued or in progress (held in their queues until sent), across lanes."""
+        return sum(len(q) for q in self._queues)
+
+    def append(self, lane: int, pkt: cias.Packet, callback: Optional[Callable] = None) -> None:
+        """Queues a packet on `lane`; `callback(lane, pkt)` is called once it is sent."""
+        if not 0 <= lane < self.itf.lanes:
+            raise IndexError(f"{str(self)} lane {lane} out of range")
+        if self._data is not None and not pkt.nbeats:
+            raise ValueError(f"{str(self)} packet on lane {lane} has no data beats")
+        self._queues[lane].append((pkt, callback))
+        self._queued |= 1 << lane
+        self._idle.clear()
+
+    def _set(self, name: str, i: int, val: int) -> None:
+        w = self.itf[name].width
+        m = ((1 << w) - 1) << (i * w)
+        self._vals[name] = (self._vals[name] & ~m) | (val << (i * w))
+
+    def _present(self, i: int) -> bool:
+        """Places lane `i`'s next beat in its slices; returns False if it has none."""
+        pkt, pos = self._cur[i], self._pos[i]
+        if pkt is not None and pos >= max(pkt.nbeats, 1): # Zero-beat packets (only without data) take one
+            self._sent(i)
+            pkt = None
+        if pkt is None:
+            if not self._queues[i]:
+                self._queued &= ~(1 << i)
+                return False
+            pkt, pos = self._queues[i][0][0], 0
+            self._cur[i] = pkt
+            self._raw[i] = pkt.tobytes()
+
+        itf, last = self.itf, pos >= pkt.nbeats - 1
+        if self._data is not None:
+            s = self._stride
+            self._data[i * s:(i + 1) * s] = self._raw[i][pos * s:(pos + 1) * s]
+        if itf.packets:
+            self._set('startofpacket', i, int(pos == 0))
+            self._set('endofpacket', i, int(last))
+        if 'empty' in self._vals:
+            self._set('empty', i, pkt.empty if last else 0)
+        if 'error' in self._vals:
+            self._set('error', i, (pkt.error or 0) if last else 0)
+        if 'channel' in self._vals:
+            self._set('channel', i, pkt.channel or 0)
+        self._pos[i] = pos + 1
+        return True
+
+    def _sent(self, i: int) -> None:
+        pkt, callback = self._queues[i].popleft()
+        self._cur[i] = None
+        self._raw[i] = None
+        if callback is not None:
+            callback(i, pkt)
+
+    def _write(self) -> None:
+        vals = dict(self._vals)
+        if self._data is not None:
+            vals['data'] = int.from_bytes(self._data, 'little')
+        for name, val in vals.items():
+            if self._written.get(name) != val:
+                s = self.itf[name]
+                s.write(val if s.logic_active_high else val ^ ((1 << len(s.handle)) - 1))
+                self._written[name] = val
+
+    def cycle(self) -> None:
+        """Advances one cycle: retires accepted beats, then presents the next."""
+        itf = self.itf
+        if itf['reset'].capture():
+            self._presented = 0
+            self._pos = [0] * itf.lanes # Restart packets in progress
+            if self._ready is not None:
+                self._ready.clear()
+            self._vals['valid'] = 0
+            self._write()
+            return
+
+        if self._ready is not None:
+            ready, _ = itf.read('ready')
+            self._ready.tick(ready)
+            accepted = self._vals['valid'] & self._ready.value
+            permitted = self._ready.upcoming
+        else:
+            accepted = self._vals['valid']
+            permitted = itf.full
+
+        # Lanes whose beat was accepted, or with nothing presented but queued, move on
+        for i in _lanes(accepted | (self._queued & ~self._presented)):
+            if self._present(i):
+                self._presented |= 1 << i
+            else:
+                self._presented &= ~(1 << i)
+
+        self._vals['valid'] = self._presented & permitted
+        self._write()
+
+        if not self._presented and not any(self._queues):
+            self._idle.set()
+
+    async def run(self) -> None:
+        """Drives all lanes, each clock cycle; should be forked."""
+        while True:
+            await self._re
+            self.cycle()
+
+    async def join(self) -> None:
+        """Blocking call to wait for all queued packets to be sent."""
+        while self.pending:
+            await self._idle.wait()
+
+    def __init__(self, itf: ArrayedStreamingInterface) -> None:
+        super().__init__()
+
+        self._itf = itf
+        self._re = RisingEdge(itf.clock)
+        width = itf['data'].width if itf['data'].instantiated else None
+        if width is not None and width % 8:
+            raise ci.InterfacePropertyError(f"{str(self)} requires byte-aligned data lanes, was provided {width}")
+        self._stride = width // 8 if width is not None else 0
+        self._data = bytearray(itf.lanes * self._stride) if width is not None else None
+        self._vals = {'valid': 0}
+        for name in ('startofpacket', 'endofpacket', 'channel', 'error', 'empty'):
+            if itf[name].instantiated:
+                self._vals[name] = 0
+        self._written = {}
+        self._ready = _ReadyWindow(
+            itf.ready_latency, itf.ready_allowance, itf.full
+        ) if itf['ready'].instantiated else None
+
+        self._queues: List[Deque[Tuple[cias.Packet, Optional[Callable]]]] = \
+            [collections.deque() for _ in range(itf.lanes)]
+        self._cur: List[Optional[cias.Packet]] = [None] * itf.lanes
+        self._raw: List[Optional[bytes]] = [None] * itf.lanes
+        self._queued = 0 # Lanes with queued packets
+        self._pos = [0] * itf.lanes
+        self._presented = 0
+        self._idle = Event(f"{self.__class__.__name__}_idle")
+        self._idle.set()
+
+
+class LaneMonitor(Monitor):
+    """cocotb Monitor of one lane, fed by an `ArrayedStreamingMonitor`; e.g. for a Scoreboard."""
+
+    async def _monitor_recv(self) -> None:
+        await Event().wait() # Transactions are received from the arrayed monitor
+
+    def __init__(self, name: str, callback: Optional[Callable] = None) -> None:
+        self.name = name
+        super().__init__(callback)
+
+
+class ArrayedStreamingMonitor(Monitor):
+    """
+    cocotb Monitor of all lanes of an arrayed AvalonST interface, receiving (lane, `Packet`)
+    tuples; per-lane monitors are returned by `lane`.
+    """
+
+    @property
+    def model(self) -> ArrayedSinkModel: return self._model
+
+    def lane(self, i: int) -> LaneMonitor:
+        """Returns the monitor of lane `i`, which receives its `Packet`s."""
+        if self._lanes[i] is None:
+            self._lanes[i] = LaneMonitor(f"{self.name}[{i}]")
+        return self._lanes[i]
+
+    async def _monitor_recv(self) -> None:
+        re, ro = RisingEdge(self.model.itf.clock), ReadOnly()
+        while True:
+            await re
+            await ro
+            for i, pkt in self.model.sample():
+                self._recv((i, pkt))
+                if self._lanes[i] is not None:
+                    self._lanes[i]._recv(pkt)
+
+    def __str__(self):
+        return str(self.model)
+
+    def __init__(self, *args, lanes: int, callback: Optional[Callable] = None, **kwargs) -> None:
+        """Implementation for arrayed AvalonST; args target `ArrayedStreamingInterface`."""
+        itf = ArrayedStreamingInterface(*args, lanes=lanes, **kwargs)
+        self._model = ArrayedSinkModel(itf)
+        self._lanes: List[Optional[LaneMonitor]] = [None] * lanes
+        self.name = itf.bus_name
+        super().__init__(callback)
+
+
+class ArrayedStreamingDriver(ci.Pretty):
+    """
+    Drives packets onto any lane of an arrayed AvalonST interface; lanes are independent, so
+    a packet waiting on one lane does not block others.
+    """
+
+    @property
+    def model(self) -> ArrayedSourceModel: return self._model
+
+    def append(self, lane: int, pkt: cias.Packet, callback: Optional[Callable] = None) -> None:
+        """Queues a packet on `lane` without blocking."""
+        self.model.append(lane, pkt, callback)
+
+    async def send(self, lane: int, pkt: cias.Packet) -> None:
+        """Blocking call to send a packet on `lane`."""
+        done = Event()
+        self.model.append(lane, pkt, lambda i, p: done.set())
+        await done.wait()
+
+    async def join(self) -> None:
+        await self.model.join()
+
+    def kill(self) -> None:
+        if self._thread:
+            self._thread.kill()
+            self._thread = None
+
+    def __str__(self):
+        return str(self.model)
+
+    def __init__(self, *args, lanes: int, **kwargs) -> None:
+        """Implementation for arrayed AvalonST; args target `ArrayedStreamingInterface`."""
+        super().__init__()
+        itf = ArrayedStreamingInterface(*args, lanes=lanes, **kwargs)
+        self._model = ArrayedSourceModel(itf)
+        self._thread = c.fork(self.model.run())
@@ -0,0 +1,187 @@
+import argparse
+import collections
+import json
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import cocotbext.interfaces.avalon.recording as ciar
+
+_DTYPES = {'B': '<u1', 'H': '<u2', 'I': '<u4', 'Q': '<u8'}
+
+
+class Violation(NamedTuple):
+    cycle: int
+    rule: str
+    message: str
+
+
+def load(path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Returns the header and columns of a recording (see `StreamingRecorder`)."""
+    with open(path, 'rb') as f:
+        buf = f.read()
+
+    if not buf.startswith(ciar.MAGIC):
+        raise ValueError(f"Not an AvalonST recording: {path}")
+    pos = len(ciar.MAGIC)
+    (n,) = ciar._HEADER.unpack_from(buf, pos)
+    pos += ciar._HEADER.size
+    meta = json.loads(buf[pos:pos + n])
+    pos += n
+
+    chunks = {name: [] for name, _, _ in meta['columns']}
+    while pos < len(buf):
+        (n,) = ciar._CHUNK.unpack_from(buf, pos)
+        pos += ciar._CHUNK.size
+        for name, code, _ in meta['columns']:
+            dtype = np.dtype(_DTYPES[code])
+            chunks[name].append(np.frombuffer(buf, dtype=dtype, count=n, offset=pos))
+            pos += n * dtype.itemsize
+
+    cols = {
+        name: np.concatenate(chunks[name]) if chunks[name] else np.zeros(0, dtype=_DTYPES[code])
+        for name, code, _ in meta['columns']
+    }
+    return meta, cols
+
+
+def _window(ready: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Asserted in cycles where `ready` was asserted between `lo` and `hi` cycles before."""
+    cs = np.concatenate(([0], np.cumsum(ready, dtype=np.int64)))
+    idx = np.arange(len(ready))
+    upper = np.clip(idx - lo + 1, 0, len(ready))  # Exclusive
+    lower = np.clip(idx - hi, 0, len(ready))
+    return cs[upper] - cs[lower] > 0
+
+
+def _last(mask: np.ndarray) -> np.ndarray:
+    """Returns, for each cycle, the index of the last cycle *before* it in `mask` (or -1)."""
+    idx = np.where(mask, np.arange(len(mask)), -1)
+    last = np.maximum.accumulate(idx) if len(idx) else idx
+    return np.concatenate(([-1], last[:-1])) if len(last) else last
+
+
+def check(meta: Dict, cols: Dict[str, np.ndarray],
+          limit: Optional[int] = 1000) -> Tuple[Dict[str, int], List[Violation]]:
+    """
+    Checks AvalonST rules over recorded columns; returns the number of violations of each
+    rule, and the first `limit` violations (by cycle).
+
+    Rules are as checked online by `PassiveSinkModel` (duplicate startofpacket, transfer
+    outside of packet, channel changed within packet), `StreamingInterface` validators
+    (channel range, empty) and readyLatency compliance, i.e. valid asserted only in cycles
+    where ready was asserted between readyLatency and readyAllowance cycles before.
+    """
+    n = len(next(iter(cols.values()))) if cols else 0
+    x = {name: ciar.unresolved(code) for name, code, _ in meta['columns']}
+    found = []  # (rule, cycles, messages or a message)
+
+    def flag(rule: str, mask: np.ndarray, message) -> None:
+        cycles = np.flatnonzero(mask)
+        if len(cycles):
+            found.append((rule, cycles, message))
+
+    # Unresolvable resets are taken as asserted; without valid, every (ready) cycle transfers
+    reset = cols['reset'] != 0 if 'reset' in cols else np.zeros(n, dtype=bool)
+    active = ~reset
+    if 'valid' in cols:
+        flag('unresolved', active & (cols['valid'] == x['valid']), "Signal (valid) is unresolvable")
+        valid = active & (cols['valid'] == 1)
+    else:
+        valid = active
+
+    if 'ready' in cols:
+        lo = meta['ready_latency'] or 0
+        hi = max(meta['ready_allowance'] or 0, lo)
+        permitted = _window(cols['ready'] == 1, lo, hi)
+        if lo:
+            flag('ready_latency', valid & ~permitted,
+                 f"Valid asserted outside of ready window (readyLatency {lo}, readyAllowance {hi})")
+    else:
+        permitted = np.ones(n, dtype=bool)
+    transfer = valid & permitted
+
+    for name in ('startofpacket', 'endofpacket', 'channel', 'empty'):
+        if name in cols:
+            flag('unresolved', transfer & (cols[name] == x[name]), f"Signal ({name}) is unresolvable")
+
+    if meta['packets']:
+        sop = transfer & (cols['startofpacket'] == 1)
+        eop = transfer & (cols['endofpacket'] == 1)
+
+        # Packet state before each cycle is that after the last transfer marking a packet
+        # boundary (or reset): inside iff that transfer had startofpacket but not endofpacket
+        events = sop | eop | reset
+        last = _last(events)
+        opened = sop & ~eop
+        in_pkt = np.where(last >= 0, opened[np.maximum(last, 0)], False)
+
+        flag('duplicate_sop', sop & in_pkt, "Duplicate startofpacket signal")
+        flag('outside_packet', transfer & ~sop & ~in_pkt, "Attempted transfer outside of packet")
+
+        if 'channel' in cols:
+            prev = _last(transfer)
+            ch = cols['channel']
+            changed = transfer & ~sop & in_pkt & (prev >= 0)
+            changed &= ch != ch[np.maximum(prev, 0)]
+            cycles = np.flatnonzero(changed)
+            if len(cycles):
+                found.append(('channel_changed', cycles, [
+                    f"Channel changed within packet ({a}->{b})"
+                    for a, b in zip(ch[prev[cycles]].tolist(), ch[cycles].tolist())
+                ]))
+
+    if 'channel' in cols and meta['max_channel'] is not None:
+        ch = cols['channel']
+        flag('channel_range', transfer & (ch > meta['max_channel']) & (ch != x['channel']),
+             f"Channel exceeds maxChannel ({meta['max_channel']})")
+
+    if 'empty' in cols:
+        empty = cols['empty']
+        spb = meta['symbols_per_beat'] or 1
+        flag('empty_range', transfer & (empty >= spb) & (empty != x['empty']),
+             f"Empty must be less than symbols per beat ({spb})")
+        if meta['packets'] and not meta['empty_within_packet']:
+            flag('empty_before_eop', transfer & (empty != 0) & (empty != x['empty'])
+                 & (cols['endofpacket'] != 1), "Empty asserted before endofpacket")
+
+    counts = collections.Counter()
+    violations = []
+    for rule, cycles, message in found:
+        counts[rule] += len(cycles)
+        keep = cycles[:limit] if limit is not None else cycles
+        messages = message[:len(keep)] if isinstance(message, list) else [message] * len(keep)
+        violations.extend(Violation(c, rule, m) for c, m in zip(keep.tolist(), messages))
+
+    violations.sort()
+    return dict(counts), violations[:limit] if limit is not None else violations
+
+
+def check_file(path: str, limit: Optional[int] = 1000) -> Tuple[Dict[str, int], List[Violation]]:
+    """As `check`, for a recording file."""
+    return check(*load(path), limit=limit)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check AvalonST rules over recorded bus traces.")
+    parser.add_argument("files", nargs='+', help="Recordings written by StreamingRecorder")
+    parser.add_argument("--limit", type=int, default=20, help="Violations listed per file")
+    args = parser.parse_args(argv)
+
+    rc = 0
+    for path in args.files:
+        meta, cols = load(path)
+        counts, violations = check(meta, cols, limit=args.limit)
+        cycles = len(next(iter(cols.values()), ()))
+        print(f"{path} ({meta['bus_name']}): {cycles} cycles, {sum(counts.values())} violations")
+        for rule, count in sorted(counts.items()):
+            print(f"  {rule}: {count}")
+        for v in violations:
+            print(f"  cycle {v.cycle}: [{v.rule}] {v.message}")
+        rc |= bool(counts)
+    return rc
+
+
+if __name__ == '__main__':
+    sys.exit(main())
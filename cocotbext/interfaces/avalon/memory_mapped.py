@@ -0,0 +1,617 @@
+import collections
+import mmap
+import os
+import warnings
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import cocotb.triggers as ct
+from cocotb.binary import BinaryValue
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon as cia
+
+
+class SparseMemory(ci.Pretty):
+    """
+    Byte-addressed memory backed by a sparse page table, so that large address spaces can
+    be emulated without allocating them. Pages are allocated on first write; reads of
+    unallocated pages return `fill` bytes.
+
+    Word accesses which do not cross a page boundary cost one page table lookup.
+    """
+
+    @property
+    def page_size(self) -> int: return self._page_size
+
+    @property
+    def pages(self) -> Dict[int, Union[bytearray, memoryview]]:
+        """Page table, indexed by page number."""
+        return self._pages
+
+    @property
+    def allocated(self) -> int:
+        """Number of bytes backed by pages."""
+        return len(self._pages) * self._page_size
+
+    def _page(self, n: int) -> Union[bytearray, memoryview]:
+        page = self._pages.get(n)
+        if page is None:
+            page = self._pages[n] = bytearray(self._blank)
+        return page
+
+    def read(self, address: int, size: int) -> bytes:
+        """Returns `size` bytes starting at `address`."""
+        out = bytearray()
+        while size:
+            n, off = address >> self._shift, address & self._mask
+            chunk = min(size, self._page_size - off)
+            page = self._pages.get(n)
+            out += page[off:off + chunk] if page is not None else self._blank[:chunk]
+            address += chunk
+            size -= chunk
+        return bytes(out)
+
+    def write(self, address: int, data: bytes) -> None:
+        """Writes `data` starting at `address`, allocating pages as needed."""
+        data = memoryview(data)
+        while data:
+            n, off = address >> self._shift, address & self._mask
+            chunk = min(len(data), self._page_size - off)
+            self._page(n)[off:off + chunk] = data[:chunk]
+            address += chunk
+            data = data[chunk:]
+
+    def read_word(self, address: int, size: int) -> int:
+        """Returns the little-endian word of `size` bytes at `address`."""
+        off = address & self._mask
+        if off + size > self._page_size:
+            return int.from_bytes(self.read(address, size), 'little')
+        page = self._pages.get(address >> self._shift)
+        return int.from_bytes(page[off:off + size], 'little') if page is not None else self._fill_word(size)
+
+    def write_word(self, address: int, size: int, value: int, enable: Optional[int] = None) -> None:
+        """
+        Writes the little-endian word of `size` bytes at `address`.
+
+        Args:
+            enable: Optional mask with one bit per byte; disabled bytes are left unchanged.
+        """
+        data = value.to_bytes(size, 'little')
+        if enable is not None and enable != (1 << size) - 1:
+            for i in range(size):
+                if enable >> i & 1:
+                    self.write(address + i, data[i:i + 1])
+            return
+
+        off = address & self._mask
+        if off + size > self._page_size:
+            self.write(address, data)
+        else:
+            self._page(address >> self._shift)[off:off + size] = data
+
+    def _fill_word(self, size: int) -> int:
+        return int.from_bytes(self._blank[:size], 'little')
+
+    def load(self, path: str, address: int = 0) -> None:
+        """
+        Loads the contents of a file at `address`. The file is memory-mapped copy-on-write,
+        so page-aligned pages alias the mapping and are only read in as they are accessed;
+        writes to them never reach the file.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        view = memoryview(mm)
+        pos = 0
+
+        # Unaligned head is copied
+        head = -address & self._mask
+        if head:
+            self.write(address, view[:head])
+            pos = head
+
+        while size - pos >= self._page_size:
+            self._pages[(address + pos) >> self._shift] = view[pos:pos + self._page_size]
+            pos += self._page_size
+
+        # Partial tail is copied
+        if pos < size:
+            self.write(address + pos, view[pos:])
+
+    def dump(self, path: str, address: Optional[int] = None, size: Optional[int] = None) -> None:
+        """
+        Writes `size` bytes starting at `address` to a file; by default, the span covering
+        all allocated pages. Unallocated zero-filled pages are left as holes in the file.
+        """
+        if not self._pages and (address is None or size is None):
+            open(path, 'wb').close()
+            return
+
+        if address is None:
+            address = min(self._pages) << self._shift
+        if size is None:
+            size = ((max(self._pages) + 1) << self._shift) - address
+
+        sparse = not any(self._blank)
+        end = address + size
+        with open(path, 'wb') as f:
+            while address < end:
+                n, off = address >> self._shift, address & self._mask
+                chunk = min(end - address, self._page_size - off)
+                page = self._pages.get(n)
+                if page is not None:
+                    f.write(page[off:off + chunk])
+                elif sparse:
+                    f.seek(chunk, os.SEEK_CUR)
+                else:
+                    f.write(self._blank[:chunk])
+                address += chunk
+            f.truncate()
+
+    def __init__(self, page_size: int = 4096, fill: int = 0) -> None:
+        super().__init__()
+
+        if page_size < 1 or page_size & (page_size - 1):
+            raise ValueError(f"Page size must be a power of two, was provided {page_size}")
+        if not 255 >= fill >= 0:
+            raise ValueError(f"Fill must be a byte value, was provided {fill}")
+
+        self._page_size = page_size
+        self._shift = page_size.bit_length() - 1
+        self._mask = page_size - 1
+        self._blank = bytes([fill]) * page_size
+        self._pages = {}
+
+
+class MemoryMappedInterface(cia.BaseSynchronousInterface):
+    """
+    Represents an Avalon Memory-Mapped interface.
+    """
+
+    @property
+    def address_units(self) -> str:
+        return self._address_units
+
+    @property
+    def bits_per_symbol(self) -> int:
+        return self._bits_per_symbol
+
+    @property
+    def symbols_per_word(self) -> Optional[int]:
+        return self._symbols_per_word
+
+    @property
+    def max_burst_size(self) -> Optional[int]:
+        return self._max_burst_size
+
+    @property
+    def max_pending_reads(self) -> Optional[int]:
+        return self._max_pending_reads
+
+    @classmethod
+    def specification(cls) -> Set[ci.signal.Signal]:
+        return {
+            ci.signal.Signal('address', widths={x + 1 for x in range(64)}, logical_type=int),
+            ci.signal.Signal('byteenable', widths={2 ** x for x in range(8)}, logical_type=int),
+            ci.signal.Signal('burstcount', widths={x + 1 for x in range(11)}, logical_type=int),
+            ci.signal.Signal('read', meta=True),
+            ci.signal.Signal('write', meta=True),
+            ci.signal.Signal(
+                'writedata',
+                widths={x + 1 for x in range(1024)},
+                logical_type=BinaryValue
+            ),
+            ci.signal.Signal(
+                'readdata',
+                direction=ci.signal.Direction.TO_PRIMARY,
+                widths={x + 1 for x in range(1024)},
+                logical_type=BinaryValue
+            ),
+            ci.signal.Signal(
+                'response',
+                direction=ci.signal.Direction.TO_PRIMARY,
+                widths={2},
+                meta=True,
+                logical_type=int
+            ),
+            # Responses may arrive on any cycle, so both values of readdatavalid are flow values
+            ci.signal.Control(
+                'readdatavalid',
+                direction=ci.signal.Direction.TO_PRIMARY,
+                flow_vals={True, False},
+                fix_vals=set()
+            ),
+            ci.signal.Control(
+                'waitrequest',
+                direction=ci.signal.Direction.TO_PRIMARY,
+                precedence=1,
+                flow_vals={False},
+                fix_vals={True}
+            ),
+        }
+
+    def __init__(self, *args,
+                 address_units: Optional[str] = None,
+                 bits_per_symbol: Optional[int] = None,
+                 max_pending_reads: Optional[int] = None,
+                 **kwargs) -> None:
+
+        super().__init__(*args, **kwargs)
+
+        if not (self['read'].instantiated or self['write'].instantiated):
+            raise ci.InterfacePropertyError(
+                f"{str(self)} requires at least one of read, write signals"
+            )
+
+        if self['read'].instantiated:
+            if not self['readdata'].instantiated:
+                raise ci.InterfacePropertyError(f"{str(self)} read signal requires readdata")
+            # Reads are matched to responses by readdatavalid; fixed readLatency is rejected
+            if not self['readdatavalid'].instantiated:
+                raise ci.InterfacePropertyError(
+                    f"{str(self)} read signal requires readdatavalid; "
+                    f"fixed readLatency interfaces are not supported"
+                )
+
+        if self['write'].instantiated and not self['writedata'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self)} write signal requires writedata")
+
+        if address_units is None:
+            self._address_units = 'WORDS'
+        elif address_units.upper() not in ('WORDS', 'SYMBOLS'):
+            raise ci.InterfacePropertyError(
+                f"AvalonMM spec defines addressUnits as WORDS or SYMBOLS. "
+                f"{str(self)} addressUnits is {address_units}"
+            )
+        else:
+            self._address_units = address_units.upper()
+
+        if bits_per_symbol is None:
+            self._bits_per_symbol = 8
+        elif not bits_per_symbol > 0:
+            raise ci.InterfacePropertyError(
+                f"{str(self)} bitsPerSymbol must be positive, was provided {bits_per_symbol}"
+            )
+        else:
+            self._bits_per_symbol = bits_per_symbol
+
+        data = self['writedata'] if self['writedata'].instantiated else self['readdata']
+        if data.instantiated:
+            if len(data.handle) % self.bits_per_symbol:
+                raise ci.InterfacePropertyError(
+                    f"{str(self)} data width ({len(data.handle)}) is not a multiple of "
+                    f"bitsPerSymbol ({self.bits_per_symbol})"
+                )
+            self._symbols_per_word = len(data.handle) // self.bits_per_symbol
+
+            if self['byteenable'].instantiated and len(self['byteenable'].handle) != self.symbols_per_word:
+                raise ci.InterfacePropertyError(
+                    f"AvalonMM spec requires one byteenable bit per symbol. "
+                    f"{str(self)} byteenable width is {len(self['byteenable'].handle)}"
+                )
+        else:
+            self._symbols_per_word = None
+
+        if self['burstcount'].instantiated:
+            self._max_burst_size = 2 ** (len(self['burstcount'].handle) - 1)
+        else:
+            self._max_burst_size = None
+
+        if self['read'].instantiated:
+            if max_pending_reads is not None and max_pending_reads < 1:
+                raise ci.InterfacePropertyError(
+                    f"AvalonMM spec requires maximumPendingReadTransactions >= 1 with "
+                    f"readdatavalid. {str(self)} maximumPendingReadTransactions is {max_pending_reads}"
+                )
+            self._max_pending_reads = max_pending_reads
+        else:
+            if max_pending_reads is not None:
+                warnings.warn(f"maximumPendingReadTransactions provided without instantiated read signal")
+            self._max_pending_reads = None
+
+
+class MasterModel(cia.BaseSynchronousModel):
+    """
+    Pipelined Avalon-MM master.
+
+    Logical transactions are batches of commands, given as columns with one entry per
+    command: `address`, and `burstcount`, `byteenable`, `writedata` where instantiated.
+    A `writedata` entry is the list of beats to write, or None for a read.
+
+    Commands are issued back-to-back as waitrequest allows; reads do not wait on earlier
+    responses, so up to `itf.max_pending_reads` (unbounded if None) reads are in flight at
+    once. Responses are matched to reads in issue order. On completion the model outputs
+    `readdata`, one list of beats per read command.
+    """
+
+    @property
+    def itf(self) -> MemoryMappedInterface: return self._itf
+
+    @property
+    def pending(self) -> int:
+        """Number of read commands awaiting (all of) their responses."""
+        return len(self._pending)
+
+    async def tx(self, txn: Dict, sync: bool = True, encoded: bool = False) -> Optional[Dict]:
+        await super().tx(txn, sync, encoded)
+        return self.lock.data
+
+    def encode(self, txn: Dict[str, Iterable]) -> Dict[str, List]:
+        """Implementation for AvalonMM; each `writedata` entry is a list of beats, or None."""
+        wdata = txn.get('writedata')
+        out = super().encode({k: [] if k == 'writedata' else v for k, v in txn.items()})
+        if wdata is not None:
+            wd = self.itf['writedata']
+            out['writedata'] = [None if w is None else [wd.encode(b) for b in w] for w in wdata]
+        return out
+
+    def _deassert(self) -> None:
+        if self.itf['read'].instantiated:
+            self.itf['read'].drive(False)
+        if self.itf['write'].instantiated:
+            self.itf['write'].drive(False)
+        self._presented = None
+
+    def _present(self) -> None:
+        """Drive the next command (or write beat) onto the bus, if any."""
+
+        if self._wbeats:
+            self.itf['writedata'].write(self._wbeats.popleft())
+            self._presented = 'write'
+            return
+
+        if not self.buff['address']:
+            self._deassert()
+            return
+
+        wdata = self.buff['writedata'][-1] if 'writedata' in self.buff else None
+        burst = self.buff['burstcount'][-1] if 'burstcount' in self.buff else 1
+
+        mpr = self.itf.max_pending_reads
+        if wdata is None and mpr is not None and len(self._pending) >= mpr:
+            self._deassert()
+            return
+
+        # Buffer is pre-encoded
+        for k, d in self.buff.items():
+            val = d.pop()
+            if k != 'writedata':
+                self.itf[k].write(val)
+
+        if wdata is None:
+            self._burst = burst
+            if self.itf['write'].instantiated:
+                self.itf['write'].drive(False)
+            self.itf['read'].drive(True)
+            self._presented = 'read'
+        else:
+            if len(wdata) != burst:
+                raise ValueError(f"{str(self)} write of {len(wdata)} beats with burstcount {burst}")
+            self._wbeats.extend(wdata)
+            self.itf['writedata'].write(self._wbeats.popleft())
+            if self.itf['read'].instantiated:
+                self.itf['read'].drive(False)
+            self.itf['write'].drive(True)
+            self._presented = 'write'
+
+    def _complete(self) -> None:
+        """Release the model once all commands are issued and all reads answered."""
+        if self._presented is None and not self.buff['address'] and not self._pending:
+            out = {'readdata': self._rdata} if self.itf['readdata'].instantiated else None
+            self._rdata = []
+            self._release(out)
+
+    @ci.decorators.reaction('reset', True)
+    async def reset(self):
+        self.log.debug(f"{str(self)} in reset")
+        self._wbeats.clear()
+        self._pending.clear()
+        self._remaining = 0
+        self._deassert()
+
+    @ci.decorators.reaction('readdatavalid', True)
+    async def response_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in response cycle")
+
+        if not self._pending:
+            raise ci.InterfaceProtocolError(f"readdatavalid asserted without pending reads")
+
+        if not self._remaining:
+            self._remaining = self._pending[0]
+            self._rdata.append([])
+
+        self._rdata[-1].append(self.itf['readdata'].capture())
+        self._remaining -= 1
+        if not self._remaining:
+            self._pending.popleft()
+
+    @ci.decorators.reaction('waitrequest', False, force=True, smode=ct.ReadWrite)
+    async def command_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in command cycle")
+
+        # Command presented during the previous cycle was accepted
+        if self._presented == 'read':
+            self._pending.append(self._burst)
+
+        self._present()
+        self._complete()
+
+    @ci.decorators.reaction('waitrequest', True, smode=ct.ReadWrite)
+    async def stall_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in stall cycle")
+
+        if self._presented is None:
+            self._present()
+        self._complete()
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._presented = None
+        self._burst = 1
+        self._remaining = 0
+        self._wbeats = collections.deque()
+        self._pending = collections.deque()  # Burst length of each outstanding read, in order
+        self._rdata = []
+        super().__init__(*args, primary=True, **kwargs)
+
+        if not self.itf['address'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self.itf)} master requires address signal")
+
+
+class SlaveModel(cia.BaseSynchronousModel):
+    """
+    Avalon-MM slave which responds from a `SparseMemory`.
+
+    Read data is returned `read_latency` cycles after a read is accepted, one beat per
+    cycle for bursts, with readdatavalid; reads are pipelined, so new commands are accepted
+    while earlier responses are outstanding. Writes (including bursts) update memory as
+    they are accepted, subject to byteenable.
+
+    waitrequest, if instantiated, is held low unless it has a `generator`.
+    """
+
+    @property
+    def itf(self) -> MemoryMappedInterface: return self._itf
+
+    @property
+    def memory(self) -> SparseMemory: return self._memory
+
+    @property
+    def read_latency(self) -> int: return self._read_latency
+
+    def _address(self) -> int:
+        """Returns the byte address of the command on the bus."""
+        address = self.itf['address'].capture() if self.itf['address'].instantiated else 0
+        return address * self._wsize if self.itf.address_units == 'WORDS' else address
+
+    def _sample(self) -> None:
+        """Accept the command (or write beat) presented during the previous cycle."""
+        rd = self.itf['read'].capture() if self.itf['read'].instantiated else False
+        wr = self.itf['write'].capture() if self.itf['write'].instantiated else False
+        burst = self.itf['burstcount'].capture() if self.itf['burstcount'].instantiated else 1
+        enable = self.itf['byteenable'].capture() if self.itf['byteenable'].instantiated else None
+
+        if self._wremaining: # Continuing write burst
+            if wr:
+                self.memory.write_word(self._waddr, self._wsize, self.itf['writedata'].capture().integer, enable)
+                self._waddr += self._wsize
+                self._wremaining -= 1
+            return
+
+        if rd:
+            due = max(self._cycle + self.read_latency - 1, self._free)
+            self._free = due + burst
+            self._responses.append([due, self.memory.read(self._address(), burst * self._wsize), 0])
+        elif wr:
+            address = self._address()
+            self.memory.write_word(address, self._wsize, self.itf['writedata'].capture().integer, enable)
+            self._waddr = address + self._wsize
+            self._wremaining = burst - 1
+
+    def _respond(self) -> None:
+        """Drive the response beat due this cycle, if any."""
+        if self._responses and self._responses[0][0] <= self._cycle:
+            r = self._responses[0]
+            beat = int.from_bytes(r[1][r[2]:r[2] + self._wsize], 'little')
+            self.itf['readdata'].drive(BinaryValue(beat, n_bits=self._wbits, bigEndian=False))
+            self.itf['readdatavalid'].drive(True)
+            r[2] += self._wsize
+            if r[2] == len(r[1]):
+                self._responses.popleft()
+        elif self.itf['readdatavalid'].instantiated:
+            self.itf['readdatavalid'].drive(False)
+
+    @ci.decorators.reaction('reset', True)
+    async def reset(self):
+        self.log.debug(f"{str(self)} in reset")
+        self._responses.clear()
+        self._wremaining = 0
+        self._free = 0
+        if self.itf['readdatavalid'].instantiated:
+            self.itf['readdatavalid'].drive(False)
+        if self.itf['waitrequest'].instantiated and not self.itf['waitrequest'].generated:
+            self.itf['waitrequest'].drive(False)
+
+    @ci.decorators.reaction('waitrequest', False, force=True, smode=ct.ReadWrite)
+    async def command_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in command cycle")
+        self._cycle += 1
+        self._sample()
+        self._respond()
+
+    @ci.decorators.reaction('waitrequest', True, smode=ct.ReadWrite)
+    async def stall_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in stall cycle")
+        self._cycle += 1
+        self._respond()
+
+    async def run(self) -> None:
+        """Respond to commands indefinitely; should be forked."""
+        await self.acquire()
+        await self._process(self.re)
+
+    def __init__(self, itf: MemoryMappedInterface, *args,
+                 memory: Optional[SparseMemory] = None,
+                 read_latency: int = 1,
+                 **kwargs) -> None:
+
+        if itf.bits_per_symbol != 8:
+            raise ci.InterfacePropertyError(
+                f"{str(itf)} memory model requires 8-bit symbols, has {itf.bits_per_symbol}"
+            )
+        if read_latency < 1:
+            raise ValueError(f"Read latency must be at least one cycle, was provided {read_latency}")
+
+        self._memory = memory if memory is not None else SparseMemory()
+        self._read_latency = read_latency
+        self._wsize = itf.symbols_per_word
+        self._wbits = 8 * self._wsize
+        self._cycle = 0
+        self._free = 0 # First cycle on which the response bus is free
+        self._responses = collections.deque() # [due cycle, data, offset] per accepted read
+        self._waddr = 0
+        self._wremaining = 0
+        super().__init__(itf, *args, primary=False, **kwargs)
+
+
+class MemoryMappedDriver(ci.adapters.BaseDriver):
+
+    def _command(self, address: Iterable[int],
+                 burstcount: Optional[Iterable[int]] = None,
+                 byteenable: Optional[Iterable[int]] = None,
+                 writedata: Optional[Iterable] = None) -> Dict[str, List]:
+        """Returns a logical transaction with one command per address."""
+        itf = self.model.itf
+        address = list(address)
+        txn = {'address': address}
+        if itf['burstcount'].instantiated:
+            txn['burstcount'] = list(burstcount) if burstcount is not None else [1] * len(address)
+        if itf['byteenable'].instantiated:
+            txn['byteenable'] = list(byteenable) if byteenable is not None else \
+                [2 ** itf.symbols_per_word - 1] * len(address)
+        if itf['writedata'].instantiated:
+            txn['writedata'] = list(writedata) if writedata is not None else [None] * len(address)
+        return txn
+
+    async def read(self, address: Iterable[int],
+                   burstcount: Optional[Iterable[int]] = None) -> List[List[BinaryValue]]:
+        """Issue pipelined reads; returns the beats read for each address."""
+        out = await self.model.tx(self._command(address, burstcount=burstcount))
+        return out['readdata']
+
+    async def write(self, address: Iterable[int], data: Iterable[List[BinaryValue]],
+                    byteenable: Optional[Iterable[int]] = None) -> None:
+        """Issue writes of one list of beats (a burst) per address."""
+        data = list(data)
+        burstcount = [len(d) for d in data]
+        await self.model.tx(self._command(address, burstcount, byteenable, data))
+
+    def __init__(self, *args, depth: Optional[int] = None, **kwargs) -> None:
+        """Implementation for AvalonMM."""
+
+        # Args target Interface instance
+        itf = MemoryMappedInterface(*args, **kwargs)
+        mod = MasterModel(itf)
+        super().__init__(mod, depth=depth)
@@ -0,0 +1,143 @@
+import array
+import json
+import struct
+import sys
+from typing import BinaryIO, Dict, List, Tuple
+
+from cocotb.triggers import ReadOnly, RisingEdge
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon.streaming as cias
+
+MAGIC = b'CBXAST1\n'
+COLUMNS = ('reset', 'valid', 'ready', 'startofpacket', 'endofpacket', 'channel', 'empty')
+
+_HEADER = struct.Struct('<I')  # Length of JSON header
+_CHUNK = struct.Struct('<I')  # Number of cycles in chunk
+
+
+def typecode(width: int) -> str:
+    """Returns the smallest unsigned `array` typecode holding `width` bits plus a sentinel."""
+    for code in 'BHIQ':
+        if width < 8 * array.array(code).itemsize:
+            return code
+    raise ValueError(f"Columns are limited to 63 bits, was provided {width}")
+
+
+def unresolved(code: str) -> int:
+    """Returns the value recorded for unresolvable samples in a column of `code`."""
+    return (1 << (8 * array.array(code).itemsize)) - 1
+
+
+class StreamingRecorder(ci.Pretty):
+    """
+    Records an AvalonST interface's control columns (reset, valid, ready, startofpacket,
+    endofpacket, channel, empty; where instantiated) once per cycle to a compact binary
+    file, for offline checking (see `cocotbext.interfaces.avalon.checker`) in place of
+    online checks by a `PassiveSinkModel`.
+
+    The file holds a JSON header of columns and interface properties, then chunks of
+    `chunk` cycles, each holding every column as a little-endian array. Unresolvable
+    samples are recorded as the column's maximum value (see `unresolved`).
+    """
+
+    @property
+    def itf(self) -> cias.StreamingInterface: return self._itf
+
+    @property
+    def path(self) -> str: return self._path
+
+    @property
+    def columns(self) -> List[str]: return [name for name, _, _ in self._columns]
+
+    @property
+    def cycles(self) -> int:
+        """Number of cycles recorded."""
+        return self._cycles
+
+    @staticmethod
+    def meta(itf: cias.StreamingInterface, columns: List[Tuple[str, str, int]]) -> Dict:
+        """Returns the header describing a recording of `itf`."""
+        return {
+            'bus_name': itf.bus_name,
+            'columns': columns,
+            'packets': bool(itf.packets),
+            'ready_latency': itf.ready_latency,
+            'ready_allowance': itf.ready_allowance,
+            'max_channel': itf.max_channel,
+            'empty_within_packet': itf.empty_within_packet,
+            'symbols_per_beat': itf.symbols_per_beat,
+        }
+
+    def sample(self) -> None:
+        """Records the current cycle."""
+        for (_, _, width), sig, col, x in zip(self._columns, self._signals, self._arrays, self._x):
+            bits = sig.handle.value.binstr
+            try:
+                val = int(bits, 2)
+            except ValueError:
+                col.append(x)
+                continue
+            col.append(val if sig.logic_active_high else ~val & ((1 << width) - 1))
+
+        self._cycles += 1
+        if len(self._arrays[0]) >= self._chunk:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes cycles recorded since the last flush."""
+        n = len(self._arrays[0])
+        if not n:
+            return
+        self._file.write(_CHUNK.pack(n))
+        for col in self._arrays:
+            if sys.byteorder == 'big':
+                col.byteswap()
+            self._file.write(col.tobytes())
+            del col[:]
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    async def run(self) -> None:
+        """Records every cycle until killed; should be forked."""
+        clock = RisingEdge(self.itf.clock)
+        ro = ReadOnly()
+        try:
+            while True:
+                await clock
+                await ro
+                self.sample()
+        finally:
+            self.flush()
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}({self._path})>"
+
+    def __init__(self, itf: cias.StreamingInterface, path: str, chunk: int = 1 << 16) -> None:
+        """
+        Args:
+            path: Output file.
+            chunk: Number of cycles buffered between writes.
+        """
+        super().__init__()
+
+        if chunk < 1:
+            raise ValueError(f"Recording chunk must be positive, was provided {chunk}")
+
+        self._itf = itf
+        self._path = path
+        self._chunk = chunk
+        self._cycles = 0
+
+        self._signals = [itf[name] for name in COLUMNS if name in itf and itf[name].instantiated]
+        self._columns = [(s.name, typecode(len(s.handle)), len(s.handle)) for s in self._signals]
+        self._arrays = [array.array(code) for _, code, _ in self._columns]
+        self._x = [unresolved(code) for _, code, _ in self._columns]
+
+        header = json.dumps(self.meta(itf, self._columns)).encode()
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(MAGIC + _HEADER.pack(len(header)) + header)
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon.streaming as cias
+
+
+class PacketGenerator(ci.Pretty):
+    """
+    Seeded, vectorized stimulus for AvalonST interfaces.
+
+    Packet sizes (in symbols), payloads, channels and error masks are drawn in bulk with
+    NumPy, then packed into beats matching the interface's data width, bits per symbol
+    and symbol order, as in `Packet.tobytes`. Symbols beyond the end of a packet (i.e.
+    empty symbols in its final beat) are zero. Interfaces without packet support produce
+    single-beat transactions.
+    """
+
+    @property
+    def itf(self) -> cias.StreamingInterface: return self._itf
+
+    @property
+    def rng(self) -> np.random.Generator: return self._rng
+
+    @property
+    def symbols_per_beat(self) -> int: return self._spb
+
+    def _pack(self, syms: np.ndarray) -> np.ndarray:
+        """Packs (beats, symbols per beat) symbols into (beats, stride) little-endian bytes."""
+        if self.itf.first_symbol_in_higher_order_bits:
+            syms = syms[:, ::-1]
+
+        bps = self.itf.data_bits_per_symbol
+        if syms.ndim == 3: # Byte-aligned symbols, already bytes
+            return np.ascontiguousarray(syms).reshape(len(syms), -1)
+
+        if self._width <= 64:
+            shifts = (np.arange(self._spb, dtype=np.uint64) * np.uint64(bps))
+            beats = np.bitwise_or.reduce(syms << shifts, axis=1).astype('<u8')
+            return beats.view(np.uint8).reshape(-1, 8)[:, :self._stride]
+
+        # Wide, unaligned symbols: fall back to Python ints
+        out = bytearray()
+        for row in syms.tolist():
+            beat = 0
+            for i, s in enumerate(row):
+                beat |= s << (i * bps)
+            out += beat.to_bytes(self._stride, 'little')
+        return np.frombuffer(bytes(out), dtype=np.uint8).reshape(-1, self._stride)
+
+    def arrays(self, n: int) -> Dict[str, np.ndarray]:
+        """
+        Returns `n` transactions as arrays: 'data' holds all beats, packed (beats, stride);
+        'nbeats', 'empty' hold per-transaction counts, and 'channel', 'error' (where
+        instantiated) per-transaction values; error masks of 64 bits or more are Python ints.
+        """
+        rng, spb = self.rng, self._spb
+
+        if self.itf.packets:
+            sizes = rng.integers(self._min_size, self._max_size, n, endpoint=True)
+        else:
+            sizes = np.full(n, spb)
+        nbeats = -(-sizes // spb)
+        total = int(nbeats.sum())
+
+        bps = self.itf.data_bits_per_symbol
+        if bps % 8 == 0 and self._width == spb * bps:
+            syms = rng.integers(0, 256, (total, spb, bps // 8), dtype=np.uint8)
+        elif bps <= 64:
+            syms = rng.integers(0, 2 ** bps - 1, (total, spb), dtype=np.uint64, endpoint=True)
+        else:
+            syms = np.array(
+                [[int.from_bytes(rng.bytes(-(-bps // 8)), 'little') & ((1 << bps) - 1)
+                  for _ in range(spb)] for _ in range(total)],
+                dtype=object
+            )
+
+        # Zero symbols past the end of each packet
+        starts = np.repeat(np.cumsum(nbeats) - nbeats, nbeats)
+        index = (np.arange(total) - starts)[:, None] * spb + np.arange(spb)[None, :]
+        syms[index >= np.repeat(sizes, nbeats)[:, None]] = 0
+
+        out = {
+            'data': self._pack(syms),
+            'nbeats': nbeats,
+            'empty': nbeats * spb - sizes,
+        }
+
+        if self.itf['channel'].instantiated:
+            out['channel'] = rng.integers(0, self.itf.max_channel, n, endpoint=True)
+        if self.itf['error'].instantiated:
+            ew = len(self.itf['error'].handle)
+            if ew < 64:
+                masks = rng.integers(1, 2 ** ew - 1, n, endpoint=True)
+            else: # Beyond int64, so drawn as 64-bit words and combined as Python ints
+                words = rng.integers(0, 2 ** 64 - 1, (n, -(-ew // 64)), dtype=np.uint64, endpoint=True)
+                top = (1 << ew) - 1
+                masks = np.array([
+                    (sum(w << (64 * j) for j, w in enumerate(row)) & top) or 1 for row in words.tolist()
+                ], dtype=object)
+            out['error'] = np.where(rng.random(n) < self._error_rate, masks, 0)
+
+        return out
+
+    def packets(self, n: int) -> List[cias.Packet]:
+        """Returns `n` transactions as `Packet`s, e.g. for `StreamingDriver.send`."""
+        a = self.arrays(n)
+        data = a['data'].tobytes()
+        stride = self._stride
+        channel = a['channel'].tolist() if 'channel' in a else [None] * n
+        error = a['error'].tolist() if 'error' in a else [None] * n
+        empty = a['empty'].tolist()
+
+        out = []
+        pos = 0
+        for i, nb in enumerate(a['nbeats'].tolist()):
+            end = pos + nb * stride
+            out.append(cias.Packet.frombytes(
+                self._width, data[pos:end], channel=channel[i], error=error[i], empty=empty[i]
+            ))
+            pos = end
+        return out
+
+    def __init__(self, itf: cias.StreamingInterface,
+                 seed: Optional[int] = None,
+                 min_size: int = 1,
+                 max_size: int = 1500,
+                 error_rate: float = 0.0) -> None:
+        """
+        Args:
+            seed: Seed for `numpy.random.default_rng`.
+            min_size, max_size: Inclusive bounds of (uniform) packet sizes, in symbols.
+            error_rate: Probability that a transaction carries a (non-zero) error mask.
+        """
+        super().__init__()
+
+        if not itf['data'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(itf)} stimulus requires data signal")
+        if not 1 <= min_size <= max_size:
+            raise ValueError(f"Invalid packet size bounds ({min_size}, {max_size})")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"Error rate must be a probability, was provided {error_rate}")
+
+        self._itf = itf
+        self._rng = np.random.default_rng(seed)
+        self._width = len(itf['data'].handle)
+        self._stride = (self._width + 7) // 8
+        self._spb = max(self._width // itf.data_bits_per_symbol, 1)
+        self._min_size = min_size
+        self._max_size = max_size
+        self._error_rate = error_rate
@@ -1,16 +1,162 @@
 import abc
-
+import collections
+import collections.abc
 import math
+from concurrent.futures import Executor
 
 import warnings
-from typing import List, Optional, Set, Callable
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Callable, Union
+
+try:
+    import numpy as np
+except ImportError: # Optional; symbol conversions fall back to Python
+    np = None
 
 import cocotb.triggers as ct
+from cocotb.utils import get_sim_time
 
 import cocotbext.interfaces as ci
 import cocotbext.interfaces.avalon as cia
 from cocotb.binary import BinaryValue
 
+class Packet(collections.abc.Mapping):
+    """
+    Compact logical transaction for AvalonST interfaces.
+
+    Data beats are packed little-endian into a single buffer, ceil(width / 8) bytes per
+    beat; channel and error are plain ints (error is the OR of the per-beat errors), and
+    empty is the number of empty symbols in the final beat.
+
+    For compatibility with `Dict[str, List]` transactions, a `Packet` is also a read-only
+    mapping of the legacy form, with keys for each field present: 'data' (one `BinaryValue`
+    per beat), 'channel' and 'error' (error reported on the final beat). Packets compare
+    equal to each other by value, or to any mapping equal to their legacy form.
+    """
+
+    __slots__ = ('_buf', '_nbeats', '_width', '_stride', 'channel', 'error', 'empty')
+
+    @property
+    def width(self) -> Optional[int]: return self._width
+
+    @property
+    def nbeats(self) -> int: return self._nbeats
+
+    def append(self, beat: int) -> None:
+        """Appends a data beat."""
+        self._buf += beat.to_bytes(self._stride, 'little')
+        self._nbeats += 1
+
+    def extend(self, data: bytes) -> None:
+        """Appends data beats packed as by `tobytes`."""
+        if len(data) % self._stride:
+            raise ValueError(f"Packed data ({len(data)} bytes) is not a whole number of beats")
+        self._buf += data
+        self._nbeats += len(data) // self._stride
+
+    def beats(self) -> Iterator[int]:
+        """Iterates over data beats, as ints."""
+        b, n = self._buf, self._stride
+        return (int.from_bytes(b[i:i + n], 'little') for i in range(0, len(b), n))
+
+    def tobytes(self) -> bytes:
+        """Returns the packed data buffer."""
+        return bytes(self._buf)
+
+    def view(self) -> memoryview:
+        """
+        Returns a read-only view of the packed data buffer, without copying; beats cannot be
+        appended while views are held.
+        """
+        return memoryview(self._buf).toreadonly()
+
+    def _keys(self) -> List[str]:
+        keys = ['data'] if self._width is not None else []
+        if self.channel is not None:
+            keys.append('channel')
+        if self.error is not None:
+            keys.append('error')
+        return keys
+
+    def __getitem__(self, key: str) -> List:
+        if key == 'data' and self._width is not None:
+            return [BinaryValue(b, n_bits=self._width, bigEndian=False) for b in self.beats()]
+        if key == 'channel' and self.channel is not None:
+            return [self.channel]
+        if key == 'error' and self.error is not None:
+            return [0] * (self._nbeats - 1) + [self.error] if self._nbeats else [self.error]
+        raise KeyError(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Packet):
+            if (self.channel, self.error, self.empty, self._nbeats) != \
+                    (other.channel, other.error, other.empty, other._nbeats):
+                return False
+            if self._stride == other._stride:
+                return self._buf == other._buf
+            return all(a == b for a, b in zip(self.beats(), other.beats()))
+        if isinstance(other, collections.abc.Mapping):
+            return dict(self.items()) == {k: list(v) for k, v in other.items()}
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = [f"nbeats={self._nbeats}"]
+        for k in ('channel', 'error', 'empty'):
+            if getattr(self, k):
+                fields.append(f"{k}={getattr(self, k)}")
+        return f"<{self.__class__.__name__}({', '.join(fields)}, data={self._buf[:16].hex()}" \
+               f"{'...' if len(self._buf) > 16 else ''})>"
+
+    def __init__(self,
+                 width: Optional[int],
+                 beats: Iterable[Union[int, BinaryValue]] = (),
+                 channel: Optional[int] = None,
+                 error: Optional[int] = None,
+                 empty: int = 0) -> None:
+        """
+        Args:
+            width: Width of data signal in bits, or None if there is no data.
+            beats: Initial data beats.
+        """
+        self._width = width
+        self._stride = (width + 7) // 8 if width is not None else 0
+        self._buf = bytearray()
+        self._nbeats = 0
+        self.channel = channel
+        self.error = error
+        self.empty = empty
+        for b in beats:
+            self.append(b.integer if isinstance(b, BinaryValue) else b)
+
+    @classmethod
+    def frombytes(cls, width: int, data: bytes, **kwargs) -> 'Packet':
+        """Returns a packet of data beats packed as by `tobytes`."""
+        pkt = cls(width, **kwargs)
+        pkt.extend(data)
+        return pkt
+
+    @classmethod
+    def from_dict(cls, txn: Dict[str, List], width: Optional[int]) -> 'Packet':
+        """Converts a legacy `Dict[str, List]` transaction."""
+        error = None
+        if 'error' in txn:
+            error = 0
+            for e in txn['error']:
+                error |= e
+        channel = txn['channel'][-1] if txn.get('channel') else None
+        return cls(width, txn.get('data', ()), channel=channel, error=error)
+
+
 class StreamingInterface(cia.BaseSynchronousInterface):
 
 
@@ -51,6 +197,10 @@ class StreamingInterface(cia.BaseSynchronousInterface):
         return self._in_packet_timeout
 
 
+    @property
+    def symbols_per_beat(self) -> Optional[int]:
+        return self['data'].width // self.data_bits_per_symbol if self['data'].instantiated else None
+
     @classmethod
     def specification(cls) -> Set[ci.signal.Signal]:
         return {
@@ -85,6 +235,151 @@ class StreamingInterface(cia.BaseSynchronousInterface):
             raise ci.InterfaceProtocolError(f"Signal ({str(self['data'])} is unresolvable.")
         return vec
 
+    def mask_beat(self, beat: int, empty: int) -> int:
+        """Returns data beat with its `empty` trailing symbols zeroed."""
+        bits = empty * self.data_bits_per_symbol
+        if self.first_symbol_in_higher_order_bits:
+            return beat >> bits << bits
+        return beat & ((1 << (self['data'].width - bits)) - 1)
+
+    def _symbol_layout(self) -> Tuple[int, int, int, int]:
+        """Returns bits per symbol, symbols per beat, bytes per symbol and bytes per beat."""
+        if not self['data'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self)} payloads require an instantiated data signal")
+        bps, spb = self.data_bits_per_symbol, self.symbols_per_beat
+        if self['data'].width != spb * bps:
+            raise ci.InterfacePropertyError(
+                f"{str(self)} data width ({self['data'].width}) is not a multiple of "
+                f"dataBitsPerSymbol ({bps})"
+            )
+        return bps, spb, (bps + 7) // 8, (spb * bps + 7) // 8
+
+    def _reorder(self, buf: bytes, nbeats: int) -> memoryview:
+        """Reverses the order of byte-aligned symbols within each beat (its own inverse)."""
+        _, spb, sb, stride = self._symbol_layout()
+        if np is not None:
+            syms = np.frombuffer(buf, dtype=np.uint8).reshape(nbeats, spb, sb)
+            return memoryview(np.ascontiguousarray(syms[:, ::-1]).reshape(-1))
+
+        buf, out = bytes(buf), bytearray(len(buf))
+        for k in range(spb): # Strided copies of each byte of symbol k, for all beats at once
+            src = (spb - 1 - k) * sb
+            for j in range(sb):
+                out[k * sb + j::stride] = buf[src + j::stride]
+        return memoryview(out)
+
+    def payload(self, data: Union[Packet, bytes, bytearray, memoryview],
+                empty: Optional[int] = None) -> memoryview:
+        """
+        Returns the symbols of packed data beats (as `Packet.tobytes`) as a contiguous
+        payload: first symbol of the first beat first, excluding the `empty` symbols of the
+        final beat (by default, `Packet.empty`). Each symbol takes ceil(dataBitsPerSymbol / 8)
+        bytes, little-endian.
+
+        With byte-aligned symbols in lower-order bits first, the payload is a view of `data`
+        without copying; otherwise symbols are reordered with NumPy, if available.
+        """
+        if isinstance(data, Packet):
+            empty = data.empty if empty is None else empty
+            data = data.view()
+        empty = empty or 0
+        bps, spb, sb, stride = self._symbol_layout()
+
+        buf = memoryview(data).cast('B')
+        if len(buf) % stride:
+            raise ValueError(f"Packed data ({len(buf)} bytes) is not a whole number of beats")
+        nbeats = len(buf) // stride
+        if not 0 <= empty < spb or (empty and not nbeats):
+            raise ValueError(f"Empty ({empty}) must be less than symbols per beat ({spb})")
+        n = (nbeats * spb - empty) * sb
+
+        if bps % 8 == 0:
+            if not self.first_symbol_in_higher_order_bits:
+                return buf[:n]
+            return self._reorder(buf, nbeats)[:n]
+
+        if np is not None:
+            bits = np.unpackbits(
+                np.frombuffer(buf, dtype=np.uint8).reshape(nbeats, stride), axis=1, bitorder='little'
+            )[:, :spb * bps].reshape(nbeats, spb, bps)
+            if self.first_symbol_in_higher_order_bits:
+                bits = bits[:, ::-1]
+            bits = np.pad(bits, ((0, 0), (0, 0), (0, 8 * sb - bps)))
+            return memoryview(np.packbits(bits, axis=2, bitorder='little').reshape(-1))[:n]
+
+        order = range(spb - 1, -1, -1) if self.first_symbol_in_higher_order_bits else range(spb)
+        mask = (1 << bps) - 1
+        out = bytearray()
+        for i in range(0, len(buf), stride):
+            beat = int.from_bytes(buf[i:i + stride], 'little')
+            for k in order:
+                out += ((beat >> (k * bps)) & mask).to_bytes(sb, 'little')
+        return memoryview(out)[:n]
+
+    def from_payload(self, payload: Union[bytes, bytearray, memoryview]) -> Tuple[memoryview, int]:
+        """
+        Inverse of `payload`: returns packed data beats (as `Packet.tobytes`) and the number
+        of empty symbols in the final beat, which are zero. Byte-aligned symbols in
+        lower-order bits first filling whole beats are returned without copying.
+        """
+        bps, spb, sb, stride = self._symbol_layout()
+
+        buf = memoryview(payload).cast('B')
+        if len(buf) % sb:
+            raise ValueError(f"Payload ({len(buf)} bytes) is not a whole number of {sb}-byte symbols")
+        nsyms = len(buf) // sb
+        nbeats = -(-nsyms // spb)
+        empty = nbeats * spb - nsyms
+
+        if bps % 8 == 0:
+            if empty:
+                buf = memoryview(bytes(buf) + bytes(empty * sb))
+            if not self.first_symbol_in_higher_order_bits:
+                return buf, empty
+            return self._reorder(buf, nbeats), empty
+
+        if np is not None:
+            syms = np.zeros((nbeats * spb, sb), dtype=np.uint8)
+            syms[:nsyms] = np.frombuffer(buf, dtype=np.uint8).reshape(nsyms, sb)
+            bits = np.unpackbits(syms, axis=1, bitorder='little')[:, :bps].reshape(nbeats, spb, bps)
+            if self.first_symbol_in_higher_order_bits:
+                bits = bits[:, ::-1]
+            bits = np.pad(bits.reshape(nbeats, spb * bps), ((0, 0), (0, 8 * stride - spb * bps)))
+            return memoryview(np.packbits(bits, axis=1, bitorder='little').reshape(-1)), empty
+
+        out = bytearray()
+        for i in range(0, nbeats * spb * sb, spb * sb):
+            beat = 0
+            for k, j in enumerate(range(i, min(i + spb * sb, len(buf)), sb)):
+                sym = int.from_bytes(buf[j:j + sb], 'little')
+                beat |= sym << ((spb - 1 - k if self.first_symbol_in_higher_order_bits else k) * bps)
+            out += beat.to_bytes(stride, 'little')
+        return memoryview(out), empty
+
+    def packet(self, payload: Union[bytes, bytearray, memoryview], **kwargs) -> Packet:
+        """Returns a `Packet` carrying `payload` (see `from_payload`), e.g. for a `StreamingDriver`."""
+        data, empty = self.from_payload(payload)
+        pkt = Packet(self['data'].width, empty=empty, **kwargs)
+        pkt.extend(data)
+        return pkt
+
+    @ci.decorators.validator('channel')
+    def _check_channel(self, channel: Sequence[int]) -> None:
+        if max(channel) > self.max_channel:
+            raise ci.InterfaceProtocolError(
+                f"Channel ({max(channel)}) exceeds maxChannel ({self.max_channel})"
+            )
+
+    @ci.decorators.validator('empty', 'endofpacket')
+    def _check_empty(self, empty: Sequence[int], eop: Sequence[bool]) -> None:
+        symbols = self['data'].width // self.data_bits_per_symbol if self['data'].instantiated else 1
+        if max(empty) >= symbols:
+            raise ci.InterfaceProtocolError(
+                f"Empty ({max(empty)}) must be less than symbols per beat ({symbols})"
+            )
+        if not self.empty_within_packet and any(e and not p for e, p in zip(empty, eop)):
+            raise ci.InterfaceProtocolError(f"Empty asserted before endofpacket")
+
     def __init__(self, *args,
                  data_bits_per_symbol: Optional[int] = None,
                  empty_within_packet: Optional[bool] = None,
@@ -152,7 +447,7 @@ class StreamingInterface(cia.BaseSynchronousInterface):
         if self['error'].instantiated:
             if error_descriptor is None:
                 self._error_descriptor = None
-            elif len(self['error'].handle) != len(error_descriptor):
+            elif self['error'].width != len(error_descriptor):
                 raise ci.InterfacePropertyError(
                     f"AvalonST spec requires that error descriptors "
                     f"be provided as list of strings, one for each error bit. "
@@ -209,8 +504,8 @@ class StreamingInterface(cia.BaseSynchronousInterface):
                 )
 
             # If more than one symbol per word, empty signal required
-            if len(self['data'].handle) > self.data_bits_per_symbol:
-                req_size = math.ceil(math.log(len(self['data'].handle) / self.data_bits_per_symbol), 2)
+            if self['data'].width > self.data_bits_per_symbol:
+                req_size = math.ceil(math.log(self['data'].width / self.data_bits_per_symbol, 2))
 
                 if not self['empty'].instantiated:
                     raise ci.InterfacePropertyError(
@@ -218,10 +513,10 @@ class StreamingInterface(cia.BaseSynchronousInterface):
                         f"with more than one symbol per word."
                     )
 
-                if len(self['empty'].handle) != req_size:
+                if self['empty'].width != req_size:
                     raise ci.InterfacePropertyError(
                         f"AvalonST spec defines empty width as ceil[log_2(<symbols per cycle>)] "
-                        f"= {req_size}. {str(self)} empty width is {len(self['empty'].handle)}"
+                        f"= {req_size}. {str(self)} empty width is {self['empty'].width}"
                     )
 
             if empty_within_packet is None:
@@ -237,14 +532,29 @@ class StreamingInterface(cia.BaseSynchronousInterface):
             self._empty_within_packet = None
 
 class BaseStreamingModel(cia.BaseSynchronousModel, metaclass=abc.ABCMeta):
+    """
+    If readyLatency or readyAllowance is non-zero, ready is resolved through a
+    `CreditTracker` updated once per cycle, such that it is asserted in cycles where a
+    transfer may occur, i.e. ready was asserted between readyAllowance and readyLatency
+    cycles before.
+    """
 
     @property
     def itf(self) -> StreamingInterface: return self._itf
 
+    @property
+    def tracker(self) -> Optional[ci.signal.CreditTracker]:
+        return self.itf['ready'].tracker
+
     @ci.decorators.reaction('reset', True)
     async def reset(self):
         self.in_pkt = False if self.itf.packets else None
 
+    async def _event_loop(self) -> None:
+        if self.tracker is not None:
+            self.tracker.tick(self.itf['ready'].sample())
+        await super()._event_loop()
+
     @abc.abstractmethod
     def __init__(self, itf: StreamingInterface, *args, **kwargs) -> None:
 
@@ -252,20 +562,38 @@ class BaseStreamingModel(cia.BaseSynchronousModel, metaclass=abc.ABCMeta):
         self.in_pkt = False if itf.packets else None
         super().__init__(itf, *args, **kwargs)
 
+        if itf['ready'].instantiated and itf.ready_allowance:
+            itf['ready'].tracker = ci.signal.CreditTracker(itf.ready_latency, itf.ready_allowance)
+
 
 # TODO: (redd@) Add ActiveSinkModel
 class PassiveSinkModel(BaseStreamingModel):
+    """
+    Outputs each received transaction as a `Packet`.
+    """
+
+    _checked = ('in_pkt', 'prev_channel', 'pkt', '_columns', '_began')
+
+    def _packet(self) -> Packet:
+        return Packet(
+            len(self.itf['data'].handle) if self.itf['data'].instantiated else None,
+            error=0 if self.itf['error'].instantiated else None
+        )
 
     @ci.decorators.reaction('reset', True)
     async def reset(self):
         self.log.debug(f"{str(self)} in reset")
         self.prev_channel = None
+        self.pkt = self._packet()
+        for col in self._columns.values():
+            col.clear()
 
     # TODO: (redd@) Rewrite w filters
     @ci.decorators.reaction('valid', True, force=True)
     async def valid_cycle(self) -> None:
 
         self.log.debug(f"{str(self)} in valid_cycle")
+        self._begin()
         channel = self.itf['channel'].capture() if self.itf['channel'].instantiated else None
         data = self.itf['data'].capture() if self.itf['data'].instantiated else None
         empty = self.itf['empty'].capture() if self.itf['empty'].instantiated else None
@@ -298,96 +626,671 @@ class PassiveSinkModel(BaseStreamingModel):
         #             f"({0}-{self._properties['maxChannel']})"
         #         )
 
+        beat = None
         if data is not None:
+            beat = data.integer
             # Apply empty signal if supported
-            if self.in_pkt and (self.itf.empty_within_packet or eop):
-                data = self.itf.mask_data(data, empty)
-            self.buff['data'].append(data)
+            if empty and self.in_pkt and (self.itf.empty_within_packet or eop):
+                beat = self.itf.mask_beat(beat, empty)
+            self.pkt.append(beat)
+
+        if self._columns:
+            vals = {'channel': channel, 'data': beat, 'empty': empty, 'error': error,
+                    'startofpacket': sop, 'endofpacket': eop}
+            if self.itf.per_beat:
+                self.itf.validate({k: [vals[k]] for k in self._columns})
+            else:
+                for k, col in self._columns.items():
+                    col.append(vals[k])
 
         if error is not None:
-            self.buff['error'].append(error)
+            self.pkt.error |= error
 
         # Transaction completed
         if not self.itf.packets or eop:
+            if self._columns and not self.itf.per_beat:
+                self.itf.validate(self._columns)
+                for col in self._columns.values():
+                    col.clear()
+            pkt, self.pkt = self.pkt, self._packet()
+            pkt.channel = self.prev_channel
+            if eop and empty:
+                pkt.empty = empty
+            if self.in_pkt:
+                self.in_pkt = False
+            self.prev_channel = None
+            self._release(pkt)
+
+    def _specialize(self) -> Dict[str, str]:
+        """Specializes `valid_cycle`, e.g. dropping lookups and checks of absent signals."""
+        if type(self).valid_cycle is not PassiveSinkModel.valid_cycle: # Overridden
+            return super()._specialize()
+
+        itf = self.itf
+        has = {k: itf[k].instantiated for k in
+               ['channel', 'data', 'empty', 'error', 'startofpacket', 'endofpacket']}
+        cols = sorted(itf.validated)
+        width = len(itf['data'].handle) if has['data'] else None
+        error = 0 if has['error'] else None
+
+        src = [
+            "async def valid_cycle(self):",
+            "    self.log.debug(f\"{str(self)} in valid_cycle\")",
+            "    self._begin()",
+        ]
+        for k, var in [('channel', 'channel'), ('data', 'data'), ('empty', 'empty'), ('error', 'error'),
+                       ('startofpacket', 'sop'), ('endofpacket', 'eop')]:
+            src.append(f"    {var} = sig_{k}.capture()" if has[k] else f"    {var} = None")
+
+        if itf.packets:
+            src += [
+                "    if sop:",
+                "        if self.in_pkt:",
+                "            raise ci.InterfaceProtocolError(",
+                "                f\"Duplicate startofpacket signal ({str(sig_startofpacket)})\"",
+                "            )",
+                "        self.in_pkt = True",
+                "    if not self.in_pkt:",
+                "        raise ci.InterfaceProtocolError(f\"Attempted transfer outside of packet\")",
+            ]
+            if has['channel']:
+                src += [
+                    "    if self.prev_channel is not None and channel != self.prev_channel:",
+                    "        raise ci.InterfaceProtocolError(",
+                    "            f\"Channel changed within packet ({self.prev_channel}->{channel})\"",
+                    "        )",
+                ]
+        src.append("    self.prev_channel = channel")
+
+        if has['data']:
+            src.append("    beat = data.integer")
+            if has['empty']:
+                cond = "empty and self.in_pkt" + ("" if itf.empty_within_packet else " and eop")
+                src.append(f"    if {cond}:")
+                src.append("        beat = itf.mask_beat(beat, empty)")
+            src.append("    self.pkt.append(beat)")
+        else:
+            src.append("    beat = None")
 
-            if self.prev_channel is not None:
-                self.buff['channel'].append(self.prev_channel)
+        if cols: # per_beat may be changed at runtime
+            vals = {'channel': 'channel', 'data': 'beat', 'empty': 'empty', 'error': 'error',
+                    'startofpacket': 'sop', 'endofpacket': 'eop'}
+            src.append("    if itf.per_beat:")
+            src.append("        itf.validate({" + ", ".join(f"{k!r}: [{vals[k]}]" for k in cols) + "})")
+            src.append("    else:")
+            src += [f"        self._columns[{k!r}].append({vals[k]})" for k in cols]
 
-            self._release()
+        if has['error']:
+            src.append("    self.pkt.error |= error")
+
+        # Transaction completed
+        indent = "        " if itf.packets else "    "
+        if itf.packets:
+            src.append("    if eop:")
+        if cols:
+            src += [
+                f"{indent}if not itf.per_beat:",
+                f"{indent}    itf.validate(self._columns)",
+                f"{indent}    for col in self._columns.values():",
+                f"{indent}        col.clear()",
+            ]
+        src += [
+            f"{indent}pkt, self.pkt = self.pkt, Packet({width}, error={error})",
+            f"{indent}pkt.channel = self.prev_channel",
+        ]
+        if itf.packets and has['empty']:
+            src += [f"{indent}if empty:", f"{indent}    pkt.empty = empty"]
+        if itf.packets:
+            src.append(f"{indent}self.in_pkt = False")
+        src += [f"{indent}self.prev_channel = None", f"{indent}self._release(pkt)"]
+
+        return {**super()._specialize(), 'valid_cycle': '\n'.join(src)}
+
+    def _compile(self, name: str, src: str, **env) -> Callable:
+        return super()._compile(name, src, Packet=Packet, **env)
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, primary=False, **kwargs)
         self.prev_channel = None
+        self.pkt = self._packet()
+        self._columns = {k: [] for k in self.itf.validated} # Per-beat values of validated fields
+
+
+class InterleavedSinkModel(PassiveSinkModel):
+    """
+    As `PassiveSinkModel`, but channels may interleave within packets, i.e. at beat
+    granularity. Reassembly state (packet, in-packet flag, validated columns) is kept per
+    channel, in lists indexed by channel, such that each beat costs O(1) for any number of
+    channels; each `Packet` is output at its endofpacket.
+
+    Counts packets and beats received per channel.
+    """
+
+    _checked = ('_in_pkts', '_pkts', '_chan_columns', '_opened', '_began')
+
+    @property
+    def channels(self) -> int: return len(self._pkts)
+
+    @property
+    def packets(self) -> List[int]:
+        """Packets received per channel."""
+        return self._npackets
+
+    @property
+    def beats(self) -> List[int]:
+        """Beats received per channel."""
+        return self._nbeats
+
+    @property
+    def open(self) -> List[int]:
+        """Channels with a packet in progress."""
+        return [ch for ch, in_pkt in enumerate(self._in_pkts) if in_pkt]
+
+    @ci.decorators.reaction('reset', True)
+    async def reset(self):
+        await super().reset()
+        n = self.channels
+        self._pkts = [self._packet() for _ in range(n)]
+        self._in_pkts = [False] * n
+        self._opened = [None] * n
+        for cols in self._chan_columns:
+            for col in cols.values():
+                col.clear()
+
+    @ci.decorators.reaction('valid', True, force=True)
+    async def valid_cycle(self) -> None:
+
+        self.log.debug(f"{str(self)} in valid_cycle")
+        self._begin()
+        itf = self.itf
+        channel = itf['channel'].capture()
+        data = itf['data'].capture() if itf['data'].instantiated else None
+        empty = itf['empty'].capture() if itf['empty'].instantiated else None
+        error = itf['error'].capture() if itf['error'].instantiated else None
+        sop = itf['startofpacket'].capture() if itf['startofpacket'].instantiated else None
+        eop = itf['endofpacket'].capture() if itf['endofpacket'].instantiated else None
+
+        if not 0 <= channel < len(self._pkts):
+            raise ci.InterfaceProtocolError(
+                f"Channel ({channel}) out of valid range (0-{len(self._pkts) - 1})"
+            )
+
+        # Packet signal checks, per channel
+        in_pkt = self._in_pkts[channel]
+        if itf.packets:
+            if sop:
+                if in_pkt:
+                    raise ci.InterfaceProtocolError(
+                        f"Duplicate startofpacket signal on channel {channel} ({str(itf['startofpacket'])})"
+                    )
+
+                in_pkt = self._in_pkts[channel] = True
+                self._opened[channel] = get_sim_time()
+
+            if not in_pkt:
+                raise ci.InterfaceProtocolError(f"Attempted transfer outside of packet on channel {channel}")
+
+        pkt = self._pkts[channel]
+        beat = None
+        if data is not None:
+            beat = data.integer
+            # Apply empty signal if supported
+            if empty and in_pkt and (itf.empty_within_packet or eop):
+                beat = itf.mask_beat(beat, empty)
+            pkt.append(beat)
+        self._nbeats[channel] += 1
+
+        columns = self._chan_columns[channel]
+        if columns:
+            vals = {'channel': channel, 'data': beat, 'empty': empty, 'error': error,
+                    'startofpacket': sop, 'endofpacket': eop}
+            if itf.per_beat:
+                itf.validate({k: [vals[k]] for k in columns})
+            else:
+                for k, col in columns.items():
+                    col.append(vals[k])
+
+        if error is not None:
+            pkt.error |= error
+
+        # Transaction completed
+        if not itf.packets or eop:
+            if columns and not itf.per_beat:
+                itf.validate(columns)
+                for col in columns.values():
+                    col.clear()
+            self._pkts[channel] = self._packet()
+            pkt.channel = channel
+            if eop and empty:
+                pkt.empty = empty
+            if in_pkt:
+                self._in_pkts[channel] = False
+                self._began = self._opened[channel] # Transaction began at its own startofpacket
+            self._npackets[channel] += 1
+            self._release(pkt)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        if not self.itf['channel'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self)} requires an instantiated channel signal")
+
+        n = self.itf.max_channel + 1
+        self._pkts = [self._packet() for _ in range(n)]
+        self._in_pkts = [False] * n
+        self._opened = [None] * n # Time of each open packet's startofpacket
+        self._chan_columns = [{k: [] for k in self.itf.validated} for _ in range(n)]
+        self._npackets = [0] * n
+        self._nbeats = [0] * n
 
 
 class StreamingMonitor(ci.adapters.BaseMonitor):
+    """
+    If `interleaved`, packets are reassembled per channel by an `InterleavedSinkModel`, and
+    may also be received per channel: by callbacks added with `add_channel_callback` or,
+    for channels without such callbacks, from `channel_queues` (in place of the monitor's
+    own queue).
+    """
 
-    def __init__(self, *args, callback: Optional[Callable] = None, **kwargs) -> None:
-        """Implementation for AvalonST."""
+    @property
+    def interleaved(self) -> bool: return isinstance(self.model, InterleavedSinkModel)
+
+    @property
+    def channel_queues(self) -> Optional[List[Deque]]:
+        """Packets received per channel (without channel callbacks), if interleaved."""
+        return self._channel_queues
+
+    @property
+    def received(self) -> Optional[List[int]]:
+        """Packets received per channel, if interleaved."""
+        return self.model.packets if self.interleaved else None
+
+    def add_channel_callback(self, channel: int, callback: Callable) -> None:
+        """Adds a callback for packets received on `channel`; requires `interleaved`."""
+        if not self.interleaved:
+            raise ci.InterfacePropertyError(f"{str(self)} channel callbacks require interleaved=True")
+        if not 0 <= channel < len(self._channel_callbacks):
+            raise ValueError(f"{str(self)} channel ({channel}) out of valid range "
+                             f"(0-{len(self._channel_callbacks) - 1})")
+        self._channel_callbacks[channel].append(callback)
+
+    def _recv(self, transaction) -> None:
+        """
+        Implementation for StreamingMonitor; also dispatches on the packet's channel. If
+        interleaved, packets are stored (without callbacks) in `channel_queues` only.
+        """
+        if self._channel_callbacks is None:
+            super()._recv(transaction)
+            return
+
+        ch = transaction.channel
+        callbacks = self._channel_callbacks[ch]
+        if self.executor is None:
+            for cb in callbacks:
+                cb(transaction)
+        elif callbacks:
+            self._submit(callbacks, transaction)
+        super()._recv(transaction, queue=self._channel_queues[ch], consumed=bool(callbacks))
+
+    def __init__(self, *args,
+                 callback: Optional[Callable] = None,
+                 executor: Optional[Executor] = None,
+                 latency: Optional[ci.latency.LatencyTracker] = None,
+                 interleaved: bool = False,
+                 **kwargs) -> None:
+        """
+        Implementation for AvalonST.
+
+        Args:
+            interleaved: Reassemble packets per channel, such that channels may change
+                within packets; requires an instantiated channel signal.
+        """
 
         # Args target Interface instance
         itf = StreamingInterface(*args, **kwargs)
-        mod = PassiveSinkModel(itf)
-        super().__init__(mod, callback)
+        mod = InterleavedSinkModel(itf) if interleaved else PassiveSinkModel(itf)
+        self._channel_callbacks = [[] for _ in range(mod.channels)] if interleaved else None
+        self._channel_queues = [collections.deque() for _ in range(mod.channels)] if interleaved else None
+        super().__init__(mod, callback, executor, latency)
 
 
 class SourceModel(BaseStreamingModel):
+    """
+    Drives one beat per transfer. With non-zero readyLatency, valid is only asserted in
+    cycles where a transfer is permitted.
 
+    Empty, if instantiated, is driven on the final beat of each packet: from `Packet.empty`,
+    or the last entry of an optional 'empty' column of other transactions; zero otherwise.
+    """
 
-    # TODO: (redd@) Rewrite w filters
+    _checked = ('_buff', '_first', '_presented', '_empty', '_began')
 
-    @ci.decorators.reaction('valid', False, smode=ct.ReadWrite)
-    async def assert_valid(self) -> None:
-        self.log.debug(f"{str(self)} in assert_valid cycle")
+    # TODO: (redd@) Rewrite w filters
 
-        # Unforced reaction, so must manually assert valid if not generated
-        if not self.itf['valid'].generated:
-            self.itf['valid'].drive(True)
-        if self.in_pkt is not None and max(len(b) for b in self.buff.values()) > 0:
-            self.itf['startofpacket'].drive(True)
+    def _remaining(self) -> int:
+        return max((len(d) for k, d in self.buff.items() if k != 'channel'), default=0)
 
-    @ci.decorators.reaction('valid', True, force=True, smode=ct.ReadWrite)
-    async def valid_cycle(self) -> None:
-        self.log.debug(f"{str(self)} in valid cycle")
+    def _valid(self, val: bool) -> None:
+        if self.itf['valid'].instantiated and not self.itf['valid'].generated:
+            self.itf['valid'].drive(val)
 
+    def _present(self) -> None:
+        """Drive the next beat onto the bus."""
+        self._begin()
         channel = self.buff['channel'][-1] if self.itf['channel'].instantiated else None
         data = self.buff['data'].pop() if self.itf['data'].instantiated else None
         error = self.buff['error'].pop() if self.itf['error'].instantiated else None
-        # TODO: (redd@) calculate+drive empty
 
-        remaining = max(len(b) for b in self.buff.values())
+        last = not self._remaining()
+        if last and channel is not None:
+            self.buff['channel'].clear() # Channel is held for the whole transaction
 
+        # Buffer is pre-encoded
         if channel is not None:
-            self.itf['channel'].drive(channel)
+            self.itf['channel'].write(channel)
         if data is not None:
-            self.itf['data'].drive(data)
+            self.itf['data'].write(data)
         if error is not None:
-            self.itf['error'].drive(error)
+            self.itf['error'].write(error)
+
+        if self.itf.packets:
+            self.itf['startofpacket'].drive(self._first)
+            self.itf['endofpacket'].drive(last)
+            if self.itf['empty'].instantiated:
+                self.itf['empty'].write(self._empty if last else self._no_empty)
+            self._first = False
+
+        self._presented = True
+        self._valid(True)
+
+    def _cycle(self, accepted: bool) -> None:
+        """Advance following a cycle in which the presented beat was (not) accepted."""
+        permitted = self.tracker.upcoming if self.tracker is not None else True
+
+        if accepted:
+            self._presented = False
+
+        if self._presented:
+            self._valid(permitted) # Hold beat
+        elif not self._remaining():
+            self._valid(False)
+            if self.itf.packets:
+                self.itf['endofpacket'].drive(False)
+            self._release()
+        elif permitted:
+            self._present()
+        else:
+            self._valid(False)
+
+    def _specialize(self) -> Dict[str, str]:
+        """Specializes `_present` and `_remaining` to the buffered (i.e. instantiated) signals."""
+        itf = self.itf
+        fields = [k for k in ['channel', 'data', 'error'] if itf[k].instantiated]
+        counted = [k for k in self.buff if k != 'channel']
+        if not counted:
+            remaining = "0"
+        elif len(counted) == 1:
+            remaining = f"len(buff_{counted[0]})"
+        else:
+            remaining = f"max({', '.join(f'len(buff_{k})' for k in counted)})"
+
+        src = [
+            "def _present(self):",
+            "    self._begin()",
+        ]
+        src += [f"    {k} = buff_{k}[-1]" if k == 'channel' else f"    {k} = buff_{k}.pop()" for k in fields]
+        src.append(f"    last = not {remaining}")
+        if 'channel' in fields:
+            src += ["    if last:", "        buff_channel.clear()"]
+        src += [f"    sig_{k}.write({k})" for k in fields]
+        if itf.packets:
+            src += [
+                "    sig_startofpacket.drive(self._first)",
+                "    sig_endofpacket.drive(last)",
+            ]
+            if itf['empty'].instantiated:
+                src.append("    sig_empty.write(self._empty if last else self._no_empty)")
+            src.append("    self._first = False")
+        src += [
+            "    self._presented = True",
+            "    self._valid(True)",
+        ]
+
+        out = {
+            '_remaining': f"def _remaining(self):\n    return {remaining}",
+            '_present': '\n'.join(src),
+        }
+        return {
+            **super()._specialize(),
+            **{k: v for k, v in out.items() if getattr(type(self), k) is getattr(SourceModel, k)}
+        }
+
+    def _compile(self, name: str, src: str, **env) -> Callable:
+        return super()._compile(name, src, **{f"buff_{k}": d for k, d in self.buff.items()}, **env)
+
+    @ci.decorators.reaction('reset', True)
+    async def reset(self):
+        self.in_pkt = False if self.itf.packets else None
+        self._presented = False
 
-        if self.in_pkt:
-            self.itf['startofpacket'].drive(False)
-            if remaining == 1:
-                self.itf['endofpacket'].drive(True)
+    @ci.decorators.reaction('ready', False, smode=ct.ReadWrite)
+    async def stall_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in stall cycle")
+        self._cycle(False)
 
-        if remaining:
-            if self.itf['valid'].instantiated and not self.itf['valid'].generated:
-                self.itf['valid'].drive(True)
+    @ci.decorators.reaction('valid', False, smode=ct.ReadWrite)
+    async def idle_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in idle cycle")
+        self._cycle(False)
+
+    @ci.decorators.reaction('valid', True, force=True, smode=ct.ReadWrite)
+    async def valid_cycle(self) -> None:
+        self.log.debug(f"{str(self)} in valid cycle")
+        self._cycle(True)
+
+    async def acquire(self) -> None:
+        await super().acquire()
+        self._first = True
+        self._presented = False
+        if self.tracker is not None:
+            self.tracker.clear() # Ready history while idle is unknown
+
+    def _load(self, txn: Dict[str, Iterable]) -> None:
+        """Implementation for AvalonST; takes the (encoded) empty of the final beat."""
+        if 'empty' in txn:
+            txn = dict(txn)
+            self._empty = txn.pop('empty')[-1]
         else:
-            if self.itf['valid'].instantiated and not self.itf['valid'].generated:
-                self.itf['valid'].drive(False)
-            self._release()
+            self._empty = self._no_empty
+        super()._load(txn)
+
+    def encode(self, txn: Dict[str, Iterable]) -> Dict[str, List]:
+        """
+        Implementation for AvalonST; packed `Packet` data beats are taken as encoded. The
+        empty of the final beat is encoded as an 'empty' column, if instantiated.
+        """
+        if isinstance(txn, Packet):
+            empty = txn.empty
+        else:
+            empty = list(txn['empty'])[-1] if txn.get('empty') else 0
+            txn = {k: v for k, v in txn.items() if k != 'empty'}
+
+        data = self.itf['data']
+        if isinstance(txn, Packet) and data.instantiated and data.filter is None and data.logic_active_high:
+            out = super().encode({k: [] if k == 'data' else txn[k] for k in txn})
+            out['data'] = list(txn.beats())
+        else:
+            out = super().encode(txn)
+
+        if self.itf['empty'].instantiated:
+            out['empty'] = [self.itf['empty'].encode(empty)]
+        elif empty:
+            raise ValueError(f"{str(self)} transaction has empty ({empty}) but no empty signal")
+        return out
 
     def __init__(self, *args, **kwargs) -> None:
+        self._first = True
+        self._presented = False
+        self._empty = self._no_empty = None
         super().__init__(*args, primary=True, **kwargs)
 
+        if self.itf['empty'].instantiated:
+            self._empty = self._no_empty = self.itf['empty'].encode(0)
+
 class StreamingDriver(ci.adapters.BaseDriver):
 
-    def __init__(self, *args, **kwargs) -> None:
+    def _correlated(self, txn):
+        """Implementation for AvalonST; legacy dict transactions are keyed as `Packet`s."""
+        if isinstance(txn, Packet):
+            return txn
+        data = self.model.itf['data']
+        return Packet.from_dict(txn, data.width if data.instantiated else None)
+
+    def __init__(self, *args,
+                 depth: Optional[int] = None,
+                 latency: Optional[ci.latency.LatencyTracker] = None,
+                 **kwargs) -> None:
         """Implementation for AvalonST."""
 
         # Args target Interface instance
         itf = StreamingInterface(*args, **kwargs)
         mod = SourceModel(itf)
-        super().__init__(mod)
+        super().__init__(mod, depth=depth, latency=latency)
+
 
 
+
+class ChannelizedDriver(StreamingDriver):
+    """
+    Queues transactions per channel and, at each packet boundary, sends from the channel
+    chosen by an `Arbiter`, so that channels interleave (between packets) up to maxChannel.
+
+    Per channel, counts transactions and beats sent, and records the time each transaction
+    waited in queue (in steps) in a `Histogram`; see `fairness`.
+    """
+
+    @property
+    def arbiter(self) -> ci.arbiters.Arbiter: return self._arbiter
+
+    @property
+    def queues(self) -> List[Deque]: return self._queues
+
+    @property
+    def sent(self) -> List[int]:
+        """Transactions sent per channel."""
+        return self._sent
+
+    @property
+    def beats(self) -> List[int]:
+        """Beats sent per channel."""
+        return self._beats
+
+    @property
+    def waits(self) -> List[ci.latency.Histogram]:
+        """Time queued per channel, in steps."""
+        return self._waits
+
+    def fairness(self, by: str = 'beats') -> Optional[float]:
+        """
+        Returns Jain's fairness index (1 if fair, down to 1/channels) of the 'beats' or
+        'sent' of channels sent so far, normalized by their weights if weighted.
+        """
+        counts = self.beats if by == 'beats' else self.sent
+        weights = getattr(self.arbiter, 'weights', [1] * len(counts))
+        xs = [n / w for n, w in zip(counts, weights) if n]
+        if not xs:
+            return None
+        return sum(xs) ** 2 / (len(counts) * sum(x * x for x in xs))
+
+    def append(self, transaction, callback: Optional[Callable] = None,
+               event: Optional[ct.Event] = None, **kwargs) -> None:
+        """Implementation for ChannelizedDriver; queues on the transaction's channel."""
+        ch = transaction['channel'][-1] if 'channel' in transaction else 0
+        if not 0 <= ch < len(self._queues):
+            raise ValueError(f"{str(self)} channel ({ch}) exceeds maxChannel ({len(self._queues) - 1})")
+        if self.depth is not None and 'encoded' not in kwargs:
+            with ci.profiling.section(self.model.profiler):
+                kwargs['encoded'] = self.model.encode(transaction)
+        self._queues[ch].append((transaction, callback, event, kwargs, get_sim_time()))
+        self._meters[ch].sample()
+        self._pending.set()
+
+    async def send(self, transaction, sync: bool = True, **kwargs) -> None:
+        """
+        Implementation for ChannelizedDriver; transactions are always arbitrated, so this
+        blocks until sent or, if prefetching, until queued.
+        """
+        if self.depth is None:
+            done = ct.Event()
+            self.append(transaction, event=done, **kwargs)
+            await done.wait()
+            return
+
+        ch = transaction['channel'][-1] if 'channel' in transaction else 0
+        while len(self._queues[ch]) >= self.depth:
+            self._space.clear()
+            await self._space.wait()
+        await self._meters[ch].space(self.model.re)
+
+        self.append(transaction, **kwargs)
+
+    def clear(self) -> None:
+        """Implementation for ChannelizedDriver; also clears each channel's queue."""
+        super().clear()
+        for q, meter in zip(self._queues, self._meters):
+            q.clear()
+            meter.sample(check=False)
+        self._space.set()
+
+    async def _send_thread(self) -> None:
+        while True:
+            while not any(self._queues):
+                self._pending.clear()
+                await self._pending.wait()
+
+            # Arbitrate at each packet boundary; only synchronize on the first send
+            synchronised = False
+            while True:
+                ch = self._arbiter.choose([i for i, q in enumerate(self._queues) if q])
+                if ch is None:
+                    break
+                transaction, callback, event, kwargs, queued = self._queues[ch].popleft()
+                self._waits[ch].record(get_sim_time() - queued)
+                await self._send(transaction, callback, event, sync=not synchronised, **kwargs)
+                self._sent[ch] += 1
+                self._beats[ch] += transaction.nbeats if isinstance(transaction, Packet) else \
+                    max((len(v) for k, v in transaction.items() if k != 'channel'), default=0)
+                synchronised = True
+
+    def __init__(self, *args,
+                 arbiter: Union[str, ci.arbiters.Arbiter] = 'round_robin',
+                 weights: Optional[Sequence[int]] = None,
+                 depth: Optional[int] = None,
+                 latency: Optional[ci.latency.LatencyTracker] = None,
+                 **kwargs) -> None:
+        """
+        Implementation for AvalonST; requires an instantiated channel signal.
+
+        Args:
+            arbiter: An `Arbiter`, or one of `ci.arbiters.POLICIES`.
+            weights: Per-channel weights ('weighted') or priorities ('strict').
+            depth: As for `BaseDriver`, but per channel.
+        """
+        self._queues = [] # Send thread starts during construction
+        super().__init__(*args, depth=depth, latency=latency, **kwargs)
+
+        itf = self.model.itf
+        if not itf['channel'].instantiated:
+            raise ci.InterfacePropertyError(f"{str(self)} requires an instantiated channel signal")
+
+        n = itf.max_channel + 1
+        self._arbiter = arbiter if isinstance(arbiter, ci.arbiters.Arbiter) else \
+            ci.arbiters.arbiter(arbiter, n, weights)
+        if self._arbiter.channels != n:
+            raise ValueError(f"{str(self)} arbiter must have {n} channels, has {self._arbiter.channels}")
+
+        self._queues = [collections.deque() for _ in range(n)]
+        self._meters = [ci.accounting.track(f"{self.model.label}.sendQ.{i}", q) for i, q in enumerate(self._queues)]
+        self._sent = [0] * n
+        self._beats = [0] * n
+        self._waits = [ci.latency.Histogram() for _ in range(n)]
@@ -1,6 +1,7 @@
 import abc
+import inspect
 import warnings
-from typing import Set, Optional
+from typing import Callable, Dict, Mapping, Optional, Sequence, Set, Tuple
 
 import cocotb as c
 import cocotbext.interfaces as ci
@@ -45,6 +46,33 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
     def filters(self) -> Set[ci.decorators.filter]:
         return self._filters
 
+    @property
+    def lanes(self) -> int:
+        """Number of identical buses packed into each (shared) signal."""
+        return self._lanes
+
+    @property
+    def validators(self) -> Dict[Callable, Tuple[str, ...]]:
+        return self._validators
+
+    @property
+    def validated(self) -> Set[str]:
+        """Returns names of fields checked by any validator."""
+        return set(f for fields in self.validators.values() for f in fields)
+
+    @property
+    def bundle(self) -> Optional[ci.signal.DriveBundle]:
+        """Batches and elides writes to the interface's signals, if enabled."""
+        return self._bundle
+
+    @property
+    def per_beat(self) -> bool:
+        return self._per_beat
+
+    @per_beat.setter
+    def per_beat(self, val: bool) -> None:
+        self._per_beat = val
+
     @classmethod
     @abc.abstractmethod
     def specification(cls) -> Set[ci.signal.Signal]:
@@ -64,7 +92,7 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
             currently specified in self.controls.
         """
 
-        # TODO: (redd@) array_idx; account for naming variations e.g. w/ _n suffix
+        # TODO: (redd@) account for naming variations e.g. w/ _n suffix
         def alias(s: ci.signal.Signal):
             return f"{bus_name}{bus_separator}{s.name}" if bus_name else s.name
 
@@ -95,7 +123,9 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
 
                 self.log.info(f"{str(self)} ignoring optional: {str(s)}")
             elif not s.instantiated:
+                s.lanes = self.lanes
                 s.handle = getattr(self.entity, alias(s))
+                s.bundle = self.bundle
 
                 for f in self._filters:
                     if f.cname == s.name:
@@ -117,6 +147,26 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
         cnd = lambda s: s.instantiated and not s.meta and s.direction == d
         return set(s.name for s in self.signals if cnd(s))
 
+    def add_validator(self, fn: Callable[..., None], *fields: str) -> None:
+        """
+        Adds a validator (see `ci.decorators.validator`) of `fields`; ignored unless every
+        field is instantiated.
+        """
+        if not all(f in self and self[f].instantiated for f in fields):
+            self.log.debug(f"{str(self)} ignoring validator of non-instantiated fields: {fields}")
+            return
+        self._validators[fn] = fields
+        self.log.debug(f"{str(self)} applied validator: {repr(fn)}")
+
+    def validate(self, columns: Mapping[str, Sequence]) -> None:
+        """
+        Runs validators over a completed transaction, given as one column (sequence of
+        per-beat values) per validated field. When validating `per_beat`, this is instead
+        called with single-beat columns as each beat is received.
+        """
+        for fn, fields in self.validators.items():
+            fn(*[columns[f] for f in fields])
+
     def _add_filter(self, val: ci.decorators.filter) -> None:
         if val in self.filters:
             warnings.warn(f"Duplicate filter received; overwriting {repr(val)}")
@@ -147,8 +197,23 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
                  bus_name: Optional[str] = None,
                  bus_separator: str = "_",
                  family: Optional[str] = None,
-                 log_level: Optional[int] = None) -> None:
-        """Should be extended by child class."""
+                 log_level: Optional[int] = None,
+                 per_beat: bool = False,
+                 lanes: int = 1,
+                 bundle: bool = False) -> None:
+        """
+        Should be extended by child class.
+
+        Args:
+            lanes: Number of identical buses packed, lane 0 in the least-significant bits,
+                into each signal (see `Signal.width`).
+            per_beat: If asserted, run validators on each beat rather than once per
+                transaction, e.g. to fail on the offending cycle when debugging.
+            bundle: If asserted, drive signals through a `DriveBundle`, such that writes
+                repeating a signal's previous value are skipped. The interface must then be
+                its signals' only driver; a value written otherwise (e.g. by a test) is not
+                restored unless the signal is `forget`-ed.
+        """
 
         ci.Pretty.__init__(self) # Logging
 
@@ -159,6 +224,8 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
         if log_level is not None:
             self.log.setLevel(log_level)
 
+        self._lanes = lanes
+        self._bundle = ci.signal.DriveBundle() if bundle else None
         self._filters = set()
         self._specify(
             self.specification(),
@@ -166,4 +233,10 @@ class BaseInterface(ci.Pretty, metaclass=abc.ABCMeta):
             bus_separator=bus_separator
         )
 
+        self._per_beat = per_beat
+        self._validators = {}
+        for _, fn in inspect.getmembers(type(self), predicate=inspect.isfunction):
+            if getattr(fn, 'validator', False):
+                self.add_validator(fn.__get__(self), *fn.fields)
+
         self.log.info(f"New {repr(self)}")
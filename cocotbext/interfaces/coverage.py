@@ -0,0 +1,195 @@
+import atexit
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import cocotbext.interfaces as ci
+
+_ENV = 'COCOTBEXT_COVERAGE_FILE'
+_SEPARATOR = '_'
+_registry = []
+
+
+class Coverage(ci.Pretty):
+    """
+    State/transition coverage of an elaborated behavioral model.
+
+    Each elaborated state and each declared transition is assigned an index; visiting one
+    sets its bit in a bitmap. Only stable (leaf) states are observed, once per cycle, so
+    transient INIT states are excluded. A composite state is visited if any of its
+    descendants is. An observed change of leaf state is attributed to the declared
+    transition between the children of the two leaves' deepest common ancestor.
+
+    Bitmaps are saved by state/transition name, so results from models with differing
+    elaborations, or from separate processes, can be merged.
+    """
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def states(self) -> List[str]: return self._states
+
+    @property
+    def transitions(self) -> List[str]: return self._transitions
+
+    def visit(self, state: str) -> None:
+        """Record a visit to `state` (fully-qualified name) following the previous visit."""
+        idx = self._index[state]
+        prev = self._prev
+        self._prev = idx
+        sbits = self._sbits
+        sbits[idx >> 3] |= 1 << (idx & 7)
+
+        if prev is None or prev == idx and not self._loops:
+            return
+
+        key = prev * self._n + idx
+        t = self._pairs.get(key)
+        if t is None:
+            t = self._pairs[key] = self._attribute(prev, idx)
+        if t >= 0:
+            self._tbits[t >> 3] |= 1 << (t & 7)
+
+    def reset(self) -> None:
+        """Forget the previous state, e.g. following a reset."""
+        self._prev = None
+
+    def _attribute(self, prev: int, cur: int) -> int:
+        """Returns index of the declared transition spanning two leaves, or -1 if none."""
+        a, b = self._paths[prev], self._paths[cur]
+        if a == b:
+            return self._declared.get((a[:-1], a[-1], a[-1]), -1)
+        k = 0
+        while a[k] == b[k]:
+            k += 1
+        return self._declared.get((a[:k], a[k], b[k]), -1)
+
+    @staticmethod
+    def _test(bits: bytearray, idx: int) -> bool:
+        return bool(bits[idx >> 3] & 1 << (idx & 7))
+
+    def visited_states(self) -> List[str]:
+        """Returns names of visited states, including composites."""
+        out = set()
+        for i, path in enumerate(self._paths):
+            if self._test(self._sbits, i):
+                out.update(_SEPARATOR.join(path[:k]) for k in range(1, len(path) + 1))
+        return [s for s in self._states if s in out]
+
+    def visited_transitions(self) -> List[str]:
+        return [t for i, t in enumerate(self._transitions) if self._test(self._tbits, i)]
+
+    def unvisited(self) -> Dict[str, List[str]]:
+        """Returns names of states and transitions never visited."""
+        vs, vt = set(self.visited_states()), set(self.visited_transitions())
+        return {
+            'states': [s for s in self._states if s not in vs],
+            'transitions': [t for t in self._transitions if t not in vt]
+        }
+
+    def todict(self) -> Dict:
+        return {
+            'states': self._states,
+            'transitions': self._transitions,
+            'visited_states': self.visited_states(),
+            'visited_transitions': self.visited_transitions(),
+        }
+
+    def __init__(self, name: str, elaborated: Dict, register: bool = True) -> None:
+        """
+        Args:
+            name: Key under which coverage is saved, merged.
+            elaborated: Nested state definition, as returned by `BaseModel._elaborate`.
+            register: If asserted, include in `save`.
+        """
+        super().__init__()
+        self._name = name
+
+        # States and declared transitions, in elaboration order
+        self._states = []
+        self._transitions = []
+        self._index = {}  # Leaf name -> leaf index
+        self._paths = []  # Leaf index -> path
+        self._declared = {}  # (scope path, source, dest) -> transition index
+        self._loops = False  # Any declared internal (self-)transitions
+
+        def walk(n: Dict, scope: Tuple[str, ...]) -> None:
+            path = scope + (n['name'],)
+            children = n.get('children', [])
+            if n['name'] != 'INIT':
+                self._states.append(_SEPARATOR.join(path))
+            if not children and n['name'] != 'INIT':
+                self._index[_SEPARATOR.join(path)] = len(self._paths)
+                self._paths.append(path)
+
+            names = set(c['name'] for c in children)
+            for t in n.get('transitions', []):
+                sources = [t['source']] if isinstance(t['source'], str) else t['source']
+                for src in sources:
+                    dst = t['dest'] if t['dest'] is not None else src
+                    # Transitions out of INIT are transient; others must be between children
+                    if src == 'INIT' or not {src, dst} <= names or (path, src, dst) in self._declared:
+                        continue
+                    self._loops |= src == dst
+                    self._declared[(path, src, dst)] = len(self._transitions)
+                    prefix = _SEPARATOR.join(path)
+                    self._transitions.append(f"{prefix}_{src}->{prefix}_{dst}")
+
+            for c in children:
+                walk(c, path)
+
+        walk(elaborated, ())
+        self._n = len(self._paths)
+        self._sbits = bytearray((self._n + 7) // 8)
+        self._tbits = bytearray((len(self._transitions) + 7) // 8)
+        self._pairs = {}  # prev * n + cur -> transition index, or -1
+        self._prev = None
+
+        if register:
+            _registry.append(self)
+            if os.environ.get(_ENV) and len(_registry) == 1:
+                atexit.register(save, os.environ[_ENV])
+
+
+def merge(results: Iterable[Dict]) -> Dict[str, Dict]:
+    """
+    Merges saved coverage results, keyed by model name; each entry holds name lists
+    `states`, `transitions` and their visited subsets.
+    """
+    out = {}
+    for result in results:
+        for name, cov in result.items():
+            m = out.setdefault(name, {k: {} for k in cov})
+            for k, v in cov.items():
+                m[k].update(dict.fromkeys(v))  # Ordered union
+    return {n: {k: list(v) for k, v in m.items()} for n, m in out.items()}
+
+
+def collect() -> Dict[str, Dict]:
+    """Returns merged coverage of all registered models."""
+    return merge({c.name: c.todict()} for c in _registry)
+
+
+def save(path: str) -> None:
+    """Saves coverage of all registered models, merging with any existing results at `path`."""
+    results = [collect()]
+    if os.path.exists(path):
+        with open(path) as f:
+            results.insert(0, json.load(f))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(merge(results), f, indent=1)
+    os.replace(tmp, path)
+
+
+def report(results: Dict[str, Dict]) -> Dict[str, Dict[str, List[str]]]:
+    """Returns unvisited states and transitions per model of merged results."""
+    out = {}
+    for name, cov in results.items():
+        vs, vt = set(cov['visited_states']), set(cov['visited_transitions'])
+        out[name] = {
+            'states': [s for s in cov['states'] if s not in vs],
+            'transitions': [t for t in cov['transitions'] if t not in vt]
+        }
+    return out
@@ -1,4 +1,5 @@
-from typing import Optional, Union, Awaitable
+import logging
+from typing import Optional, Union, Awaitable, Callable
 
 import cocotb as c
 import cocotb.triggers as ct
@@ -6,6 +7,8 @@ import pprint as p
 from typing import Optional, Union
 import cocotbext.interfaces as ci
 
+_LOG = ci.log(__name__, logging.INFO)
+
 class reaction(ci.Pretty):
     """
     Decorator for specifying coroutines that are  `BaseModel`)
@@ -45,11 +48,33 @@ class reaction(ci.Pretty):
 
 
 
-# TODO: (redd@) Redo this
+class validator(object):
+    """
+    Decorator for specifying methods (bound to instances which inherit `BaseInterface`)
+    as validators of one or more fields. Each is called once per completed transaction with
+    one column (sequence of per-beat values) per field, and should raise
+    `InterfaceProtocolError` if the check fails.
+    """
+
+    def __init__(self, *fields: str):
+        self.fields = fields
+
+    def __call__(self, f: Callable):
+        f.validator = True
+        f.fields = self.fields
+        _LOG.debug(f"{repr(self)} detected: {repr(f)}")
+        return f
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(fields={self.fields})>"
+
+
+# TODO: (redd@) Deprecate this in favor of validator
 class filter(object):
     """
     Decorator used for specifying methods (bound to instances which inherit `BaseInterface`)
-    as `Signal` filters e.g. for logical validation.
+    as `Signal` filters e.g. for logical validation. Filters run on every sample; prefer
+    `validator`.
     """
 
     def __init__(self, cname: str):
@@ -58,7 +83,7 @@ class filter(object):
     def __call__(self, f):
         f.filter = True
         f.cname = self.cname
-        _LOG.info(f"{str(self)} detected: {repr(f)}")
+        _LOG.info(f"{repr(self)} detected: {repr(f)}")
         return f
 
     # TODO: (redd@) Deprecate this
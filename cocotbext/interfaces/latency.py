@@ -0,0 +1,241 @@
+import collections
+import collections.abc
+import hashlib
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from cocotb.utils import get_sim_time, get_time_from_sim_steps
+
+import cocotbext.interfaces as ci
+
+
+class Histogram(ci.Pretty):
+    """
+    Log-linear histogram of non-negative integers, with bounded memory.
+
+    Values below 2 ** `precision` are counted exactly; above, each power of two is split
+    into 2 ** (`precision` - 1) equal buckets, bounding the relative error of percentiles
+    by 2 ** (1 - `precision`).
+    """
+
+    @property
+    def count(self) -> int: return self._count
+
+    @property
+    def min(self) -> Optional[int]: return self._min
+
+    @property
+    def max(self) -> Optional[int]: return self._max
+
+    @property
+    def mean(self) -> Optional[float]: return self._sum / self._count if self._count else None
+
+    def _index(self, val: int) -> int:
+        if val < self._linear:
+            return val
+        e = val.bit_length() - self._precision
+        return e * self._half + (val >> e)
+
+    def _bounds(self, idx: int) -> Tuple[int, int]:
+        """Returns the (inclusive) range of values counted by a bucket."""
+        if idx < self._linear:
+            return idx, idx
+        e = idx // self._half - 1
+        m = idx - e * self._half
+        return m << e, ((m + 1) << e) - 1
+
+    def record(self, val: int, n: int = 1) -> None:
+        if val < 0:
+            raise ValueError(f"Histogram values must be non-negative, was provided {val}")
+        idx = self._index(val)
+        if idx >= len(self._counts):
+            self._counts.extend([0] * (idx + 1 - len(self._counts)))
+        self._counts[idx] += n
+        self._count += n
+        self._sum += val * n
+        self._min = val if self._min is None else min(self._min, val)
+        self._max = val if self._max is None else max(self._max, val)
+
+    def percentile(self, p: float) -> Optional[int]:
+        """Returns an upper bound of the `p`th percentile, e.g. 99 for p99."""
+        if not self._count:
+            return None
+        rank = max(math.ceil(p / 100 * self._count), 1)
+        seen = 0
+        for idx, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(self._bounds(idx)[1], self._max)
+        return self._max
+
+    def buckets(self) -> List[Tuple[int, int, int]]:
+        """Returns (low, high, count) of non-empty buckets."""
+        return [self._bounds(i) + (n,) for i, n in enumerate(self._counts) if n]
+
+    def merge(self, other: 'Histogram') -> None:
+        if other._precision != self._precision:
+            raise ValueError(f"Cannot merge histograms of differing precision")
+        if not other._count:
+            return
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for i, n in enumerate(other._counts):
+            self._counts[i] += n
+        self._count += other._count
+        self._sum += other._sum
+        self._min = other._min if self._min is None else min(self._min, other._min)
+        self._max = other._max if self._max is None else max(self._max, other._max)
+
+    def clear(self) -> None:
+        self._counts = []
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    def __init__(self, precision: int = 5) -> None:
+        super().__init__()
+
+        if precision < 1:
+            raise ValueError(f"Histogram precision must be positive, was provided {precision}")
+        self._precision = precision
+        self._linear = 1 << precision
+        self._half = 1 << (precision - 1)
+        self.clear()
+
+
+def digest(txn: Any) -> Hashable:
+    """
+    Default correlation key: a digest of the transaction's payload and channel (if any).
+    Other fields, e.g. error, are excluded as they may legitimately differ.
+    """
+    if callable(getattr(txn, 'tobytes', None)): # Packet
+        return getattr(txn, 'channel', None), hashlib.blake2b(txn.tobytes(), digest_size=16).digest()
+    if isinstance(txn, collections.abc.Mapping):
+        payload = repr(sorted((k, list(v) if isinstance(v, collections.abc.Iterable) else v)
+                              for k, v in txn.items() if k != 'error'))
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+    return hashlib.blake2b(repr(txn).encode(), digest_size=16).digest()
+
+
+class LatencyTracker(ci.Pretty):
+    """
+    Correlates transactions entering (`start`, e.g. from a driver) and leaving (`stop`,
+    e.g. from a monitor) a DUT, recording their latencies in a `Histogram`.
+
+    Timestamps are matched through a hash index on `key`, in order for equal keys. Matching
+    is symmetric, so a transaction may be stopped before it is started, e.g. if both occur
+    in the same cycle. At most `max_pending` keys are retained unmatched; beyond that, the
+    oldest are evicted (and counted as `unmatched`).
+    """
+
+    @property
+    def name(self) -> Optional[str]: return self._name
+
+    @property
+    def units(self) -> str: return self._units
+
+    @property
+    def histogram(self) -> Histogram: return self._hist
+
+    @property
+    def pending(self) -> int:
+        """Number of timestamps awaiting a match."""
+        return sum(len(d) for d in self._pending.values())
+
+    @property
+    def unmatched(self) -> int:
+        """Number of timestamps evicted without a match."""
+        return self._unmatched
+
+    def _key(self, side: int, txn: Any) -> Hashable:
+        if self._sequence is None:
+            return self._keyfn(txn)
+        channel = getattr(txn, 'channel', None)
+        n = self._sequence[side][channel]
+        self._sequence[side][channel] = n + 1
+        return channel, n
+
+    def _match(self, side: int, txn: Any, time: Optional[int]) -> None:
+        time = get_sim_time() if time is None else time
+        key = self._key(side, txn)
+
+        q = self._pending.get(key)
+        if q and q[0][0] != side:
+            _, other = q.popleft()
+            if not q:
+                del self._pending[key]
+            start, stop = (other, time) if side else (time, other)
+            if stop < start:
+                raise ci.InterfaceProtocolError(
+                    f"{str(self)} transaction completed before it started ({txn})"
+                )
+            self._hist.record(stop - start)
+            return
+
+        if q is None:
+            q = self._pending[key] = collections.deque()
+            if len(self._pending) > self._max_pending:
+                self._unmatched += len(self._pending.pop(next(iter(self._pending))))
+        q.append((side, time))
+
+    def start(self, txn: Any, time: Optional[int] = None) -> None:
+        """Timestamps a transaction entering the DUT, at `time` (in steps) or now."""
+        self._match(0, txn, time)
+
+    def stop(self, txn: Any, time: Optional[int] = None) -> None:
+        """Timestamps a transaction leaving the DUT, at `time` (in steps) or now."""
+        self._match(1, txn, time)
+
+    def _time(self, steps: float) -> float:
+        return steps if self._units == 'step' else get_time_from_sim_steps(steps, self._units)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Returns the `p`th percentile latency, in `units`."""
+        val = self._hist.percentile(p)
+        return self._time(val) if val is not None else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns count and p50/p99/max/mean latencies, in `units`."""
+        h = self._hist
+        return {
+            'count': h.count,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self._time(h.max) if h.count else None,
+            'mean': self._time(h.mean) if h.count else None,
+            'pending': self.pending,
+            'unmatched': self.unmatched,
+            'units': self._units,
+        }
+
+    def __init__(self, key: Union[str, Callable[[Any], Hashable]] = 'payload',
+                 name: Optional[str] = None,
+                 units: str = 'ns',
+                 precision: int = 5,
+                 max_pending: int = 1 << 16) -> None:
+        """
+        Args:
+            key: 'payload' to match on `digest`, 'sequence' to match on channel and sequence
+                number within the channel, or a callable returning a hashable key.
+            units: Time units in which latencies are reported.
+            precision: See `Histogram`.
+            max_pending: Maximum number of unmatched keys retained.
+        """
+        super().__init__()
+
+        if key == 'payload':
+            key = digest
+        elif key == 'sequence':
+            key = None
+        elif not callable(key):
+            raise ValueError(f"Invalid latency key ({key})")
+
+        self._name = name
+        self._units = units
+        self._keyfn = key
+        self._sequence = None if key else (collections.Counter(), collections.Counter())
+        self._hist = Histogram(precision)
+        self._pending = {}  # Key -> deque of (side, time); ordered by insertion
+        self._max_pending = max_pending
+        self._unmatched = 0
@@ -1,9 +1,13 @@
 import abc
 import collections
 import copy
+import functools
 import inspect
 import itertools
 import logging
+import os
+import time
+import types
 import warnings
 from typing import List, Optional, Set, Dict, Iterable, Callable, Deque, Awaitable, Any
 
@@ -13,6 +17,7 @@ import transitions.extensions as te
 import transitions.extensions.nesting as ten
 import transitions.extensions.states as tes
 from cocotb.triggers import ReadOnly, Event, NextTimeStep
+from cocotb.utils import get_sim_time
 
 import cocotbext.interfaces as ci
 import cocotbext.interfaces.signal as cis
@@ -55,12 +60,17 @@ class Behavioral(ten.State):
     # TODO: (redd@) Anything fun to add here?
 
 
+_SPECIALIZE = 'COCOTBEXT_SPECIALIZE'
+
+
 @tes.add_state_features(tes.Tags, tes.Volatile, Behavioral)
 class BaseModel(
     te.MachineFactory.get_predefined(asyncio=True, nested=True, graph=True),
     ci.Pretty,
     metaclass=abc.ABCMeta): # TODO: (redd@) Get GraphMachine working
 
+    _checked = ()  # Attributes compared (and restored) when checking specializations
+
     @property
     def itf(self) -> ci.core.BaseInterface:
         return self._itf
@@ -91,10 +101,50 @@ class BaseModel(
         """
         return self._lock
 
+    @property
+    def label(self) -> str:
+        """Name under which the model is reported, e.g. in coverage, traces and accounting."""
+        return self._label
+
+    @property
+    def profiler(self) -> Optional[ci.profiling.WindowProfiler]:
+        """Profiles windows of cycles, if configured (see `ci.profiling.profiler`)."""
+        return self._profiler
+
+    @property
+    def specialized(self) -> Dict[str, str]:
+        """Source code of specialized methods, by name."""
+        return self._specialized
+
+    @property
+    def meters(self) -> Dict[str, ci.accounting.Meter]:
+        """Accounting of `buff`, per key."""
+        return self._meters
+
     @property
     def buff(self) -> Dict[str, Deque]:
         return self._buff
 
+    @property
+    def coverage(self) -> Optional[ci.coverage.Coverage]:
+        return self._coverage
+
+    @property
+    def recorder(self) -> Optional[ci.recorder.FlightRecorder]:
+        return self._recorder
+
+    @property
+    def tracer(self) -> Optional[ci.trace.TraceWriter]:
+        return self._tracer
+
+    @property
+    def began(self) -> int:
+        """
+        Simulation time (in steps) at which the current, or last, transaction started: its
+        first cycle on the bus if marked by `_begin`, otherwise when the lock was acquired.
+        """
+        return self._began if self._began is not None else self._acquired
+
     @property
     def nchunks(self) -> int: return max(len(d) for d in self.buff.values()) if self.buff else 0
 
@@ -111,8 +161,6 @@ class BaseModel(
         # wait - Denotes a temporary state
         # Lack of flow, fix tag indicates a non-accepted superstate; may have accepted children
 
-        # Nested delay (volatile) states are allowed given that a parent control context persists
-
         def node(
                 name='BASE', tags=None, on_enter=None, on_exit=None, initial=None,
                 children=None, transitions=None, volatile=None, hook=None,
@@ -182,25 +230,20 @@ class BaseModel(
             is_fix = lambda : sample() in ctrl.fix_vals
             is_flow = lambda : sample() in ctrl.flow_vals
 
-            def value(val, flow=True, delayed=False, cond=None, infl=None, react=None):
+            def value(val, flow=True, cond=None, infl=None, react=None):
                 """
                 Returns a nest corresponding to a single, distinct control value.
 
-                If a `Control` instance is delayed, the (state-level) behavioral effects of its
-                signal transitions may be temporally postponed--assuming the external (behavioral)
-                context remains invariant. A volatile nest is included to represent delayed states.
-                Delayed states may be nested insofar as their behavioral contexts are preserved.
-
+                Delayed `Control`s (i.e. with non-zero allowance or latency) are not modelled
+                by nesting; instead, their samples are resolved through a `CreditTracker`.
 
                 Args:
                     val: Control value to consider
                     flow: If asserted, is flow_val
-                    delayed: If asserted, state contains delay logic
                 """
 
-                # Positive, negative constraints for base, delayed substates respectively
+                # Positive constraint
                 pcon = lambda : sample() == val
-                ncon = lambda : sample() != val
 
                 # Include reaction if defined
                 match = next(
@@ -209,7 +252,7 @@ class BaseModel(
                 react = ([] if react is None else react) + ([] if match is None else [match])
                 cond = cond + [pcon] if cond else [pcon]
 
-                n = node(
+                return node(
                     name=str(val).upper(),
                     tags=['flow' if flow else 'fix'],
                     conditions=cond,
@@ -217,37 +260,7 @@ class BaseModel(
                     reactions=react
                 )
 
-                # TODO: (redd@) Fix: initial + transitioning logic when entering latency
-                if delayed:
-                    subname = 'ALLOWANCE' if flow else 'LATENCY'
-                    hook = f"{ctrl.name}_{subname.lower()}_count"
-
-                    wait = lambda : (ctrl.allowance if flow else ctrl.latency) > getattr(self, hook)
-                    tick = lambda : setattr(self, hook, getattr(self, hook) + 1)
-
-                    n['children'].append(
-                        node(
-                            name=subname,
-                            tags=['flow' if flow else 'fix', 'wait'],
-                            volatile=int,
-                            hook=hook,
-                            influences=infl,
-                            reactions=react,
-                            conditions=cond + [ncon] if cond else [ncon]
-                        )
-                    )
-                    n['transitions'].extend([
-                        {'trigger': 'advance', 'source': 'BASE', 'dest': subname,
-                         'conditions': cond + [ncon] if cond else [ncon]
-                         },
-                        {'trigger': 'advance', 'source': subname, 'dest': None,
-                         'conditions': cond + [ncon, wait] if cond else [ncon, wait],
-                         'after': [tick]}
-                    ])
-
-                return n
-
-            def flow(vals, delayed, cond: List, infl: List, react: List):
+            def flow(vals, cond: List, infl: List, react: List):
                 """
                 Returns a nest encapsulating a set of flow values.
 
@@ -255,12 +268,11 @@ class BaseModel(
                     vals: List of flow values.
                 """
 
-                c = [value(fv, cond=cond, delayed=delayed,
-                           infl=infl, react=react) for fv in vals] + [node(name='INIT')]
+                c = [value(fv, cond=cond, infl=infl, react=react) for fv in vals] + [node(name='INIT')]
                 t = [{'trigger': 'advance',
                       'source': ['INIT'] + [str(src).upper() for src in vals if src != fv],
                       'dest': str(fv).upper(),
-                      'conditions': cond + [lambda: sample() == fv]
+                      'conditions': cond + [lambda fv=fv: sample() == fv]
                       } for fv in vals]
 
                 return node(
@@ -274,7 +286,7 @@ class BaseModel(
                     conditions=cond
                 )
 
-            def fix(vals, delayed, cond: List, infl: List, react: List):
+            def fix(vals, cond: List, infl: List, react: List):
                 """
                 Returns a nest encapsulating a set of fix values.
 
@@ -282,12 +294,12 @@ class BaseModel(
                     vals: List of fix values.
                 """
 
-                c = [value(fv, flow=False, cond=cond, delayed=delayed,
-                           infl=infl, react=react) for fv in vals] + [node(name='INIT')]
+                c = [value(fv, flow=False, cond=cond, infl=infl, react=react)
+                     for fv in vals] + [node(name='INIT')]
                 t = [{'trigger': 'advance',
                       'source': ['INIT'] + [str(src).upper() for src in vals if src != fv],
                       'dest': str(fv).upper(),
-                      'conditions': cond + [lambda: sample() == fv]
+                      'conditions': cond + [lambda fv=fv: sample() == fv]
                       } for fv in vals]
 
                 return node(
@@ -306,8 +318,8 @@ class BaseModel(
                 conditions=cond,
                 reactions=react,
                 children=[
-                    flow(ctrl.flow_vals, ctrl.allowance > 0, cond=cond, infl=infl, react=react),
-                    fix(ctrl.fix_vals, ctrl.latency > 0, cond=cond, infl=infl, react=react),
+                    flow(ctrl.flow_vals, cond=cond, infl=infl, react=react),
+                    fix(ctrl.fix_vals, cond=cond, infl=infl, react=react),
                     node(name='INIT')
                 ],
                 influences=infl,
@@ -344,8 +356,8 @@ class BaseModel(
                 if c.instantiated:
                     cond[c.name] = {
                         'obj': c,
-                        'fix': lambda: c.capture() in c.fix_vals,
-                        'flow': lambda: c.capture() in c.flow_vals
+                        'fix': lambda c=c: c.capture() in c.fix_vals,
+                        'flow': lambda c=c: c.capture() in c.flow_vals
                     }
                 elif match is not None: # Forced reactions create 'virtual' precedence levels
                     self.log.debug(f"{str(self)} inserting forced reaction: {str(match)}")
@@ -434,6 +446,7 @@ class BaseModel(
         """
         for k, v in txn.items():
             self.buff[k].extendleft(v)
+            self.meters[k].sample()
         self.log.debug(f"{str(self)} loaded buffer ({txn})")
 
     async def acquire(self) -> None:
@@ -445,6 +458,8 @@ class BaseModel(
         self.lock.clear()
         self._busy = True
         self.log.debug(f"{str(self)} acquired lock")
+        self._began = None
+        self._acquired = get_sim_time()
 
         if self.nchunks:
             warnings.warn(f"{str(self)} buffer non-empty (size={self.nchunks})")
@@ -476,17 +491,144 @@ class BaseModel(
         if not self.busy:
             raise ci.InterfaceProtocolError(f"{str(self)} attempted release of non-existent busy-lock")
         self._busy = False
+        if self._profiler is not None:
+            self._profiler.release()
+        if self.tracer is not None:
+            begin = self.tracer.time(self.began)
+            self.tracer.complete('txn', 'txn', self._tid, begin, self.tracer.now() - begin)
         self.lock.set(data)
         self.log.debug(f"{str(self)} released lock (data={data})")
 
-    async def input(self, txn: Dict[str, Iterable], trig: Awaitable) -> None:
-        """Blocking input call to ingest a[n input] logical transaction."""
+    def _begin(self) -> None:
+        """
+        Marks the current cycle as the start of the transaction being processed, if not yet
+        marked (see `began`).
+        """
+        if self._began is None:
+            self._began = get_sim_time()
+
+    def _trace_span(self, now: float) -> None:
+        """Emits the span of consecutive cycles in the same state, ending at `now`."""
+        if self._tspan is None:
+            return
+        state, begin, cycles, host = self._tspan
+        name = '+'.join(fn.__name__ for fn in self.get_state(state).reactions) or state
+        self.tracer.complete(name, 'state', self._tid, begin, now - begin, {
+            'state': state, 'cycles': cycles, 'reaction_us': round(host * 1e6, 3)
+        })
+
+    def _specialize(self) -> Dict[str, str]:
+        """
+        Returns source code of functions specialized to the interface's (fixed)
+        configuration, by name of the generic method or reaction each replaces. Should be
+        extended by child class; see `_compile`.
+        """
+        return {}
+
+    def _compile(self, name: str, src: str, **env) -> Callable:
+        """
+        Compiles specialized source defining `name`. Besides builtins and `env`, the source
+        may refer to `ci`, `itf` and to each interface signal as `sig_<name>`.
+        """
+        env.update({f"sig_{sig.name}": sig for sig in self.itf.signals}, ci=ci, itf=self.itf)
+        exec(compile(src, f"<specialized {self.label}.{name}>", 'exec'), env)
+        return env[name]
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Returns copies of the attributes named by `_checked`."""
+        out = {}
+        for a in self._checked:
+            val = getattr(self, a)
+            out[a] = {k: list(v) for k, v in val.items()} if isinstance(val, dict) else copy.deepcopy(val)
+        return out
+
+    def _restore(self, snap: Dict[str, Any]) -> None:
+        """Restores a snapshot; buffers (dicts of sequences) are restored in place."""
+        for a, val in snap.items():
+            if isinstance(val, dict):
+                for k, v in getattr(self, a).items():
+                    v.clear()
+                    v.extend(val[k])
+            else:
+                setattr(self, a, copy.deepcopy(val))
+
+    async def _trial(self, fn: Callable, *args) -> tuple:
+        """
+        Calls `fn` with signal writes and releases intercepted, then restores state; returns
+        its result (or error), writes, releases and resulting state.
+        """
+        snap = self._snapshot()
+        writes, released = [], []
+        hooked = [(obj, attr, obj.__dict__.get(attr)) for obj, attr in
+                  [(sig, 'write') for sig in self.itf.signals if sig.instantiated] + [(self, '_release')]]
+        for sig, _, _ in hooked[:-1]:
+            sig.write = lambda raw, name=sig.name: writes.append((name, raw))
+        self._release = lambda data=None: released.append(data)
+        try:
+            out = fn(self, *args)
+            if inspect.isawaitable(out):
+                out = await out
+        except Exception as e:
+            out = (type(e), str(e))
+        finally:
+            for obj, attr, prev in hooked: # Restore, e.g. an enclosing trial's hooks
+                if prev is None:
+                    delattr(obj, attr)
+                else:
+                    setattr(obj, attr, prev)
+            after = self._snapshot()
+            self._restore(snap)
+        return out, writes, released, after
+
+    def _checker(self, name: str, generic: Callable, special: Callable) -> Callable:
+        """Returns `special`, wrapped to first compare its effects with those of `generic`."""
+        async def check(*args):
+            expected = await self._trial(generic, *args)
+            actual = await self._trial(special, *args)
+            if actual != expected:
+                raise RuntimeError(
+                    f"{str(self)} specialized {name} diverged from generic: {actual} != {expected}"
+                )
 
+        if inspect.iscoroutinefunction(generic):
+            async def wrapper(model, *args):
+                await check(*args)
+                return await special(model, *args)
+        else:
+            def wrapper(model, *args):
+                # Neither runs a coroutine, so the check completes without yielding
+                coro = check(*args)
+                try:
+                    coro.send(None)
+                except StopIteration:
+                    pass
+                return special(model, *args)
+
+        return wrapper
+
+    def encode(self, txn: Dict[str, Iterable]) -> Dict[str, List]:
+        """
+        Returns a logical transaction with each value replaced by its raw encoding (see
+        `Signal.encode`), such that it can be loaded and written without conversion.
+        """
         if set(txn.keys()) != self.itf._txn(primary=self.primary):
             raise ValueError(
                 f"{str(self)} expects input format: {str(self.itf._txn(primary=self.primary))}"
             )
 
+        return {k: [self.itf[k].encode(x) for x in v] for k, v in txn.items()}
+
+    async def input(self, txn: Dict[str, Iterable], trig: Awaitable, encoded: bool = False) -> None:
+        """
+        Blocking input call to ingest a[n input] logical transaction.
+
+        Args:
+            encoded: Asserted if `txn` was returned by `self.encode`.
+        """
+
+        if not encoded:
+            txn = self.encode(txn)
+
         self.log.debug(f"{str(self)} received input (txn={txn})")
 
         await self.acquire()
@@ -512,7 +654,8 @@ class BaseModel(
 
         while self.busy:
             await trig
-            await self._event_loop()
+            with ci.profiling.section(self._profiler): # Reactions don't yield to the simulator
+                await self._event_loop()
 
         self.log.debug(f"{str(self)} processed!")
 
@@ -527,26 +670,68 @@ class BaseModel(
         #await ReadOnly() # Stabilize signals prior to sampling
         await self.trigger('advance')
 
-        # TODO: (redd@) Reimplement to consider source (shouldn't error out in beginning of sim w/ lots of undefined signals)
-        if self.state == 'TOP_NULL':
-            raise ci.InterfaceProtocolError(f"Control context invariant was violated")
-
-        # Delete cached values of influences, execute reactions TODO (redd@): revisit
-        # for c in self.get_state(self.state).influences:
-        #     self.itf[c].clear()
-
-        for fn in self.get_state(self.state).reactions:
-            # if fn.smode != ReadOnly:
-            #     await NextTimeStep()
-            #     await fn.smode()
-
-            await fn(self) # TODO: (redd@) fix method binding
+        if self.coverage is not None:
+            self.coverage.visit(self.state)
+        if self.recorder is not None:
+            self.recorder.record(self.state)
+        if self.tracer is not None:
+            now = self.tracer.now()
+            if self._tspan is None or self._tspan[0] != self.state:
+                self._trace_span(now)
+                self._tspan = [self.state, now, 0, 0.0]
+            self._tspan[2] += 1
+            start = time.perf_counter()
+
+        # Writes within the cycle are applied together once reactions complete
+        if self.itf.bundle is not None:
+            self.itf.bundle.hold()
+
+        try:
+            # TODO: (redd@) Reimplement to consider source (shouldn't error out in beginning of sim w/ lots of undefined signals)
+            if self.state == 'TOP_NULL':
+                raise ci.InterfaceProtocolError(f"Control context invariant was violated")
+
+            # Delete cached values of influences, execute reactions TODO (redd@): revisit
+            # for c in self.get_state(self.state).influences:
+            #     self.itf[c].clear()
+
+            for fn in self.get_state(self.state).reactions:
+                # if fn.smode != ReadOnly:
+                #     await NextTimeStep()
+                #     await fn.smode()
+
+                await fn(self) # TODO: (redd@) fix method binding
+
+            if self.tracer is not None:
+                self._tspan[3] += time.perf_counter() - start
+        except ci.InterfaceProtocolError:
+            if self.recorder is not None:
+                self.log.error(self.recorder.format())
+            raise
+        finally:
+            if self.itf.bundle is not None:
+                self.itf.bundle.flush()
 
         self.log.debug(f"{str(self)} looped!")
 
     @abc.abstractmethod
-    def __init__(self, itf: ci.core.BaseInterface, primary: Optional[bool] = None) -> None:
-        """Should be extended by child class."""
+    def __init__(self, itf: ci.core.BaseInterface,
+                 primary: Optional[bool] = None,
+                 coverage: bool = True,
+                 record: int = 1024,
+                 specialize: Optional[str] = None) -> None:
+        """
+        Should be extended by child class.
+
+        Args:
+            specialize: 'on' to replace generic methods with versions specialized to the
+                interface (see `_specialize`), 'off', or 'check' to also compare the effects
+                of each call with the generic version. By default, COCOTBEXT_SPECIALIZE or
+                'on'.
+            coverage: If asserted, collect state/transition coverage (see `ci.coverage`).
+            record: Number of cycles retained by the flight recorder (see `ci.recorder`),
+                dumped upon a protocol error; zero disables.
+        """
 
         ci.Pretty.__init__(self) # Logging
 
@@ -558,14 +743,38 @@ class BaseModel(
 
         self._busy = False
         self._lock = Event(f"{self.__class__.__name__}_busy")
+        self._lock.set() # Model is initially free
 
         self._primary = primary
+        self._label = f"{self.__class__.__name__}.{itf.bus_name}" if itf.bus_name else self.__class__.__name__
         self._buff = {k: collections.deque() for k in self.itf._txn(primary=self.primary)}
+        self._meters = {k: ci.accounting.track(f"{self.label}.buff.{k}", d) for k, d in self._buff.items()}
+
+        # Replace generic methods, reactions with specializations
+        specialize = specialize or os.environ.get(_SPECIALIZE, 'on')
+        if specialize not in ('on', 'off', 'check'):
+            raise ValueError(f"{str(self)} specialize must be 'on', 'off' or 'check', was provided {specialize}")
+        self._specialized = self._specialize() if specialize != 'off' else {}
+        for name, src in self._specialized.items():
+            generic = getattr(type(self), name)
+            fn = functools.update_wrapper(self._compile(name, src), generic) # Incl. reaction attributes
+            if specialize == 'check':
+                fn = functools.update_wrapper(self._checker(name, generic, fn), generic)
+            setattr(self, name, types.MethodType(fn, self))
+
         self._reactions = set(
             d[1].__func__ for d in inspect.getmembers(self, predicate=inspect.ismethod)
             if getattr(d[1].__func__, 'reaction', False)
         )
         self._elaborated = self._elaborate()
+        self._coverage = ci.coverage.Coverage(self.label, self._elaborated) if coverage else None
+        self._recorder = ci.recorder.FlightRecorder(self.label, itf, record) if record else None
+        self._tracer = ci.trace.writer()
+        self._tid = self._tracer.track(self.label) if self._tracer else None
+        self._tspan = None # Current state, first cycle, cycles, time in reactions
+        self._profiler = ci.profiling.profiler(self.label, itf)
+        self._began = None
+        self._acquired = 0
         # TODO: (redd@) Get send_event working
         super().__init__(
             states=self._elaborated,
@@ -0,0 +1,280 @@
+import collections
+import multiprocessing
+import os
+import pickle
+import struct
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+
+import cocotbext.interfaces as ci
+
+try:
+    from multiprocessing import shared_memory
+except ImportError: # Python < 3.8
+    shared_memory = None
+
+
+class Ring(object):
+    """
+    Single-producer, single-consumer ring buffer of byte records over shared memory.
+
+    The buffer starts with a header of two monotonic byte counters, head (written only by
+    the producer) and tail (written only by the consumer), followed by the data area.
+    Records are length-prefixed and may wrap around the end of the data area.
+    """
+
+    _HEADER = struct.Struct('=QQ')
+    _LENGTH = struct.Struct('=I')
+
+    @property
+    def capacity(self) -> int: return self._capacity
+
+    @property
+    def name(self) -> str: return self._shm.name
+
+    def _copy_in(self, pos: int, data: bytes) -> None:
+        off = pos % self._capacity
+        first = min(len(data), self._capacity - off)
+        self._data[off:off + first] = data[:first]
+        self._data[:len(data) - first] = data[first:]
+
+    def _copy_out(self, pos: int, size: int) -> bytes:
+        off = pos % self._capacity
+        first = min(size, self._capacity - off)
+        return bytes(self._data[off:off + first]) + bytes(self._data[:size - first])
+
+    def put(self, record: bytes) -> bool:
+        """Appends a record, returning False if there is not enough free space."""
+        size = self._LENGTH.size + len(record)
+        if size > self._capacity:
+            raise ValueError(f"Record of {len(record)} bytes exceeds ring capacity ({self._capacity})")
+
+        head, tail = self._HEADER.unpack_from(self._shm.buf)
+        if self._capacity - (head - tail) < size:
+            return False
+
+        self._copy_in(head, self._LENGTH.pack(len(record)) + record)
+        struct.pack_into('=Q', self._shm.buf, 0, head + size) # Publish
+        return True
+
+    def get(self) -> Optional[bytes]:
+        """Removes and returns the oldest record, or None if empty."""
+        head, tail = self._HEADER.unpack_from(self._shm.buf)
+        if head == tail:
+            return None
+
+        size, = self._LENGTH.unpack(self._copy_out(tail, self._LENGTH.size))
+        record = self._copy_out(tail + self._LENGTH.size, size)
+        struct.pack_into('=Q', self._shm.buf, 8, tail + self._LENGTH.size + size) # Release
+        return record
+
+    def close(self, unlink: bool = False) -> None:
+        if unlink:
+            self._finalizer()
+            return
+        self._finalizer.detach()
+        self._data.release()
+        self._shm.close()
+
+    @staticmethod
+    def _free(shm, data: memoryview, pid: int) -> None:
+        """Closes the segment, and unlinks it in the creating process (not forked workers)."""
+        data.release()
+        shm.close()
+        if os.getpid() == pid:
+            shm.unlink()
+
+    def __init__(self, capacity: int) -> None:
+        if shared_memory is None:
+            raise RuntimeError(f"{self.__class__.__name__} requires Python >= 3.8")
+
+        self._capacity = capacity
+        self._shm = shared_memory.SharedMemory(create=True, size=self._HEADER.size + capacity)
+        self._HEADER.pack_into(self._shm.buf, 0, 0, 0)
+        self._data = self._shm.buf[self._HEADER.size:]
+        # Unlinked if closed, collected or at exit, whichever is first
+        self._finalizer = weakref.finalize(self, self._free, self._shm, self._data, os.getpid())
+
+
+def _work(fn: Callable, inq: Ring, outq: Ring) -> None:
+    """Worker process loop: apply `fn` to each (seq, txn) record until a None record."""
+    idle = 0
+    while True:
+        record = inq.get()
+        if record is None:
+            idle += 1
+            time.sleep(min(idle, 100) * 1e-5) # Back off while idle
+            continue
+        idle = 0
+
+        item = pickle.loads(record)
+        if item is None:
+            break
+
+        seq, txn = item
+        try:
+            out = pickle.dumps((seq, True, fn(txn)), pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            try:
+                out = pickle.dumps((seq, False, e), pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                out = pickle.dumps((seq, False, RuntimeError(repr(e))), pickle.HIGHEST_PROTOCOL)
+
+        while not outq.put(out):
+            time.sleep(1e-4)
+
+
+class ReferencePipeline(ci.Pretty):
+    """
+    Computes expected outputs of a (golden) reference model in worker processes.
+
+    Stimulus transactions are submitted as they are generated, typically ahead of being
+    driven, and are distributed round-robin to workers over shared-memory rings. Each
+    worker applies `fn`, a picklable (module-level) callable, and returns its result on
+    its own ring. Results are collected in submission order whenever `poll` is called,
+    e.g. each clock cycle by the `pump` coroutine, and appended to `expected`, which may
+    be a scoreboard's expected output list.
+
+    Workers are forked, so they inherit the rings without re-attaching by name.
+
+    Use as a context manager, or `close` when done; otherwise workers are terminated and
+    shared memory is freed when the pipeline is collected or at exit, e.g. after a test
+    fails.
+    """
+
+    @property
+    def expected(self) -> List: return self._expected
+
+    @property
+    def workers(self) -> int: return len(self._procs)
+
+    @property
+    def outstanding(self) -> int:
+        """Number of submitted transactions not yet collected."""
+        return self._submitted - self._collected
+
+    def submit(self, txn: Any) -> None:
+        """Queues a transaction for the reference model; never blocks."""
+        if self._closed:
+            raise RuntimeError(f"{str(self)} is closed")
+
+        seq = self._submitted
+        self._submitted += 1
+        record = pickle.dumps((seq, txn), pickle.HIGHEST_PROTOCOL)
+        i = seq % self.workers
+        if self._overflow[i] or not self._inqs[i].put(record):
+            self._overflow[i].append(record)
+
+    def poll(self) -> int:
+        """Collects available results in order; returns number collected."""
+        for q, overflow in zip(self._inqs, self._overflow):
+            while overflow and q.put(overflow[0]):
+                overflow.popleft()
+
+        n = 0
+        while self._collected < self._submitted:
+            record = self._outqs[self._collected % self.workers].get()
+            if record is None:
+                break
+
+            seq, ok, val = pickle.loads(record)
+            if seq != self._collected:
+                raise RuntimeError(f"{str(self)} expected result {self._collected}, received {seq}")
+            self._collected += 1
+            if not ok:
+                raise val
+            self._expected.append(val)
+            n += 1
+
+        for p in self._procs:
+            if not p.is_alive() and self._collected < self._submitted:
+                raise RuntimeError(f"{str(self)} worker {p.name} exited (code={p.exitcode})")
+        return n
+
+    async def pump(self, trig: Awaitable) -> None:
+        """Polls each time `trig` fires, e.g. a clock edge; should be forked."""
+        while not self._closed:
+            await trig
+            self.poll()
+
+    async def join(self, trig: Awaitable) -> None:
+        """Blocking call to wait for all submitted transactions to be collected."""
+        while self.outstanding:
+            self.poll()
+            if self.outstanding:
+                await trig
+
+    def close(self) -> None:
+        """Stops workers and frees shared memory; outstanding results are discarded."""
+        if self._closed:
+            return
+        self._closed = True
+
+        # Outstanding work is discarded, so workers don't block on full output rings
+        stop = pickle.dumps(None)
+        for inq, outq, overflow, p in zip(self._inqs, self._outqs, self._overflow, self._procs):
+            overflow.append(stop)
+            while p.is_alive():
+                while overflow and inq.put(overflow[0]):
+                    overflow.popleft()
+                outq.get()
+                p.join(timeout=1e-3)
+
+        self._finalizer()
+
+    @staticmethod
+    def _release(procs: List[multiprocessing.Process], rings: List[Ring], pid: int) -> None:
+        """Terminates any running workers and frees the rings."""
+        if os.getpid() != pid:
+            return
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+                p.join(timeout=1)
+        for q in rings:
+            q.close(unlink=True)
+
+    def __enter__(self) -> 'ReferencePipeline':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __init__(self, fn: Callable[[Any], Any],
+                 expected: Optional[List] = None,
+                 workers: Optional[int] = None,
+                 capacity: int = 1 << 22) -> None:
+        """
+        Args:
+            fn: Reference model, mapping a stimulus transaction to its expected output.
+            expected: List to which expected outputs are appended.
+            workers: Number of worker processes; by default, one per spare core.
+            capacity: Size of each ring buffer, in bytes.
+        """
+        super().__init__()
+
+        workers = workers if workers is not None else max((os.cpu_count() or 2) - 1, 1)
+        if workers < 1:
+            raise ValueError(f"Pipeline requires at least one worker, was provided {workers}")
+
+        self._expected = expected if expected is not None else []
+        self._submitted = 0
+        self._collected = 0
+        self._closed = False
+        self._inqs = [Ring(capacity) for _ in range(workers)]
+        self._outqs = [Ring(capacity) for _ in range(workers)]
+        self._overflow: List[Deque[bytes]] = [collections.deque() for _ in range(workers)]
+
+        ctx = multiprocessing.get_context('fork')
+        self._procs = [
+            ctx.Process(target=_work, args=(fn, i, o), name=f"{getattr(fn, '__name__', 'worker')}_{n}", daemon=True)
+            for n, (i, o) in enumerate(zip(self._inqs, self._outqs))
+        ]
+        self._finalizer = weakref.finalize(
+            self, self._release, self._procs, self._inqs + self._outqs, os.getpid()
+        )
+        for p in self._procs:
+            p.start()
+
+        self.log.debug(f"New {str(self)} with {workers} workers")
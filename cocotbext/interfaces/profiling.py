@@ -0,0 +1,198 @@
+import atexit
+import contextlib
+import cProfile
+import fnmatch
+import os
+import re
+from typing import List, Optional, Tuple
+
+from cocotb.utils import get_sim_steps, get_sim_time
+
+import cocotbext.interfaces as ci
+
+_WINDOWS = 'COCOTBEXT_PROFILE_WINDOWS'
+_UNITS = 'COCOTBEXT_PROFILE_UNITS'
+_TXNS = 'COCOTBEXT_PROFILE_TXNS'
+_DIR = 'COCOTBEXT_PROFILE_DIR'
+_MODELS = 'COCOTBEXT_PROFILE_MODELS'
+_NULL = contextlib.nullcontext()
+_active = None  # Only one profiler may be enabled at a time
+
+
+def parse_windows(spec: str) -> List[Tuple[float, float]]:
+    """Parses 'start-stop[,start-stop...]', e.g. '1000-2000,5000-6000'; stop may be omitted."""
+    out = []
+    for w in filter(None, (s.strip() for s in spec.split(','))):
+        m = re.fullmatch(r"([\d.]+)\s*-\s*([\d.]*)", w)
+        if m is None:
+            raise ValueError(f"Invalid profiling window ({w})")
+        start, stop = float(m.group(1)), float(m.group(2)) if m.group(2) else float('inf')
+        if stop <= start:
+            raise ValueError(f"Profiling window must end after it starts ({w})")
+        out.append((start, stop))
+    return sorted(out)
+
+
+def parse_txns(spec: str) -> Tuple[int, Optional[int]]:
+    """Parses 'after[:count]', e.g. '1000:500' for the 1001st to 1500th transactions."""
+    m = re.fullmatch(r"(\d+)(?::(\d+))?", spec.strip())
+    if m is None:
+        raise ValueError(f"Invalid profiling transaction range ({spec})")
+    return int(m.group(1)), int(m.group(2)) if m.group(2) else None
+
+
+class WindowProfiler(ci.Pretty):
+    """
+    Runs cProfile over a model's cycles (and its adapters' transaction handling), but only
+    within windows of simulation time or of the model's transactions; each window is
+    written to a separate pstats file, named for the model and interface.
+
+    Enter (as a context manager) around work to be attributed to the model; outside of
+    windows, this only costs a check of the time and transaction count. Nested entries,
+    including of other models' profilers, are attributed to the outermost.
+    """
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def windows(self) -> List[Tuple[int, int]]:
+        """Simulation time windows, in steps."""
+        return self._windows
+
+    @property
+    def txns(self) -> Optional[Tuple[int, Optional[int]]]:
+        """Transactions (after, count) profiled, if any."""
+        return self._txns
+
+    @property
+    def released(self) -> int:
+        """Number of transactions the model has completed."""
+        return self._released
+
+    @property
+    def files(self) -> List[str]:
+        """Profiles written so far."""
+        return self._files
+
+    def release(self) -> None:
+        """Counts a completed transaction."""
+        self._released += 1
+
+    def _window(self) -> Optional[str]:
+        """Returns the tag of the current window, if any."""
+        if self._txns is not None:
+            after, count = self._txns
+            if self._released >= after and (count is None or self._released < after + count):
+                return f"txn{after}-{after + count if count is not None else 'end'}"
+
+        if self._windows:
+            now = get_sim_time()
+            while self._next < len(self._windows) and self._windows[self._next][1] <= now:
+                self._next += 1  # Windows are sorted; skip those already passed
+            if self._next < len(self._windows) and now >= self._windows[self._next][0]:
+                start, stop = self._bounds[self._next]
+                end = 'end' if stop == float('inf') else f"{stop:g}{self._units}"
+                return f"t{start:g}{self._units}-{end}"
+        return None
+
+    def dump(self) -> Optional[str]:
+        """Writes the current window's profile, if any; returns its path."""
+        if self._profile is None:
+            return None
+        path = os.path.join(self._dir, f"{self._name}.{self._tag}.prof")
+        self._profile.dump_stats(path)
+        self._files.append(path)
+        self.log.info(f"{str(self)} wrote profile of window {self._tag}: {path}")
+        self._profile = None
+        self._tag = None
+        return path
+
+    def __enter__(self) -> 'WindowProfiler':
+        global _active
+        self._depth += 1
+        if self._depth > 1 or _active is not None:
+            return self  # Nested, e.g. a monitor callback driving another model
+
+        tag = self._window()
+        if tag != self._tag:
+            self.dump()
+            if tag is not None:
+                self._tag = tag
+                self._profile = cProfile.Profile()
+        if self._profile is not None:
+            self._profile.enable()
+            _active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        self._depth -= 1
+        if not self._depth and _active is self:
+            self._profile.disable()
+            _active = None
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}({self._name})>"
+
+    def __init__(self, name: str,
+                 windows: Optional[List[Tuple[float, float]]] = None,
+                 txns: Optional[Tuple[int, Optional[int]]] = None,
+                 units: str = 'ns',
+                 directory: str = '.') -> None:
+        """
+        Args:
+            name: Names the profiles written, e.g. the model and interface.
+            windows: Simulation time (start, stop) windows, in `units`.
+            txns: Profile the model's transactions after the first `after`, for `count`
+                transactions (by default, until the end of simulation).
+            directory: Where profiles are written.
+        """
+        super().__init__()
+
+        self._name = name
+        self._units = units
+        self._bounds = sorted(windows or [])
+        self._windows = [
+            (get_sim_steps(start, units), stop if stop == float('inf') else get_sim_steps(stop, units))
+            for start, stop in self._bounds
+        ]
+        self._txns = txns
+        self._dir = directory
+        self._next = 0
+        self._released = 0
+        self._depth = 0
+        self._tag = None
+        self._profile = None
+        self._files = []
+
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.dump)
+
+
+def profiler(label: str, itf: ci.core.BaseInterface) -> Optional[WindowProfiler]:
+    """
+    Returns a `WindowProfiler` for a model, if profiling is configured:
+        COCOTBEXT_PROFILE_WINDOWS: Simulation time windows, e.g. '1000-2000,5000-'.
+        COCOTBEXT_PROFILE_UNITS: Units of windows, by default 'ns'.
+        COCOTBEXT_PROFILE_TXNS: Transactions of each model, e.g. '1000:500' (see `parse_txns`).
+        COCOTBEXT_PROFILE_DIR: Where profiles are written, by default the working directory.
+        COCOTBEXT_PROFILE_MODELS: Pattern of model labels to profile, e.g. 'SourceModel.*'.
+    """
+    windows, txns = os.environ.get(_WINDOWS), os.environ.get(_TXNS)
+    if not (windows or txns):
+        return None
+    if not fnmatch.fnmatchcase(label, os.environ.get(_MODELS, '*')):
+        return None
+    return WindowProfiler(
+        f"{label}.{itf.__class__.__name__}",
+        windows=parse_windows(windows) if windows else None,
+        txns=parse_txns(txns) if txns else None,
+        units=os.environ.get(_UNITS, 'ns'),
+        directory=os.environ.get(_DIR, '.'),
+    )
+
+
+def section(prof: Optional[WindowProfiler]):
+    """Returns `prof`, or a reusable no-op context if None."""
+    return _NULL if prof is None else prof
@@ -0,0 +1,168 @@
+import array
+import functools
+import logging
+import weakref
+from typing import Callable, Dict, List, Optional
+
+from cocotb.result import TestSuccess
+from cocotb.utils import get_sim_time
+
+import cocotbext.interfaces as ci
+
+_LOG = ci.log(__name__, logging.INFO)
+
+_registry = [] # Weak references, oldest first
+
+# Two bits per control: 0, 1, X, Z
+_CODES = str.maketrans({'0': '00', '1': '01', 'x': '10', 'X': '10', 'z': '11', 'Z': '11'})
+_VALUES = '01XZ'
+
+
+class FlightRecorder(ci.Pretty):
+    """
+    Always-on trace of a behavioral model's last `depth` cycles.
+
+    Each cycle, the raw values of the interface's (instantiated) controls are packed, two
+    bits each, into a fixed-size ring of words, alongside the simulation time and an index
+    of the model's state. Nothing is decoded until the trace is dumped, e.g. upon an
+    `InterfaceProtocolError` or a test failure (see `dump_on_failure`).
+    """
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def depth(self) -> int: return self._depth
+
+    @property
+    def controls(self) -> List[str]: return [c.name for c in self._controls]
+
+    @property
+    def cycles(self) -> int:
+        """Number of cycles recorded, including those overwritten."""
+        return self._count
+
+    def record(self, state: str) -> None:
+        """Record the current cycle, in which the model is in `state`."""
+        idx = self._index.get(state)
+        if idx is None:
+            idx = self._index[state] = len(self._states)
+            self._states.append(state)
+
+        slot = self._count % self._depth
+        self._count += 1
+        self._times[slot] = get_sim_time()
+        self._sidx[slot] = idx
+
+        bits = ''.join(c.handle.value.binstr[-1] for c in self._controls).translate(_CODES)
+        packed = int(bits, 2) if bits else 0
+        base = slot * self._words
+        for w in range(self._words):
+            self._ctrl[base + w] = packed & 0xFFFFFFFFFFFFFFFF
+            packed >>= 64
+
+    def clear(self) -> None:
+        self._count = 0
+
+    def dump(self, n: Optional[int] = None) -> List[Dict]:
+        """Returns the last `n` (by default, all retained) cycles, oldest first."""
+        kept = min(self._count, self._depth)
+        n = kept if n is None else min(n, kept)
+        nctrl = len(self._controls)
+
+        out = []
+        for i in range(self._count - n, self._count):
+            slot = i % self._depth
+            base = slot * self._words
+            packed = 0
+            for w in reversed(range(self._words)):
+                packed = (packed << 64) | self._ctrl[base + w]
+            out.append({
+                'cycle': i,
+                'time': self._times[slot],
+                'state': self._states[self._sidx[slot]],
+                'controls': {
+                    c.name: _VALUES[(packed >> (2 * (nctrl - 1 - k))) & 3]
+                    for k, c in enumerate(self._controls)
+                },
+            })
+        return out
+
+    def format(self, n: Optional[int] = None) -> str:
+        """Returns the last `n` cycles as a table."""
+        names = self.controls
+        lines = [f"{str(self)} last {min(n or self._depth, self._count, self._depth)} of {self._count} cycles:"]
+        lines.append(' '.join([f"{'cycle':>10}", f"{'time':>14}"] + names + ['state']))
+        for r in self.dump(n):
+            vals = [f"{r['controls'][k]:>{len(k)}}" for k in names]
+            lines.append(' '.join([f"{r['cycle']:>10}", f"{r['time']:>14}"] + vals + [r['state']]))
+        return '\n'.join(lines)
+
+    def __init__(self, name: str, itf: ci.core.BaseInterface, depth: int = 1024,
+                 register: bool = True) -> None:
+        """
+        Args:
+            name: Name under which the trace is dumped.
+            depth: Number of cycles retained.
+            register: If asserted, include in `dump_all`.
+        """
+        super().__init__()
+
+        if depth < 1:
+            raise ValueError(f"Recorder depth must be positive, was provided {depth}")
+
+        self._name = name
+        self._depth = depth
+        self._controls = sorted(c for c in itf.controls if c.instantiated)
+        self._words = max((2 * len(self._controls) + 63) // 64, 1)
+        self._ctrl = array.array('Q', bytes(8 * depth * self._words))
+        self._times = array.array('Q', bytes(8 * depth))
+        self._sidx = array.array('H', bytes(2 * depth))
+        self._states = []
+        self._index = {}
+        self._count = 0
+
+        if register:
+            _registry.append(weakref.ref(self))
+
+
+def recorders() -> List[FlightRecorder]:
+    """Returns the registered recorders still alive, oldest first."""
+    alive = [r() for r in _registry]
+    _registry[:] = [ref for ref, r in zip(_registry, alive) if r is not None]
+    return [r for r in alive if r is not None]
+
+
+def dump_all(n: Optional[int] = None, rs: Optional[List[FlightRecorder]] = None) -> str:
+    """
+    Returns the last `n` cycles of all registered recorders (or `rs`), e.g. for logging
+    upon a test failure.
+    """
+    return '\n'.join(r.format(n) for r in (recorders() if rs is None else rs) if r.cycles)
+
+
+def dump_on_failure(n: Optional[int] = None) -> Callable:
+    """
+    Decorator for cocotb test coroutines; if the test fails (including by raising a
+    scoreboard result), logs the last `n` cycles of each recorder that recorded during
+    it before re-raising, e.g.
+
+        @cocotb.test()
+        @ci.recorder.dump_on_failure(64)
+        async def test(dut): ...
+    """
+    def decorator(test: Callable) -> Callable:
+        @functools.wraps(test)
+        async def wrapper(*args, **kwargs):
+            before = weakref.WeakKeyDictionary((r, r.cycles) for r in recorders())
+            try:
+                return await test(*args, **kwargs)
+            except TestSuccess:
+                raise
+            except Exception:
+                active = [r for r in recorders() if r.cycles != before.get(r, 0)]
+                if active:
+                    _LOG.error(f"{test.__name__} failed; flight recorders:\n{dump_all(n, active)}")
+                raise
+        return wrapper
+    return decorator
@@ -62,6 +62,23 @@ class Signal(ci.Pretty):
     def logical_type(self):
         return self._logical_type
 
+    @property
+    def width(self) -> int:
+        """Width of the signal, per lane."""
+        return len(self.handle) // self.lanes
+
+    @property
+    def lanes(self) -> int:
+        return self._lanes
+
+    @lanes.setter
+    def lanes(self, val: int):
+        if self.instantiated:
+            raise AttributeError(f"Cannot set lanes of instantiated Signal ({str(self)})")
+        if val < 1:
+            raise ValueError(f"Signal ({str(self)}) lanes must be positive")
+        self._lanes = val
+
     # Read-Write
     @property
     def handle(self):
@@ -69,15 +86,27 @@ class Signal(ci.Pretty):
 
     @handle.setter
     def handle(self, val: c.handle.SimHandleBase):
-        if not len(val) in self.widths:
+        width, rem = divmod(len(val), self.lanes)
+        if rem or width not in self.widths:
             raise ci.InterfacePropertyError(
                 f"Invalid width ({len(val)}) for {str(val)}"
+                + (f" with {self.lanes} lanes" if self.lanes > 1 else "")
             )
 
         self._handle = val
 
         self.log.debug(f"{str(self)} set handle: {repr(val)}")
 
+    @property
+    def bundle(self) -> Optional['DriveBundle']:
+        return self._bundle
+
+    @bundle.setter
+    def bundle(self, val: Optional['DriveBundle']):
+        if self._bundle is not None:
+            self._bundle.forget(self)
+        self._bundle = val
+
     @property
     def filter(self):
         return self._filter
@@ -112,7 +141,11 @@ class Signal(ci.Pretty):
         self.log.debug(f"{str(self)} captured sample: {repr(val)}")
         return val
 
-    def drive(self, val: _allowed) -> None:
+    def encode(self, val: _allowed) -> Union[int, BinaryValue]:
+        """
+        Returns the raw value which drives `val` onto the signal, for use with `write`.
+        Unresolvable `BinaryValue`s are returned as such.
+        """
         if not self.instantiated:
             raise AttributeError(f"Signal ({str(self)}) not instantiated")
 
@@ -131,9 +164,20 @@ class Signal(ci.Pretty):
             else:  # Valid for bool and int
                 val = ~val & len(self.handle)
 
-        val = val if self.logical_type != bool else int(val)
-        self.handle <= val
-        self.log.debug(f"{str(self)} driven to: {repr(val)}")
+        if isinstance(val, BinaryValue):
+            return val.integer if val.is_resolvable else val
+        return int(val)
+
+    def write(self, raw: Union[int, BinaryValue]) -> None:
+        """Drives a value previously returned by `encode`, through `bundle` if set."""
+        if self._bundle is not None:
+            self._bundle.write(self, raw)
+        else:
+            self.handle <= raw
+        self.log.debug(f"{str(self)} driven to: {repr(raw)}")
+
+    def drive(self, val: _allowed) -> None:
+        self.write(self.encode(val))
 
     def __init__(self,
                  name: str, *args,
@@ -176,11 +220,141 @@ class Signal(ci.Pretty):
         self._logical_type = logical_type
         self._handle = None
         self._filter = None
+        self._bundle = None
+        self._lanes = 1
 
         self.log.debug(f"New {repr(self)}")
 
 
 
+class CreditTracker(object):
+    """
+    Shift register of a `Control`'s recent samples, updated once per cycle.
+
+    Bit k of the register holds the sample from k cycles ago. The tracker's value is
+    asserted if any sample within the window [`lo`, `hi`] cycles ago was asserted, e.g.
+    a transfer on an AvalonST interface is permitted only if ready was asserted between
+    readyAllowance and readyLatency cycles before.
+    """
+
+    __slots__ = ('_lo', '_hi', '_hist', '_keep', '_window', '_upcoming')
+
+    @property
+    def lo(self) -> int: return self._lo
+
+    @property
+    def hi(self) -> int: return self._hi
+
+    @property
+    def value(self) -> bool:
+        """Asserted if any sample within the window was asserted."""
+        return bool(self._hist & self._window)
+
+    @property
+    def upcoming(self) -> bool:
+        """
+        As `value`, for the following cycle. Unknown (so asserted) if the window includes
+        the following cycle's sample, i.e. `lo` is zero.
+        """
+        return not self._lo or bool(self._hist & self._upcoming)
+
+    def tick(self, val: bool) -> None:
+        """Shift in the current cycle's sample."""
+        self._hist = ((self._hist << 1) | val) & self._keep
+
+    def clear(self) -> None:
+        self._hist = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(lo={self._lo}, hi={self._hi}, hist={self._hist:b})>"
+
+    def __init__(self, lo: int, hi: int) -> None:
+        if not hi >= lo >= 0:
+            raise ValueError(f"Invalid window [{lo}, {hi}]")
+        self._lo = lo
+        self._hi = hi
+        self._keep = (1 << (hi + 1)) - 1
+        self._window = self._keep & ~((1 << lo) - 1)
+        self._upcoming = self._window >> 1
+        self._hist = 0
+
+
+class DriveBundle(object):
+    """
+    Collects an interface's signal writes within a cycle (see `hold`), then applies them
+    together on `flush`, skipping any value unchanged since that signal was last written.
+
+    Outside of `hold`, writes are applied immediately, but still elided. Values are compared
+    as raw encodings (see `Signal.encode`); unresolvable `BinaryValue`s are always written.
+    If a signal may also be driven otherwise (e.g. directly by a test), `forget` it.
+    """
+
+    __slots__ = ('_last', '_staged', '_depth', '_written', '_elided')
+
+    @property
+    def written(self) -> int:
+        """Number of writes applied."""
+        return self._written
+
+    @property
+    def elided(self) -> int:
+        """Number of writes skipped as redundant."""
+        return self._elided
+
+    def write(self, sig: Signal, raw: Union[int, BinaryValue]) -> None:
+        if self._depth:
+            self._staged[sig] = raw # Last write within the cycle wins
+        else:
+            self._apply(sig, raw)
+
+    def _apply(self, sig: Signal, raw: Union[int, BinaryValue]) -> None:
+        if isinstance(raw, int):
+            if self._last.get(sig) == raw:
+                self._elided += 1
+                return
+            self._last[sig] = raw
+        else:
+            self._last.pop(sig, None)
+        sig.handle <= raw
+        self._written += 1
+
+    def hold(self) -> None:
+        """Stage writes until the matching `flush`; may be nested."""
+        self._depth += 1
+
+    def flush(self) -> None:
+        """Ends a `hold`; if outermost, applies the staged writes."""
+        self._depth = max(self._depth - 1, 0)
+        if not self._depth and self._staged:
+            staged, self._staged = self._staged, {}
+            for sig, raw in staged.items():
+                self._apply(sig, raw)
+
+    def forget(self, sig: Optional[Signal] = None) -> None:
+        """Forgets the last value written to `sig` (by default, all), so it is rewritten."""
+        if sig is None:
+            self._last.clear()
+        else:
+            self._last.pop(sig, None)
+
+    def __enter__(self) -> 'DriveBundle':
+        self.hold()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(written={self._written}, elided={self._elided})>"
+
+    def __init__(self) -> None:
+        self._last = {}
+        self._staged = {}
+        self._depth = 0
+        self._written = 0
+        self._elided = 0
+
+
 @functools.total_ordering
 class Control(Signal):
     """
@@ -238,6 +412,18 @@ class Control(Signal):
         self._precedence = val
         self.log.debug(f"{str(self)} set precedence: {val}")
 
+    @property
+    def tracker(self) -> Optional[CreditTracker]:
+        """If set, samples are resolved through this tracker (see `capture`)."""
+        return self._tracker
+
+    @tracker.setter
+    def tracker(self, val: Optional[CreditTracker]):
+        if val is not None and not self.instantiated:
+            raise AttributeError(f"Cannot track non-instantiated Control signal")
+        self._tracker = val
+        self.log.debug(f"{str(self)} set tracker: {repr(val)}")
+
     @property
     def generator(self):
         return self._generator
@@ -257,13 +443,20 @@ class Control(Signal):
         except Exception as e:
             raise e  # TODO: (redd@) Do this better
 
-    def capture(self) -> bool:
+    def sample(self) -> bool:
+        """Returns the current value of the signal (or generator)."""
         if not self.generated:
             return super().capture()
         if self._cache is None:
             self.drive(self.next())
         return self._cache
 
+    def capture(self) -> bool:
+        """Returns the behavioral value: `tracker.value` if tracked, else `sample`."""
+        if self._tracker is not None:
+            return self._tracker.value
+        return self.sample()
+
     def drive(self, val: bool) -> None:
         if self.generated:
             self._cache = val
@@ -310,8 +503,9 @@ class Control(Signal):
         self._max_latency = max_latency
 
         self._generator = None
+        self._tracker = None
         self._flow_vals = flow_vals if flow_vals else {True}
-        self._fix_vals = fix_vals if fix_vals else {False}
+        self._fix_vals = fix_vals if fix_vals is not None else {False}
 
         self._allowance = 0
         self._latency = 0
@@ -0,0 +1,149 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+from cocotb.utils import get_sim_time, get_time_from_sim_steps
+
+import cocotbext.interfaces as ci
+
+_ENV = 'COCOTBEXT_TRACE_FILE'
+_writer = None
+
+
+class TraceWriter(ci.Pretty):
+    """
+    Streams events to a Chrome Trace Event (JSON array) file, viewable in Perfetto or
+    chrome://tracing.
+
+    Events are queued as tuples and serialized, in chunks, by a background thread. The
+    queue is bounded: if it is full, events are dropped (and counted) rather than stalling
+    the simulation. Simulation time in `units` is written as trace microseconds, so
+    timeline labels read in `units`. Each named track (e.g. a model) is a trace thread.
+    """
+
+    _CHUNK = 4096
+
+    @property
+    def path(self) -> str: return self._path
+
+    @property
+    def units(self) -> str: return self._units
+
+    @property
+    def dropped(self) -> int: return self._dropped
+
+    def now(self) -> float:
+        """Returns the current simulation time, on the trace clock."""
+        return get_sim_time(self._units)
+
+    def time(self, steps: int) -> float:
+        """Returns a simulation time in steps, on the trace clock."""
+        return get_time_from_sim_steps(steps, self._units)
+
+    def track(self, name: str) -> int:
+        """Returns the id of a named track, creating it if needed."""
+        tid = self._tracks.get(name)
+        if tid is None:
+            tid = self._tracks[name] = len(self._tracks) + 1
+            self._queue.put(('M', 'thread_name', None, tid, 0, None, {'name': name})) # Never dropped
+        return tid
+
+    def complete(self, name: str, cat: str, tid: int, ts: float, dur: float,
+                 args: Optional[Dict] = None) -> None:
+        """Emits an interval event."""
+        self._put(('X', name, cat, tid, ts, dur, args))
+
+    def instant(self, name: str, cat: str, tid: int, ts: float, args: Optional[Dict] = None) -> None:
+        """Emits an instantaneous event."""
+        self._put(('i', name, cat, tid, ts, None, args))
+
+    def _put(self, event: tuple) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._dropped += 1
+
+    @staticmethod
+    def _format(event: tuple) -> str:
+        ph, name, cat, tid, ts, dur, args = event
+        out = {'ph': ph, 'name': name, 'pid': os.getpid(), 'tid': tid, 'ts': ts}
+        if cat is not None:
+            out['cat'] = cat
+        if dur is not None:
+            out['dur'] = dur
+        if ph == 'i':
+            out['s'] = 't'
+        if args:
+            out['args'] = args
+        return json.dumps(out, default=str)
+
+    def _run(self) -> None:
+        """Background thread: writes queued events until a None event."""
+        done = False
+        while not done:
+            chunk = [self._queue.get()]
+            while len(chunk) < self._CHUNK:
+                try:
+                    chunk.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in chunk:
+                del chunk[chunk.index(None):]
+                done = True
+            if chunk:
+                self._file.write(''.join(f",\n{self._format(e)}" for e in chunk))
+                self._file.flush()
+
+    def close(self) -> None:
+        """Writes remaining events and closes the file."""
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        if self._dropped:
+            self.log.warning(f"{str(self)} dropped {self._dropped} events")
+        self._file.write("\n]\n")
+        self._file.close()
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}({self._path})>"
+
+    def __init__(self, path: str, units: str = 'ns', capacity: int = 1 << 16) -> None:
+        """
+        Args:
+            path: Output file.
+            units: Simulation time units written as trace microseconds.
+            capacity: Maximum number of queued events.
+        """
+        super().__init__()
+
+        self._path = path
+        self._units = units
+        self._dropped = 0
+        self._tracks = {}
+        self._queue = queue.Queue(capacity)
+        self._file = open(path, 'w')
+        self._file.write("[\n" + self._format(('M', 'process_name', None, 0, 0, None, {'name': 'cocotb'})))
+        self._thread = threading.Thread(target=self._run, name=str(self), daemon=True)
+        self._thread.start()
+
+
+def enable(path: str, **kwargs) -> TraceWriter:
+    """Creates the shared `TraceWriter`, closed at exit; see `TraceWriter.__init__`."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+    _writer = TraceWriter(path, **kwargs)
+    atexit.register(_writer.close)
+    return _writer
+
+
+def writer() -> Optional[TraceWriter]:
+    """Returns the shared `TraceWriter`, if enabled (e.g. by setting COCOTBEXT_TRACE_FILE)."""
+    if _writer is None and os.environ.get(_ENV):
+        enable(os.environ[_ENV])
+    return _writer
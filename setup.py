@@ -10,6 +10,9 @@ setup(
         'transitions[diagrams]',
         'cocotb @ git+https://github.com/potentialventures/cocotb@master#egg=cocotb==1.4.*',
     ],
+    extras_require = {
+        'numpy': ['numpy>=1.17'],
+    },
     python_requires = '>=3.7',
     classifiers = [
         "Programming Language :: Python :: 3",
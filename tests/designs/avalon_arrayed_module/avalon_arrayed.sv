@@ -0,0 +1,37 @@
+module avalon_arrayed #(
+    parameter LANES = 4
+) (
+    input wire clk,
+    input wire reset,
+
+    input wire logic[LANES-1:0] asi_valid,
+    input wire logic[16*LANES-1:0] asi_data,
+    input wire logic[LANES-1:0] asi_startofpacket,
+    input wire logic[LANES-1:0] asi_endofpacket,
+    input wire logic[LANES-1:0] asi_empty,
+    input wire logic[2*LANES-1:0] asi_channel,
+    output logic[LANES-1:0] asi_ready,
+
+    output logic[LANES-1:0] aso_valid,
+    output logic[16*LANES-1:0] aso_data,
+    output logic[LANES-1:0] aso_startofpacket,
+    output logic[LANES-1:0] aso_endofpacket,
+    output logic[LANES-1:0] aso_empty,
+    output logic[2*LANES-1:0] aso_channel,
+    input wire logic[LANES-1:0] aso_ready
+);
+
+assign asi_ready = aso_ready;
+assign aso_valid = asi_valid;
+assign aso_data = asi_data;
+assign aso_startofpacket = asi_startofpacket;
+assign aso_endofpacket = asi_endofpacket;
+assign aso_empty = asi_empty;
+assign aso_channel = asi_channel;
+
+initial begin
+     $dumpfile("waveform.vcd");
+     $dumpvars;
+end
+
+endmodule : avalon_arrayed
@@ -0,0 +1,44 @@
+// Connects an Avalon-MM master (avm) directly to a slave (avs), so that a master
+// driver can be tested against a slave model.
+module avalon_mm (
+    input wire clk,
+    input wire reset,
+
+    input wire logic[15:0] avm_address,
+    input wire logic avm_read,
+    input wire logic avm_write,
+    input wire logic[31:0] avm_writedata,
+    input wire logic[3:0] avm_byteenable,
+    input wire logic[3:0] avm_burstcount,
+    output logic[31:0] avm_readdata,
+    output logic avm_readdatavalid,
+    output logic avm_waitrequest,
+
+    output logic[15:0] avs_address,
+    output logic avs_read,
+    output logic avs_write,
+    output logic[31:0] avs_writedata,
+    output logic[3:0] avs_byteenable,
+    output logic[3:0] avs_burstcount,
+    input wire logic[31:0] avs_readdata,
+    input wire logic avs_readdatavalid,
+    input wire logic avs_waitrequest
+);
+
+assign avs_address = avm_address;
+assign avs_read = avm_read;
+assign avs_write = avm_write;
+assign avs_writedata = avm_writedata;
+assign avs_byteenable = avm_byteenable;
+assign avs_burstcount = avm_burstcount;
+
+assign avm_readdata = avs_readdata;
+assign avm_readdatavalid = avs_readdatavalid;
+assign avm_waitrequest = avs_waitrequest;
+
+initial begin
+     $dumpfile("waveform.vcd");
+     $dumpvars;
+end
+
+endmodule : avalon_mm
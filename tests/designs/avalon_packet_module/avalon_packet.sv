@@ -0,0 +1,35 @@
+module avalon_packet (
+    input wire clk,
+    input wire reset,
+
+    input wire logic asi_valid,
+    input wire logic[31:0] asi_data,
+    input wire logic asi_startofpacket,
+    input wire logic asi_endofpacket,
+    input wire logic[1:0] asi_empty,
+    input wire logic[1:0] asi_channel,
+    output logic asi_ready,
+
+    output logic aso_valid,
+    output logic[31:0] aso_data,
+    output logic aso_startofpacket,
+    output logic aso_endofpacket,
+    output logic[1:0] aso_empty,
+    output logic[1:0] aso_channel,
+    input wire logic aso_ready
+);
+
+assign asi_ready = aso_ready;
+assign aso_valid = asi_valid;
+assign aso_data = asi_data;
+assign aso_startofpacket = asi_startofpacket;
+assign aso_endofpacket = asi_endofpacket;
+assign aso_empty = asi_empty;
+assign aso_channel = asi_channel;
+
+initial begin
+     $dumpfile("waveform.vcd");
+     $dumpvars;
+end
+
+endmodule : avalon_packet
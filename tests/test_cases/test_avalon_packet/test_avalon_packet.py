@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""Test of avalon streaming packets, with channel and empty signals, through a pass-through"""
+
+import random
+
+import cocotb as c
+import cocotb.clock as cc
+import cocotb.triggers as ct
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon.streaming as cias
+
+MAX_CHANNEL = 3
+
+
+class AvalonPacketTB(ci.Pretty):
+    """Testbench for avalon packet stream"""
+    def __init__(self, dut, latency=None, interleaved=False, **kwargs):
+        super().__init__()
+        self.dut = dut
+        self.clkedge = ct.RisingEdge(dut.clk)
+
+        # Interleaved beats are driven directly, and received per channel
+        self.st_source = None if interleaved else cias.ChannelizedDriver(
+            self.dut, bus_name="asi", max_channel=MAX_CHANNEL, latency=latency, **kwargs)
+        self.st_sink = cias.StreamingMonitor(self.dut, bus_name="aso", max_channel=MAX_CHANNEL,
+                                             latency=latency, interleaved=interleaved)
+        self.received = []
+        if not interleaved:
+            self.st_sink.add_callback(self.received.append)
+
+        self.log.info(f"New testbench: {str(self)} ")
+
+    async def initialise(self):
+        self.dut.aso_ready <= 1
+        for name in ('valid', 'data', 'startofpacket', 'endofpacket', 'empty', 'channel'):
+            getattr(self.dut, f"asi_{name}") <= 0
+        c.fork(cc.Clock(self.dut.clk, 2).start())
+        self.dut.reset <= 1
+        await ct.ClockCycles(self.dut.clk, 10)
+        self.dut.reset <= 0
+        await ct.ClockCycles(self.dut.clk, 10)
+        self.log.info(f"Initialized")
+
+    async def wait_for(self, n):
+        while len(self.received) < n:
+            await self.clkedge
+
+
+def packet(channel=None):
+    return cias.Packet(32, [random.getrandbits(32) for _ in range(random.randint(1, 10))], channel=channel)
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+@ci.accounting.report()
+async def test_channelized(dut):
+    """Back-to-back packets on several channels each arrive intact, in order per channel"""
+
+    tb = AvalonPacketTB(dut)
+    await tb.initialise()
+
+    sent = [packet(random.randint(0, MAX_CHANNEL)) for _ in range(40)]
+    for p in sent:
+        tb.st_source.append(p)
+    await tb.wait_for(len(sent))
+
+    for ch in range(MAX_CHANNEL + 1):
+        assert [p for p in tb.received if p.channel == ch] == [p for p in sent if p.channel == ch]
+    assert tb.st_source.sent == [sum(p.channel == ch for p in sent) for ch in range(MAX_CHANNEL + 1)]
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_weighted(dut):
+    """With all channels requesting, grants follow the weights, and sends are fair relative to them"""
+
+    weights = [4, 2, 1, 1]
+    tb = AvalonPacketTB(dut, arbiter='weighted', weights=weights)
+    await tb.initialise()
+
+    # Packets of equal length, in proportion to the weights, are all queued before any is sent
+    sent = [cias.Packet(32, [random.getrandbits(32) for _ in range(4)], channel=ch)
+            for ch, w in enumerate(weights) for _ in range(3 * w)]
+    for p in sent:
+        tb.st_source.append(p)
+    await tb.wait_for(len(sent))
+
+    ref = ci.arbiters.arbiter('weighted', len(weights), weights)
+    left = [3 * w for w in weights]
+    expected = []
+    while any(left):
+        ch = ref.choose([i for i, n in enumerate(left) if n])
+        left[ch] -= 1
+        expected.append(ch)
+    assert [p.channel for p in tb.received] == expected
+    assert tb.st_source.arbiter.grants == ref.grants
+    assert tb.st_source.beats == [3 * w * 4 for w in weights]
+    assert tb.st_source.fairness() == 1.0 and tb.st_source.fairness('sent') == 1.0
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_clear(dut):
+    """Clearing drops the transactions queued on every channel, unsent"""
+
+    tb = AvalonPacketTB(dut)
+    await tb.initialise()
+    source = tb.st_source
+
+    for ch in range(MAX_CHANNEL + 1):
+        for _ in range(5):
+            source.append(packet(ch))
+    source.clear()
+    assert not any(source.queues)
+    assert all(meter.count == 0 for meter in source._meters)
+    await ct.ClockCycles(dut.clk, 20)
+    assert tb.received == [] and source.sent == [0] * (MAX_CHANNEL + 1)
+
+    p = packet(2)
+    await source.send(p)
+    await tb.wait_for(1)
+    assert tb.received == [p]
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_payload(dut):
+    """Payloads of any length survive payload -> packet -> driver -> monitor -> payload"""
+
+    tb = AvalonPacketTB(dut)
+    await tb.initialise()
+    source, sink = tb.st_source.model.itf, tb.st_sink.model.itf
+
+    payloads = [bytes(random.getrandbits(8) for _ in range(random.randint(1, 64))) for _ in range(20)]
+    for p in payloads:
+        await tb.st_source.send(source.packet(p, channel=0))
+    await tb.wait_for(len(payloads))
+
+    assert any(p.empty for p in tb.received), "No packet ended on a partial beat"
+    assert [bytes(sink.payload(p)) for p in tb.received] == payloads
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_latency_dict(dut):
+    """Latency of legacy dict transactions is matched against the packets received"""
+
+    latency = ci.latency.LatencyTracker(units='step')
+    tb = AvalonPacketTB(dut, latency=latency)
+    await tb.initialise()
+
+    n = 10
+    for i in range(n):
+        beats = [random.getrandbits(32) for _ in range(random.randint(1, 10))]
+        await tb.st_source.send({'data': beats, 'channel': [i % (MAX_CHANNEL + 1)]})
+    await tb.wait_for(n)
+
+    assert latency.histogram.count == n, latency.summary()
+    assert latency.pending == 0 and latency.unmatched == 0, latency.summary()
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_interleaved(dut):
+    """Packets interleaved at beat granularity are reassembled and routed per channel"""
+
+    tb = AvalonPacketTB(dut, interleaved=True)
+    await tb.initialise()
+    sink = tb.st_sink
+    on_one = []
+    sink.add_channel_callback(1, on_one.append)
+
+    sent = [[cias.Packet(32, [random.getrandbits(32) for _ in range(random.randint(2, 10))], channel=ch)
+             for _ in range(5)] for ch in range(MAX_CHANNEL + 1)]
+    pending = [[(ch, i == 0, i == p.nbeats - 1, b) for p in pkts for i, b in enumerate(p.beats())]
+               for ch, pkts in enumerate(sent)]
+
+    # Beats are driven on falling edges, on a random channel each cycle, with idle cycles
+    switched, opened = False, set()
+    await ct.FallingEdge(dut.clk)
+    while any(pending):
+        if random.random() < 0.2:
+            dut.asi_valid <= 0
+        else:
+            ch, sop, eop, beat = random.choice([q for q in pending if q]).pop(0)
+            switched |= bool(opened - {ch})
+            if sop:
+                opened.add(ch)
+            if eop:
+                opened.discard(ch)
+            dut.asi_valid <= 1
+            dut.asi_channel <= ch
+            dut.asi_startofpacket <= int(sop)
+            dut.asi_endofpacket <= int(eop)
+            dut.asi_data <= beat
+        await ct.FallingEdge(dut.clk)
+    dut.asi_valid <= 0
+    while sum(sink.received) < sum(map(len, sent)):
+        await tb.clkedge
+
+    assert switched, "No channel changed within a packet"
+    assert on_one == sent[1]
+    for ch in range(MAX_CHANNEL + 1):
+        assert list(sink.channel_queues[ch]) == ([] if ch == 1 else sent[ch])
+    assert len(sink) == 0, "Packets were stored in the monitor's own queue"
+    assert sink.received == [len(pkts) for pkts in sent]
+    assert sink.model.beats == [sum(p.nbeats for p in pkts) for pkts in sent]
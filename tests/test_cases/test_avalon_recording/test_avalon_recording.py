@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Test of offline AvalonST checks over a recording with known violations"""
+
+import numpy as np
+
+import cocotb as c
+import cocotb.clock as cc
+import cocotb.triggers as ct
+
+import cocotbext.interfaces as ci
+import cocotbext.interfaces.avalon.checker as ciac
+import cocotbext.interfaces.avalon.recording as ciar
+import cocotbext.interfaces.avalon.streaming as cias
+
+# Beats (valid, startofpacket, endofpacket, channel, empty) driven one per cycle, and the
+# violations they should be found to contain
+BEATS = [
+    (0, 0, 0, 0, 0),
+    (1, 1, 0, 0, 0),
+    (1, 1, 0, 0, 0), # Duplicate startofpacket
+    (1, 0, 0, 1, 0), # Channel changed within packet
+    (1, 0, 1, 1, 0),
+    (1, 0, 0, 0, 0), # Outside of packet
+    (1, 1, 1, 3, 0), # Channel exceeds maxChannel
+    (1, 1, 0, 0, 0),
+    (1, 0, 0, 0, 2), # Empty before endofpacket
+    (1, 0, 1, 0, 1),
+    (0, 0, 0, 0, 0),
+]
+EXPECTED = [
+    (2, 'duplicate_sop'),
+    (3, 'channel_changed'),
+    (5, 'outside_packet'),
+    (6, 'channel_range'),
+    (8, 'empty_before_eop'),
+]
+
+
+async def initialise(dut):
+    dut.aso_ready <= 1
+    for name in ('valid', 'data', 'startofpacket', 'endofpacket', 'empty', 'channel'):
+        getattr(dut, f"asi_{name}") <= 0
+    c.fork(cc.Clock(dut.clk, 2).start())
+    dut.reset <= 1
+    await ct.ClockCycles(dut.clk, 10)
+    dut.reset <= 0
+    await ct.ClockCycles(dut.clk, 10)
+
+
+@c.test()
+@ci.recorder.dump_on_failure()
+async def test_recording(dut):
+    """Violations driven onto the bus are found, by cycle and rule, in its recording"""
+
+    await initialise(dut)
+    rec = ciar.StreamingRecorder(cias.StreamingInterface(dut, bus_name="aso", max_channel=1), "aso.rec")
+
+    # Beats are driven on falling edges, so that beat i is recorded in cycle i
+    await ct.FallingEdge(dut.clk)
+    recording = c.fork(rec.run())
+    for valid, sop, eop, channel, empty in BEATS:
+        dut.asi_valid <= valid
+        dut.asi_startofpacket <= sop
+        dut.asi_endofpacket <= eop
+        dut.asi_channel <= channel
+        dut.asi_empty <= empty
+        await ct.FallingEdge(dut.clk)
+    recording.kill()
+    rec.close()
+
+    counts, violations = ciac.check_file("aso.rec")
+    assert rec.cycles >= len(BEATS)
+    assert [(v.cycle, v.rule) for v in violations] == EXPECTED
+    assert counts == {rule: 1 for _, rule in EXPECTED}
+
+
+@c.test()
+async def test_check_without_valid(dut):
+    """Without a valid signal, every cycle is checked as a transfer"""
+
+    meta = {
+        'bus_name': 'aso',
+        'columns': [('startofpacket', 'B', 1), ('endofpacket', 'B', 1)],
+        'packets': True,
+        'ready_latency': None,
+        'ready_allowance': None,
+        'max_channel': None,
+        'empty_within_packet': None,
+        'symbols_per_beat': 4,
+    }
+    cols = {
+        'startofpacket': np.array([1, 0, 0, 1], dtype=np.uint8),
+        'endofpacket': np.array([0, 1, 0, 1], dtype=np.uint8),
+    }
+    counts, violations = ciac.check(meta, cols)
+    assert [(v.cycle, v.rule) for v in violations] == [(2, 'outside_packet')]